@@ -0,0 +1,273 @@
+# benchmarks/fake_server.py
+import argparse
+import functools
+import gzip
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from nepse_scraper.endpoints import api_dict, resolve_endpoint_name
+
+from .fixtures import PAGED_ENDPOINTS, build_fixtures, price_history
+
+logger = logging.getLogger(__name__)
+
+TOKEN_ALPHABET = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+AUTH_ENDPOINTS = ('authenticate_api', 'refresh_token_api')
+
+
+class FakeNepseServer:
+    """
+    A local stand-in for the NEPSE API, serving fixtures over HTTP on a background thread.
+
+    Every endpoint in `api_dict` is served, including the `authenticate/prove`
+    salt flow: the server hands out salts and tokens in NEPSE's format, and
+    data endpoints answer 401 unless the request carries a `Salter` token.
+    Paged endpoints honour `page` and `size`, and price history is generated
+    for the requested date range.
+
+    Args:
+        fixtures: The responses to serve, as built by `fixtures.build_fixtures()` or `load_fixtures()`.
+        latency: Seconds added to every response.
+        jitter: Up to this many extra seconds, drawn uniformly per request.
+        error_rate: The fraction of data requests answered with `error_status` instead.
+        error_status: The status used for injected errors.
+        seed: Seeds latency jitter and error injection, for reproducible runs.
+        compress: Whether to gzip bodies of 1 KB or more for clients that accept it, as NEPSE does.
+        host: The interface to bind.
+        port: The port to bind; 0 picks a free one.
+    """
+    def __init__(
+        self,
+        fixtures: Optional[Dict[str, Any]] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+        compress: bool = True,
+        host: str = '127.0.0.1',
+        port: int = 0,
+    ) -> None:
+        self.fixtures = fixtures if fixtures is not None else build_fixtures()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.compress = compress
+        self.stats: Counter = Counter()
+        self.bytes_sent = 0
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._forced_errors: list = []
+        self._static: Dict[str, bytes] = {
+            name: _dump(body) for name, body in self.fixtures.items()
+            if name in api_dict and name not in PAGED_ENDPOINTS
+        }
+        self._pages: Dict[Tuple[str, int, int], bytes] = {}
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> "FakeNepseServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-nepse', daemon=True)
+        self._thread.start()
+        logger.info(f"Fake NEPSE server listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "FakeNepseServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def fail_next(self, count: int, status: Optional[int] = None) -> None:
+        """Answers the next `count` data requests with `status` (default `error_status`)."""
+        with self._lock:
+            self._forced_errors.extend([status or self.error_status] * count)
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats.clear()
+            self.bytes_sent = 0
+
+    def handle(self, method: str, raw_path: str, headers: Dict[str, str]) -> Tuple[int, bytes]:
+        """Builds the status and body for one request."""
+        parts = urlsplit(raw_path)
+        path = parts.path.rstrip('/') or '/'
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        name = _resolve(method, path)
+        with self._lock:
+            self.stats[name or 'unknown'] += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            error = None
+            if name not in AUTH_ENDPOINTS:
+                if self._forced_errors:
+                    error = self._forced_errors.pop(0)
+                elif self.error_rate and self._rng.random() < self.error_rate:
+                    error = self.error_status
+        if delay:
+            time.sleep(delay)
+
+        if name is None:
+            return 404, _dump({'message': f'No endpoint at {method} {path}'})
+        if name in AUTH_ENDPOINTS:
+            return 200, self._token_response()
+        if not headers.get('Authorization', '').startswith('Salter '):
+            return 401, _dump({'message': 'Unauthorized'})
+        if error is not None:
+            return error, _dump({'message': 'Injected error'})
+
+        if name in self._static:
+            return 200, self._static[name]
+        if name in PAGED_ENDPOINTS:
+            return 200, self._page(name, int(query.get('page', 0)), int(query.get('size', 500)))
+        return self._by_id(name, path, query)
+
+    def _token_response(self) -> bytes:
+        with self._lock:
+            salts = {f'salt{i}': self._rng.randint(100, 999) for i in range(1, 6)}
+            access, refresh = (''.join(self._rng.choice(TOKEN_ALPHABET) for _ in range(220)) for _ in range(2))
+        return _dump({**salts, 'accessToken': access, 'refreshToken': refresh, 'serverTime': int(time.time() * 1000), 'isDisplayActive': False})
+
+    def _page(self, name: str, page: int, size: int) -> bytes:
+        key = (name, page, size)
+        body = self._pages.get(key)
+        if body is None:
+            rows = self.fixtures[name]
+            body = self._pages[key] = _dump(_spring_page(rows, page, size))
+        return body
+
+    def _by_id(self, name: str, path: str, query: Dict[str, str]) -> Tuple[int, bytes]:
+        try:
+            item_id = int(path.rsplit('/', 1)[1])
+        except ValueError:
+            return 404, _dump({'message': f'Unknown id in {path}'})
+        if name == 'ticker_price_api':
+            if item_id not in self.fixtures['base_prices']:
+                return 404, _dump({'message': f'Unknown security {item_id}'})
+            rows = price_history(self.fixtures, item_id, query.get('startDate', '2025-01-01'), query.get('endDate', '2025-10-14'))
+            return 200, _dump(_spring_page(rows, int(query.get('page', 0)), int(query.get('size', 500))))
+        item = self.fixtures['by_id'].get(name, {}).get(item_id)
+        if item is None:
+            return 404, _dump({'message': f'Unknown id {item_id}'})
+        return 200, _dump(item)
+
+
+def _resolve(method: str, path: str) -> Optional[str]:
+    # The client calls some endpoints with another method than `api_dict` lists (e.g. POST for
+    # `stock_live_api`), and the notice endpoint is registered with a trailing slash.
+    for candidate_method in (method, 'POST' if method == 'GET' else 'GET'):
+        for candidate_path in (path, path + '/'):
+            name = resolve_endpoint_name(candidate_method, candidate_path)
+            if name is not None:
+                return name
+    return None
+
+
+def _spring_page(rows: list, page: int, size: int) -> Dict[str, Any]:
+    size = max(size, 1)
+    return {
+        'content': rows[page * size:(page + 1) * size],
+        'totalElements': len(rows),
+        'totalPages': max(1, -(-len(rows) // size)),
+        'number': page,
+        'size': size,
+        'first': page == 0,
+        'last': (page + 1) * size >= len(rows),
+    }
+
+
+def _dump(body: Any) -> bytes:
+    return json.dumps(body, separators=(',', ':')).encode()
+
+
+@functools.lru_cache(maxsize=256)
+def _gzip(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=6)
+
+
+def _make_handler(server: FakeNepseServer) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Headers and body are written separately; with Nagle's algorithm the body of a
+        # small response would wait for the client's delayed ACK (~40 ms).
+        disable_nagle_algorithm = True
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(format % args)
+
+        def _respond(self, method: str) -> None:
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                self.rfile.read(length)
+            status, body = server.handle(method, self.path, dict(self.headers))
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            if server.compress and len(body) >= 1024 and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = _gzip(body)
+                self.send_header('Content-Encoding', 'gzip')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            with server._lock:
+                server.bytes_sent += len(body)
+
+        def do_GET(self) -> None:
+            self._respond('GET')
+
+        def do_POST(self) -> None:
+            self._respond('POST')
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve fake NEPSE API responses for offline development and benchmarks.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Maximum extra random latency in seconds.")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of data requests answered with --error-status.")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--no-compression', action='store_true', help="Never gzip responses.")
+    parser.add_argument('--fixtures', help="A directory of recorded <endpoint_name>.json responses to serve.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    fixtures = None
+    if args.fixtures:
+        from .fixtures import load_fixtures
+        fixtures = load_fixtures(args.fixtures)
+    server = FakeNepseServer(
+        fixtures, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        error_status=args.error_status, compress=not args.no_compression, host=args.host, port=args.port,
+    )
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
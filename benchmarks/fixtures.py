@@ -0,0 +1,188 @@
+# benchmarks/fixtures.py
+import json
+import random
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+# Endpoints served as Spring pages; the fake server slices their `content` by `page`/`size`.
+PAGED_ENDPOINTS = ('today_price_api', 'broker_api', 'trading_average_api')
+
+SECTORS = (
+    'Commercial Banks', 'Development Banks', 'Finance', 'Hydro Power', 'Life Insurance',
+    'Non Life Insurance', 'Microfinance', 'Manufacturing And Processing', 'Hotels And Tourism',
+    'Trading', 'Investment', 'Mutual Fund', 'Others',
+)
+INDEX_IDS = range(51, 68)
+BUSINESS_DATE = '2025-10-14'
+
+
+def build_fixtures(n_securities: int = 350, n_brokers: int = 90, seed: int = 0) -> Dict[str, Any]:
+    """
+    Generates deterministic responses, shaped like NEPSE's, for every endpoint in `api_dict`.
+
+    Per-security endpoints are keyed by security id under `by_id`; the price
+    history endpoint is generated per request from the requested date range.
+
+    Args:
+        n_securities: The number of listed securities, which sizes the market-wide responses.
+        n_brokers: The number of brokers returned by `broker_api`.
+        seed: The random seed; the same arguments always produce the same fixtures.
+    """
+    rng = random.Random(seed)
+    securities = [
+        {
+            'id': i,
+            'symbol': _symbol(i),
+            'securityName': f'{_symbol(i).title()} Limited',
+            'name': f'{_symbol(i).title()} Limited',
+            'activeStatus': 'A',
+            'sectorName': SECTORS[i % len(SECTORS)],
+            'instrumentType': 'Equity',
+            'regulatoryBody': 'Nepal Rastra Bank' if i % len(SECTORS) < 3 else 'Securities Board of Nepal',
+        }
+        for i in range(1, n_securities + 1)
+    ]
+    prices = {s['id']: round(rng.uniform(150, 3000), 2) for s in securities}
+    today_price = []
+    live = []
+    for s in securities:
+        sid, close = s['id'], prices[s['id']]
+        previous = round(close * rng.uniform(0.95, 1.05), 2)
+        quantity = rng.randint(100, 200_000)
+        today_price.append({
+            'id': 1_000_000 + sid, 'businessDate': BUSINESS_DATE, 'securityId': sid, 'symbol': s['symbol'],
+            'securityName': s['securityName'], 'openPrice': previous, 'highPrice': round(max(close, previous) * 1.01, 2),
+            'lowPrice': round(min(close, previous) * 0.99, 2), 'closePrice': close,
+            'totalTradedQuantity': quantity, 'totalTradedValue': round(quantity * close, 2),
+            'previousDayClosePrice': previous, 'fiftyTwoWeekHigh': round(close * 1.4, 2),
+            'fiftyTwoWeekLow': round(close * 0.7, 2), 'lastUpdatedTime': f'{BUSINESS_DATE}T15:00:00',
+            'totalTrades': rng.randint(10, 3000), 'averageTradedPrice': round((close + previous) / 2, 2),
+            'marketCapitalization': round(close * rng.randint(1_000_000, 50_000_000) / 1e6, 2),
+        })
+        live.append({
+            'securityId': str(sid), 'symbol': s['symbol'], 'securityName': s['securityName'],
+            'openPrice': previous, 'highPrice': close, 'lowPrice': previous, 'totalTradeQuantity': quantity,
+            'totalTradeValue': round(quantity * close, 2), 'lastTradedPrice': close,
+            'percentageChange': round((close - previous) / previous * 100, 2), 'lastUpdatedDateTime': f'{BUSINESS_DATE}T14:59:59',
+            'lastTradedVolume': rng.randint(10, 1000), 'previousClose': previous, 'averageTradedPrice': close,
+        })
+
+    by_change = sorted(live, key=lambda row: row['percentageChange'])
+    top = lambda rows: [
+        {'symbol': r['symbol'], 'ltp': r['lastTradedPrice'], 'pointChange': round(r['lastTradedPrice'] - r['previousClose'], 2),
+         'percentageChange': r['percentageChange'], 'securityName': r['securityName'], 'securityId': int(r['securityId'])}
+        for r in rows
+    ]
+    fixtures: Dict[str, Any] = {
+        'marketopen_api': {'isOpen': 'CLOSE', 'asOf': f'{BUSINESS_DATE}T15:00:00', 'id': 36},
+        'security_api': securities,
+        'securities_list_api': [{'id': s['id'], 'symbol': s['symbol'], 'securityName': s['securityName'], 'activeStatus': 'A'} for s in securities],
+        'today_price_api': today_price,
+        'stock_live_api': live,
+        'top_gainer': top(by_change[::-1]),
+        'top_loser': top(by_change),
+        'top_turnover': [{'symbol': r['symbol'], 'turnover': r['totalTradeValue'], 'closingPrice': r['lastTradedPrice'], 'securityName': r['securityName'], 'securityId': int(r['securityId'])} for r in sorted(live, key=lambda r: -r['totalTradeValue'])],
+        'top_trade': [{'symbol': r['symbol'], 'shareTraded': r['totalTradeQuantity'], 'closingPrice': r['lastTradedPrice'], 'securityName': r['securityName'], 'securityId': int(r['securityId'])} for r in sorted(live, key=lambda r: -r['totalTradeQuantity'])],
+        'top_transaction': [{'symbol': r['symbol'], 'totalTrades': rng.randint(10, 3000), 'lastTradedPrice': r['lastTradedPrice'], 'securityName': r['securityName'], 'securityId': int(r['securityId'])} for r in live],
+        'top_trade_qty_api': [{'symbol': r['symbol'], 'totalTradeQuantity': r['totalTradeQuantity']} for r in sorted(live, key=lambda r: -r['totalTradeQuantity'])],
+        'supply_demand_api': {
+            'supplyList': [{'symbol': r['symbol'], 'totalQuantity': rng.randint(100, 50_000), 'totalOrder': rng.randint(1, 500)} for r in live[:50]],
+            'demandList': [{'symbol': r['symbol'], 'totalQuantity': rng.randint(100, 50_000), 'totalOrder': rng.randint(1, 500)} for r in live[50:100]],
+        },
+        'trading_average_api': [
+            {'symbol': r['symbol'], 'securityId': r['securityId'], 'securityName': r['securityName'], 'closingPrice': r['closePrice'],
+             'averageTradedPrice': r['averageTradedPrice'], 'weightedAverage': round(r['closePrice'] * rng.uniform(0.9, 1.1), 2),
+             'businessDate': BUSINESS_DATE, 'nDays': 120}
+            for r in today_price
+        ],
+        'broker_api': [
+            {'id': i, 'memberCode': str(i), 'memberName': f'Broker Securities {i} Limited', 'contactPerson': f'Contact {i}',
+             'contactNumber': f'01-4{i:06d}', 'provinceId': i % 7 + 1, 'districtId': i % 77 + 1, 'municipalityId': i % 300 + 1,
+             'memberTMSLinkMapping': {'tmsLink': f'tms{i}.nepsetms.com.np'}}
+            for i in range(1, n_brokers + 1)
+        ],
+        'sector_api': [{'id': i, 'sectorDescription': name, 'regulatoryBody': 'Securities Board of Nepal'} for i, name in enumerate(SECTORS, 1)],
+        'sector_index_api': [{'id': i, 'index': f'Index {i}', 'close': round(rng.uniform(500, 9000), 2), 'change': round(rng.uniform(-50, 50), 2)} for i in INDEX_IDS],
+        'nepse_index_api': [{'id': i, 'index': f'Index {i}', 'currentValue': round(rng.uniform(500, 9000), 2), 'perChange': round(rng.uniform(-2, 2), 2)} for i in (58, 57, 62, 63)],
+        'sectorwise_summary_api': [{'businessDate': BUSINESS_DATE, 'sectorName': name, 'turnOverValues': round(rng.uniform(1e6, 1e9), 2), 'turnOverVolume': rng.randint(10_000, 5_000_000)} for name in SECTORS],
+        'market_summary_api': [{'detail': name, 'value': round(rng.uniform(1e3, 1e10), 2)} for name in (
+            'Total Turnover Rs:', 'Total Traded Shares', 'Total Transactions', 'Total Scrips Traded',
+            'Total Market Capitalization Rs:', 'Total Float Market Capitalization Rs:')],
+        'market_summary_history_api': [
+            {'businessDate': (date(2025, 10, 14) - timedelta(days=d)).isoformat(), 'totalTurnover': round(rng.uniform(1e9, 1e10), 2),
+             'totalTradedShares': rng.randint(1_000_000, 50_000_000), 'totalTransactions': rng.randint(10_000, 200_000), 'tradedScrips': rng.randint(200, 330)}
+            for d in range(250)
+        ],
+        'marketcap_api': [{'businessDate': (date(2025, 10, 14) - timedelta(days=d)).isoformat(), 'marCap': round(rng.uniform(3e12, 5e12), 2), 'senMarCap': round(rng.uniform(1e12, 2e12), 2)} for d in range(250)],
+        'disclosure': {'news': [{'id': i, 'newsHeadline': f'Disclosure {i}', 'newsSource': 'NEPSE', 'addedDate': BUSINESS_DATE} for i in range(1, 101)]},
+        'notice_api': [{'id': i, 'noticeHeading': f'Notice {i}', 'noticeFilePath': f'notice-{i}.pdf', 'modifiedDate': BUSINESS_DATE} for i in range(1, 51)],
+        'info_officer_api': [{'id': i, 'name': f'Officer {i}', 'designation': 'Information Officer', 'phone': f'01-5{i:06d}'} for i in range(1, 21)],
+        'by_id': {
+            'ticker_info_api': {
+                s['id']: {'security': dict(s), 'securityDailyTradeDto': today_price[s['id'] - 1], 'stockListedShares': rng.randint(1_000_000, 90_000_000)}
+                for s in securities
+            },
+            'security': {s['id']: dict(s) for s in securities},
+            'ticker_contact_api': {
+                s['id']: [{'companyName': s['securityName'], 'companyEmail': f'info@{s["symbol"].lower()}.com.np', 'companyContactPerson': 'Company Secretary'}]
+                for s in securities
+            },
+            'security_daily_trade_stat_api': {
+                s['id']: [{'businessDate': BUSINESS_DATE, 'securityId': s['id'], 'totalTrades': rng.randint(10, 3000), 'totalTradeQuantity': rng.randint(100, 200_000)}]
+                for s in securities
+            },
+            'indices_live_api': {i: [[1760413500 + m * 60, round(2600 + rng.uniform(-30, 30), 2)] for m in range(240)] for i in INDEX_IDS},
+            'head_indices_api': {
+                i: [{'businessDate': (date(2025, 10, 14) - timedelta(days=d)).isoformat(), 'closingIndex': round(rng.uniform(2000, 3000), 2), 'indexId': i} for d in range(250)]
+                for i in INDEX_IDS
+            },
+        },
+        'base_prices': prices,
+    }
+    return fixtures
+
+
+def load_fixtures(directory: Union[str, Path], base: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Overlays recorded responses on generated fixtures.
+
+    Each `<endpoint_name>.json` file in `directory` (e.g. a response saved
+    from the live site) replaces the generated fixture of that endpoint.
+    """
+    fixtures = base if base is not None else build_fixtures()
+    for path in sorted(Path(directory).glob('*.json')):
+        fixtures[path.stem] = json.loads(path.read_text(encoding='utf-8'))
+    return fixtures
+
+
+def price_history(fixtures: Dict[str, Any], security_id: int, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+    """Generates one row per trading day (Sunday to Thursday) of a security's history, newest first."""
+    base = fixtures['base_prices'].get(security_id)
+    if base is None:
+        return []
+    start, end = date.fromisoformat(start_date[:10]), date.fromisoformat(end_date[:10])
+    rows = []
+    day = end
+    while day >= start:
+        if day.weekday() not in (4, 5):  # NEPSE does not trade on Fridays and Saturdays.
+            # A cheap deterministic walk so reruns return identical bodies.
+            close = round(base * (1 + ((day.toordinal() * 7919 + security_id * 104729) % 2001 - 1000) / 20000), 2)
+            rows.append({
+                'businessDate': day.isoformat(), 'closePrice': close, 'highPrice': round(close * 1.01, 2),
+                'lowPrice': round(close * 0.99, 2), 'totalTrades': (day.toordinal() + security_id) % 900 + 10,
+                'totalTradedQuantity': (day.toordinal() * security_id) % 90_000 + 100,
+                'totalTradedValue': round(close * ((day.toordinal() * security_id) % 90_000 + 100), 2),
+            })
+        day -= timedelta(days=1)
+    return rows
+
+
+def _symbol(i: int) -> str:
+    """A unique four-letter symbol for a security id (1 -> 'AAAA', 2 -> 'AAAB', ...)."""
+    letters = []
+    n = i - 1
+    for _ in range(4):
+        n, rem = divmod(n, 26)
+        letters.append(chr(65 + rem))
+    return ''.join(reversed(letters))
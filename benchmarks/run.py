@@ -0,0 +1,268 @@
+# benchmarks/run.py
+"""
+Offline benchmark suite for nepse_scraper.
+
+Starts a `FakeNepseServer` on localhost and measures cold start, authentication,
+per-method latency, batch throughput and JSON decode cost. No network access
+is needed, and runs with the same arguments are directly comparable:
+
+    python -m benchmarks.run --latency 0.02 --json before.json
+    python -m benchmarks.run --only methods,batch
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from nepse_scraper import NepseScraper
+from nepse_scraper.decoding import DECODER_PREFERENCE, JsonArrayParser, get_json_decoder
+from nepse_scraper.utils import CACHE_DIR_ENV
+
+from .fake_server import FakeNepseServer, _dump, _spring_page
+from .fixtures import build_fixtures, price_history
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+BENCHMARKS = ('cold_start', 'auth', 'methods', 'batch', 'decode')
+
+COLD_START_SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+from nepse_scraper import NepseScraper
+t1 = time.perf_counter()
+scraper = NepseScraper(base_url=sys.argv[1])
+t2 = time.perf_counter()
+scraper.is_market_open()
+t3 = time.perf_counter()
+scraper.get_ticker_info('AAAA')
+t4 = time.perf_counter()
+print(json.dumps({'import': t1 - t0, 'init': t2 - t1, 'first_request': t3 - t2, 'first_ticker': t4 - t3, 'total': t4 - t0}))
+"""
+
+
+@dataclass
+class BenchResult:
+    """The samples of one measurement; `unit` is 'ms' for timings or a rate such as 'rows/s'."""
+    group: str
+    name: str
+    unit: str
+    samples: List[float]
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    @property
+    def p95(self) -> float:
+        if len(self.samples) < 2:
+            return self.samples[0]
+        return statistics.quantiles(self.samples, n=20, method='inclusive')[-1]
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.update(median=self.median, p95=self.p95, min=min(self.samples), max=max(self.samples))
+        return data
+
+
+def measure_ms(fn: Callable[[], Any], repeat: int, warmup: int = 1) -> List[float]:
+    """Calls `fn` `warmup + repeat` times and returns the last `repeat` durations in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def bench_cold_start(server: FakeNepseServer, repeat: int) -> List[BenchResult]:
+    """Import, client creation and first requests in a fresh process, with an empty and with a warm cache directory."""
+    results = []
+    with tempfile.TemporaryDirectory() as warm_dir:
+        for mode in ('cold', 'warm'):
+            runs: List[Dict[str, float]] = []
+            for i in range(repeat + (1 if mode == 'warm' else 0)):
+                with tempfile.TemporaryDirectory() as cold_dir:
+                    env = dict(os.environ, PYTHONPATH=str(REPO_ROOT), **{CACHE_DIR_ENV: cold_dir if mode == 'cold' else warm_dir})
+                    output = subprocess.run(
+                        [sys.executable, '-c', COLD_START_SCRIPT, server.url],
+                        env=env, capture_output=True, text=True, check=True,
+                    ).stdout
+                if mode == 'warm' and i == 0:
+                    continue  # The first run only fills the warm cache.
+                runs.append(json.loads(output.strip().splitlines()[-1]))
+            for phase in ('import', 'init', 'first_request', 'first_ticker', 'total'):
+                results.append(BenchResult('cold_start', f'{mode}.{phase}', 'ms', [run[phase] * 1000 for run in runs]))
+    return results
+
+
+def bench_auth(server: FakeNepseServer, repeat: int) -> List[BenchResult]:
+    """A full `authenticate/prove` round trip including token parsing, and token parsing alone."""
+    scraper = NepseScraper(base_url=server.url)
+    session = scraper.session
+
+    def authenticate() -> None:
+        session._token_manager.invalidate()
+        session._get_access_token()
+
+    token_response = json.loads(server._token_response())
+    parser = session._token_manager.token_parser
+    return [
+        BenchResult('auth', 'authenticate', 'ms', measure_ms(authenticate, repeat)),
+        BenchResult('auth', 'parse_token_response', 'ms', measure_ms(lambda: parser.parse_token_response(dict(token_response)), repeat * 10)),
+    ]
+
+
+def bench_methods(server: FakeNepseServer, repeat: int) -> List[BenchResult]:
+    """Latency of common client methods, with the token and security map already warm."""
+    scraper = NepseScraper(base_url=server.url)
+    scraper.get_ticker_info('AAAA')
+    calls: Dict[str, Callable[[], Any]] = {
+        'is_market_open': scraper.is_market_open,
+        'get_today_price': scraper.get_today_price,
+        'get_live_trades': lambda: scraper.get_live_trades(check_market_open=False),
+        'get_top_stocks': lambda: scraper.get_top_stocks('top_gainer'),
+        'get_ticker_info': lambda: scraper.get_ticker_info('AAAA'),
+        'get_ticker_price_history(1y)': lambda: scraper.get_ticker_price_history('AAAA', '2024-10-14', '2025-10-14'),
+        'get_brokers': scraper.get_brokers,
+        'get_trading_average': scraper.get_trading_average,
+        'get_all_securities': scraper.get_all_securities,
+        'get_live_indices': scraper.get_live_indices,
+    }
+    return [BenchResult('methods', name, 'ms', measure_ms(call, repeat)) for name, call in calls.items()]
+
+
+def bench_batch(server: FakeNepseServer, repeat: int, workers: List[int]) -> List[BenchResult]:
+    """Tickers per second fetched by `get_ticker_info_batch` over the whole market, sync and async."""
+    symbols = [security['symbol'] for security in server.fixtures['security_api']]
+    results = []
+    scraper = NepseScraper(base_url=server.url)
+    scraper.get_ticker_info('AAAA')
+    for max_workers in workers:
+        rates = []
+        for _ in range(max(1, repeat // 5)):
+            started = time.perf_counter()
+            batch = scraper.get_ticker_info_batch(symbols, max_workers=max_workers)
+            rates.append(len(batch.results) / (time.perf_counter() - started))
+        results.append(BenchResult('batch', f'sync.workers={max_workers}', 'tickers/s', rates))
+
+    try:
+        import httpx  # noqa: F401
+    except ImportError:
+        logging.getLogger(__name__).info("httpx is not installed; skipping the async batch benchmark.")
+        return results
+
+    from nepse_scraper import AsyncNepseScraper
+
+    async def run_async() -> List[BenchResult]:
+        async_results = []
+        async with AsyncNepseScraper(base_url=server.url) as async_scraper:
+            await async_scraper.get_ticker_info('AAAA')
+            for max_workers in workers:
+                rates = []
+                for _ in range(max(1, repeat // 5)):
+                    started = time.perf_counter()
+                    batch = await async_scraper.get_ticker_info_batch(symbols, max_workers=max_workers)
+                    rates.append(len(batch.results) / (time.perf_counter() - started))
+                async_results.append(BenchResult('batch', f'async.workers={max_workers}', 'tickers/s', rates))
+        return async_results
+
+    return results + asyncio.run(run_async())
+
+
+def bench_decode(repeat: int) -> List[BenchResult]:
+    """Decode throughput of every installed JSON library on a market-wide page and a long price history."""
+    fixtures = build_fixtures()
+    bodies = {
+        'today_price_page': _dump(_spring_page(fixtures['today_price_api'], 0, 500)),
+        'price_history_10y': _dump(_spring_page(price_history(fixtures, 1, '2015-10-14', '2025-10-14'), 0, 5000)),
+    }
+    results = []
+    for body_name, body in bodies.items():
+        megabytes = len(body) / 1e6
+        for name in DECODER_PREFERENCE:
+            try:
+                decode = get_json_decoder(name)
+            except ImportError:
+                continue
+            samples = measure_ms(lambda: decode(body), repeat)
+            results.append(BenchResult('decode', f'{body_name}.{name}', 'ms', samples, {'bytes': len(body), 'MB/s': megabytes / (statistics.median(samples) / 1000)}))
+
+        def stream() -> None:
+            parser = JsonArrayParser('content')
+            for start in range(0, len(body), 65536):
+                parser.feed(body[start:start + 65536])
+            parser.close()
+
+        samples = measure_ms(stream, repeat)
+        results.append(BenchResult('decode', f'{body_name}.stream', 'ms', samples, {'bytes': len(body), 'MB/s': megabytes / (statistics.median(samples) / 1000)}))
+    return results
+
+
+def print_results(results: List[BenchResult]) -> None:
+    name_width = max(len(f'{r.group}/{r.name}') for r in results)
+    print(f"{'benchmark':<{name_width}}  {'median':>12}  {'p95':>12}  {'min':>12}  unit")
+    for r in results:
+        extra = f"  ({r.extra['MB/s']:.1f} MB/s)" if 'MB/s' in r.extra else ''
+        print(f"{r.group + '/' + r.name:<{name_width}}  {r.median:>12.3f}  {r.p95:>12.3f}  {min(r.samples):>12.3f}  {r.unit}{extra}")
+
+
+def main(argv: Optional[List[str]] = None) -> List[BenchResult]:
+    parser = argparse.ArgumentParser(description="Run the offline nepse_scraper benchmark suite against a local fake NEPSE server.")
+    parser.add_argument('--only', help=f"Comma-separated benchmarks to run, from: {', '.join(BENCHMARKS)}.")
+    parser.add_argument('--repeat', type=int, default=20, help="Samples per measurement (cold start uses a fifth of it).")
+    parser.add_argument('--latency', type=float, default=0.005, help="Seconds of simulated server latency per request.")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Maximum extra random latency per request.")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of data requests answered with 503.")
+    parser.add_argument('--workers', default='1,8,32', help="Comma-separated max_workers values for the batch benchmark.")
+    parser.add_argument('--json', dest='json_path', help="Also write the results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    selected = args.only.split(',') if args.only else list(BENCHMARKS)
+    unknown = set(selected) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmark(s): {', '.join(sorted(unknown))}")
+    logging.basicConfig(level=logging.WARNING, format='%(message)s')
+
+    results: List[BenchResult] = []
+    # Keep the fake securities out of the user's real cache directory.
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ[CACHE_DIR_ENV] = cache_dir
+        with FakeNepseServer(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate) as server:
+            if 'cold_start' in selected:
+                results += bench_cold_start(server, max(1, args.repeat // 5))
+            if 'auth' in selected:
+                results += bench_auth(server, args.repeat)
+            if 'methods' in selected:
+                results += bench_methods(server, args.repeat)
+            if 'batch' in selected:
+                results += bench_batch(server, args.repeat, [int(w) for w in args.workers.split(',')])
+        if 'decode' in selected:
+            results += bench_decode(args.repeat)
+
+    print_results(results)
+    if args.json_path:
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'args': vars(args),
+            'results': [r.to_dict() for r in results],
+        }
+        Path(args.json_path).write_text(json.dumps(report, indent=2), encoding='utf-8')
+    return results
+
+
+if __name__ == '__main__':
+    main()
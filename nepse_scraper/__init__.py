@@ -1,8 +1,12 @@
 from .client import NepseScraper
+from .async_client import AsyncNepseScraper
+from .cache import DiskCache, MemoryCache
+from .intraday import AsyncIntradayIndexTracker, IntradayIndexTracker
+from .live import AsyncLiveMarketPoller, LiveMarketPoller
 
 # Create an alias for the old class name to ensure full backward compatibility.
 # Users who were using `from nepse_scraper import Nepse_scraper` will not have their code broken.
 Nepse_scraper = NepseScraper
 
 # Define what gets imported with `from nepse_scraper import *`
-__all__ = ['NepseScraper', 'Nepse_scraper']
\ No newline at end of file
+__all__ = ['NepseScraper', 'Nepse_scraper', 'AsyncNepseScraper', 'MemoryCache', 'DiskCache', 'LiveMarketPoller', 'AsyncLiveMarketPoller', 'IntradayIndexTracker', 'AsyncIntradayIndexTracker']
\ No newline at end of file
@@ -0,0 +1,300 @@
+# nepse_scraper/analytics.py
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .columnar import EncodedColumn
+
+logger = logging.getLogger(__name__)
+
+# Column names per metric input, in order of preference: `get_today_price()`
+# rows first, then `get_live_trades()` rows, so both snapshots work.
+CLOSE_COLUMNS = ('closePrice', 'lastTradedPrice', 'closingPrice')
+PREVIOUS_CLOSE_COLUMNS = ('previousDayClosePrice', 'previousClose')
+VALUE_COLUMNS = ('totalTradedValue', 'totalTradeValue')
+QUANTITY_COLUMNS = ('totalTradedQuantity', 'totalTradeQuantity')
+AVERAGE_COLUMNS = ('weightedAverage',)
+
+# A snapshot is either the rows of an endpoint or its `as_format='numpy'` columns.
+Snapshot = Union[Sequence[Mapping[str, Any]], Mapping[str, Any]]
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "nepse_scraper.analytics requires the optional 'numpy' dependency. "
+            "Install it with: pip install nepse-scraper[numpy]"
+        ) from e
+    return np
+
+
+class SectorMap:
+    """
+    The symbol-to-sector index that sector aggregates are computed through.
+
+    Build it once from the company listing (`get_all_securities()`), whose rows
+    carry each symbol's `sectorName`, and reuse it for every snapshot: symbols
+    are resolved to small integer codes, so grouping by sector is a single
+    `np.bincount` per metric instead of a dict lookup per row.
+
+    Args:
+        symbol_sectors: Maps each symbol to its sector name.
+        sectors: The sector names in the order aggregates are reported. Defaults to the sorted names in `symbol_sectors`.
+    """
+    def __init__(self, symbol_sectors: Mapping[str, str], sectors: Optional[Iterable[str]] = None) -> None:
+        np = _numpy()
+        names = list(dict.fromkeys(sectors)) if sectors is not None else sorted(set(symbol_sectors.values()))
+        sector_codes = {name: code for code, name in enumerate(names)}
+        for name in set(symbol_sectors.values()) - sector_codes.keys():
+            sector_codes[name] = len(names)
+            names.append(name)
+
+        self.sectors = np.array(names, dtype=object)
+        self.symbols = np.array(list(symbol_sectors), dtype=object)
+        # Position of each symbol in `symbols`, and the sector code at each position.
+        self._positions: Dict[str, int] = {symbol: i for i, symbol in enumerate(symbol_sectors)}
+        self.sector_of = np.fromiter((sector_codes[name] for name in symbol_sectors.values()), dtype=np.int32, count=len(symbol_sectors))
+
+    @classmethod
+    def from_securities(cls, securities: Iterable[Mapping[str, Any]], sectors: Optional[Iterable[Mapping[str, Any]]] = None) -> "SectorMap":
+        """
+        Builds the index from `get_all_securities()` rows.
+
+        Args:
+            securities: Rows with `symbol` and `sectorName` keys; rows missing either are skipped.
+            sectors: `get_sectors()` rows, to report sectors in NEPSE's order (by `id`) and include those with no listed symbol.
+        """
+        symbol_sectors = {row['symbol']: row['sectorName'] for row in securities if row.get('symbol') and row.get('sectorName')}
+        names = None
+        if sectors is not None:
+            names = [row['sectorDescription'] for row in sorted(sectors, key=lambda row: row.get('id') or 0) if row.get('sectorDescription')]
+        return cls(symbol_sectors, names)
+
+    def __len__(self) -> int:
+        return len(self.sectors)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._positions
+
+    def positions(self, symbols: Any) -> Any:
+        """Returns each symbol's position in `self.symbols` as an int32 array, -1 for unknown symbols."""
+        np = _numpy()
+        get = self._positions.get
+        if isinstance(symbols, EncodedColumn):
+            # Resolve the distinct symbols only, then gather by code.
+            lookup = np.fromiter((get(s, -1) for s in symbols.categories), dtype=np.int32, count=len(symbols.categories))
+            return np.where(symbols.codes >= 0, lookup[symbols.codes] if len(lookup) else -1, -1).astype(np.int32)
+        return np.fromiter((get(s, -1) for s in symbols), dtype=np.int32, count=len(symbols))
+
+    def codes(self, symbols: Any) -> Any:
+        """Returns each symbol's sector code (an index into `self.sectors`) as an int32 array, -1 for unknown symbols."""
+        np = _numpy()
+        positions = self.positions(symbols)
+        return np.where(positions >= 0, self.sector_of[positions], -1).astype(np.int32)
+
+
+@dataclass
+class SectorMetrics:
+    """
+    Per-sector aggregates of a snapshot, one array element per `SectorMap.sectors` entry.
+
+    `vwap` is the sector's traded value over its traded quantity and
+    `percent_change` the value-weighted mean change of its securities; both are
+    NaN for sectors without trades.
+    """
+    sectors: Any
+    count: Any
+    advances: Any
+    declines: Any
+    unchanged: Any
+    turnover: Any
+    volume: Any
+    turnover_share: Any
+    vwap: Any
+    percent_change: Any
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Returns one dict of plain Python values per sector."""
+        names = ('count', 'advances', 'declines', 'unchanged', 'turnover', 'volume', 'turnover_share', 'vwap', 'percent_change')
+        columns = [getattr(self, name).tolist() for name in names]
+        return [
+            {'sector': sector, **dict(zip(names, values))}
+            for sector, *values in zip(self.sectors.tolist(), *columns)
+        ]
+
+
+@dataclass
+class MarketMetrics:
+    """
+    Cross-sectional metrics of one snapshot, one array element per row of the snapshot.
+
+    `percent_change` is against the previous close, `vwap` the day's traded
+    value over traded quantity (NaN without trades) and `turnover_share` each
+    security's fraction of the market's traded value. `sector` holds codes into
+    `sectors.sectors` (-1 for symbols missing from the `SectorMap`).
+    `average_price` and `premium` (percent above it) are only set when a
+    trading-average snapshot was given.
+    """
+    symbols: Any
+    close: Any
+    percent_change: Any
+    vwap: Any
+    turnover: Any
+    turnover_share: Any
+    total_turnover: float
+    sector: Any
+    sectors: SectorMetrics
+    average_price: Any = None
+    premium: Any = None
+
+
+def _symbols(columns: Mapping[str, Any]) -> Any:
+    symbols = columns.get('symbol')
+    if symbols is None:
+        raise KeyError("snapshot has no 'symbol' column")
+    return symbols
+
+
+def _column(np, columns: Mapping[str, Any], names: Tuple[str, ...]) -> Any:
+    for name in names:
+        values = columns.get(name)
+        if values is not None:
+            # Object columns (e.g. numbers sent as strings) are converted here; None becomes NaN.
+            return np.asarray(values, dtype=np.float64)
+    raise KeyError(f"snapshot has none of the columns {names}")
+
+
+def _columns(snapshot: Snapshot, names: Sequence[str]) -> Mapping[str, Any]:
+    if isinstance(snapshot, Mapping):
+        # `as_format='numpy'` output of an empty response has no columns at all.
+        return snapshot or {name: [] for name in names}
+    # Pull only the columns the metrics use out of the rows.
+    rows = snapshot
+    return {name: [row.get(name) for row in rows] for name in names if not rows or name in rows[0]}
+
+
+def _divide(np, numerator: Any, denominator: Any) -> Any:
+    out = np.full(np.shape(numerator), np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator != 0)
+    return out
+
+
+def percent_change(close: Any, previous_close: Any) -> Any:
+    """Percent change from `previous_close` to `close`, NaN where there is no previous close."""
+    np = _numpy()
+    close = np.asarray(close, dtype=np.float64)
+    previous_close = np.asarray(previous_close, dtype=np.float64)
+    return _divide(np, close - previous_close, previous_close) * 100.0
+
+
+def vwap(traded_value: Any, traded_quantity: Any) -> Any:
+    """Volume-weighted average price, NaN where nothing traded."""
+    np = _numpy()
+    return _divide(np, np.asarray(traded_value, dtype=np.float64), np.asarray(traded_quantity, dtype=np.float64))
+
+
+def turnover_share(traded_value: Any) -> Any:
+    """Each entry's fraction of the total traded value (missing values count as zero)."""
+    np = _numpy()
+    traded_value = np.nan_to_num(np.asarray(traded_value, dtype=np.float64))
+    total = traded_value.sum()
+    return traded_value / total if total else np.zeros_like(traded_value)
+
+
+def sector_aggregates(sector_map: SectorMap, codes: Any, change: Any, traded_value: Any, traded_quantity: Any) -> SectorMetrics:
+    """
+    Groups per-security metrics by sector with one `np.bincount` per aggregate.
+
+    Args:
+        sector_map: The index `codes` refer to.
+        codes: Sector codes from `SectorMap.codes()`; entries of -1 are left out.
+        change: Percent change per security.
+        traded_value: Traded value per security.
+        traded_quantity: Traded quantity per security.
+    """
+    np = _numpy()
+    n = len(sector_map)
+    known = codes >= 0
+    codes = codes[known]
+    change = np.asarray(change, dtype=np.float64)[known]
+    value = np.nan_to_num(np.asarray(traded_value, dtype=np.float64)[known])
+    quantity = np.nan_to_num(np.asarray(traded_quantity, dtype=np.float64)[known])
+    has_change = ~np.isnan(change)
+
+    count = np.bincount(codes, minlength=n)
+    turnover = np.bincount(codes, weights=value, minlength=n)
+    volume = np.bincount(codes, weights=quantity, minlength=n)
+    weighted_change = np.bincount(codes, weights=np.where(has_change, change * value, 0.0), minlength=n)
+    changed_value = np.bincount(codes, weights=np.where(has_change, value, 0.0), minlength=n)
+    total = turnover.sum()
+    return SectorMetrics(
+        sectors=sector_map.sectors,
+        count=count,
+        advances=np.bincount(codes, weights=has_change & (change > 0), minlength=n).astype(np.int64),
+        declines=np.bincount(codes, weights=has_change & (change < 0), minlength=n).astype(np.int64),
+        unchanged=np.bincount(codes, weights=has_change & (change == 0), minlength=n).astype(np.int64),
+        turnover=turnover,
+        volume=volume,
+        turnover_share=turnover / total if total else np.zeros(n),
+        vwap=_divide(np, turnover, volume),
+        percent_change=_divide(np, weighted_change, changed_value),
+    )
+
+
+def market_metrics(snapshot: Snapshot, sector_map: SectorMap, trading_average: Optional[Snapshot] = None) -> MarketMetrics:
+    """
+    Computes percent change, VWAP, turnover share and sector aggregates for a whole snapshot at once.
+
+    Args:
+        snapshot: `get_today_price()` or `get_live_trades()` output, as rows or as `as_format='numpy'` columns.
+                  Passing columns skips the conversion, which is the bulk of the work for row input.
+        sector_map: The symbol-to-sector index, built once with `SectorMap.from_securities()`.
+        trading_average: `get_trading_average()` output, as rows or columns. When given, each security's
+                         n-day weighted average price is joined by symbol into `average_price`, and
+                         `premium` holds the percent the close is above it.
+
+    Returns:
+        MarketMetrics: Arrays aligned with the rows of `snapshot`.
+    """
+    np = _numpy()
+    columns = _columns(snapshot, ('symbol',) + CLOSE_COLUMNS + PREVIOUS_CLOSE_COLUMNS + VALUE_COLUMNS + QUANTITY_COLUMNS)
+    symbols = _symbols(columns)
+    close = _column(np, columns, CLOSE_COLUMNS)
+    value = _column(np, columns, VALUE_COLUMNS)
+    quantity = _column(np, columns, QUANTITY_COLUMNS)
+    change = percent_change(close, _column(np, columns, PREVIOUS_CLOSE_COLUMNS))
+
+    codes = sector_map.codes(symbols)
+    unknown = int((codes < 0).sum())
+    if unknown:
+        logger.debug(f"{unknown} symbols are missing from the sector map and are left out of sector aggregates.")
+
+    value_share = turnover_share(value)
+    metrics = MarketMetrics(
+        symbols=symbols.decode() if isinstance(symbols, EncodedColumn) else np.asarray(symbols, dtype=object),
+        close=close,
+        percent_change=change,
+        vwap=vwap(value, quantity),
+        turnover=value,
+        turnover_share=value_share,
+        total_turnover=float(np.nansum(value)),
+        sector=codes,
+        sectors=sector_aggregates(sector_map, codes, change, value, quantity),
+    )
+    if trading_average is not None:
+        metrics.average_price = _join_average(np, sector_map, sector_map.positions(symbols), trading_average)
+        metrics.premium = percent_change(close, metrics.average_price)
+    return metrics
+
+
+def _join_average(np, sector_map: SectorMap, positions: Any, trading_average: Snapshot) -> Any:
+    # Both snapshots are resolved to positions in the sector map, so the join is two array scatters/gathers.
+    columns = _columns(trading_average, ('symbol',) + AVERAGE_COLUMNS)
+    averages = _column(np, columns, AVERAGE_COLUMNS)
+    average_positions = sector_map.positions(_symbols(columns))
+    by_position = np.full(len(sector_map.symbols), np.nan)
+    known = average_positions >= 0
+    by_position[average_positions[known]] = averages[known]
+    return np.where(positions >= 0, by_position[positions], np.nan)
@@ -0,0 +1,993 @@
+# nepse_scraper/async_client.py
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from .analytics import MarketMetrics, SectorMap, market_metrics
+from .async_core import AsyncNepseAPISession
+from .core import ROOT_URL
+from .batch import DEFAULT_MAX_WORKERS, BatchResult, run_batch_async
+from .cache import CacheBackend
+from .columnar import format_rows, validate_format
+from .credentials import CredentialStore
+from .decoding import JsonDecoder
+from .endpoints import LIVE_INDEX_IDS, api_dict
+from .history import HistoryStore
+from .metrics import MetricsRegistry
+from .models import LiveTrade, SectorIndex, TickerInfo, TodayPrice
+from .pagination import aiter_rows, collect_pages_async, page_rows, page_workers
+from .ratelimit import AdaptiveConcurrency, RateLimiter
+from .replay import PathLike, Recorder, Replayer
+from .security_index import SecurityIndex
+from .token_manager import DEFAULT_TOKEN_TTL
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncNepseScraper:
+    """
+    The asyncio client for the Nepal Stock Exchange (NEPSE) API.
+
+    Exposes the same methods as `NepseScraper`, as coroutines. A single
+    instance can keep many requests in flight on one event loop:
+
+        async with AsyncNepseScraper(verify_ssl=False) as scraper:
+            infos = await asyncio.gather(*(scraper.get_ticker_info(t) for t in tickers))
+    """
+    def __init__(
+        self,
+        verify_ssl: bool = True,
+        max_connections: int = 100,
+        token_ttl: float = DEFAULT_TOKEN_TTL,
+        cache: Union[bool, CacheBackend, None] = None,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        security_index: Optional[SecurityIndex] = None,
+        json_decoder: Union[str, JsonDecoder, None] = None,
+        history_store: Optional[HistoryStore] = None,
+        rate_limit: Union[float, RateLimiter, None] = None,
+        endpoint_rate_limits: Optional[Dict[str, float]] = None,
+        adaptive_concurrency: Union[bool, AdaptiveConcurrency, None] = None,
+        coalesce_requests: bool = True,
+        metrics: Union[bool, MetricsRegistry, None] = None,
+        base_url: str = ROOT_URL,
+        record: Union[PathLike, Recorder, None] = None,
+        replay: Union[PathLike, Replayer, None] = None,
+        compression: bool = True,
+        http2: bool = False,
+        credential_store: Union[bool, CredentialStore, None] = None,
+    ) -> None:
+        """
+        Initializes the client and the underlying async API session; arguments match `NepseScraper`.
+
+        `max_connections` sizes the connection pool, and `http2=True` multiplexes concurrent
+        requests over HTTP/2 (requires `pip install nepse-scraper[http2]`).
+        """
+        # for registring option
+        self.endpoints = api_dict.copy() 
+        self.session = AsyncNepseAPISession(
+            verify_ssl=verify_ssl, max_connections=max_connections, token_ttl=token_ttl,
+            endpoints=self.endpoints, cache=cache, cache_ttls=cache_ttls, json_decoder=json_decoder,
+            rate_limit=rate_limit, endpoint_rate_limits=endpoint_rate_limits, adaptive_concurrency=adaptive_concurrency,
+            coalesce_requests=coalesce_requests, metrics=metrics, base_url=base_url,
+            record=record, replay=replay, compression=compression, http2=http2,
+            credential_store=credential_store,
+        )
+        self._security_index = security_index if security_index is not None else SecurityIndex()
+        self._sector_map: Optional[SectorMap] = None
+        self._sector_map_lock = asyncio.Lock()
+        self._security_index_lock = asyncio.Lock()
+        self._history_store = history_store
+        logger.info("AsyncNepseScraper client initialized.")
+
+    async def __aenter__(self) -> "AsyncNepseScraper":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Closes the underlying HTTP connection pool."""
+        await self.session.aclose()
+
+    @property
+    def metrics(self) -> Optional[MetricsRegistry]:
+        """The session's request metrics, or None unless the client was created with `metrics=True`."""
+        return self.session.metrics
+
+    # =========================================================================
+    # Private Helper Methods
+    # =========================================================================
+
+    async def _get_security_map(self) -> Dict[str, int]:
+        """Internal helper returning the symbol-to-id map, downloading it only if the saved index is stale."""
+        await self._refresh_security_index()
+        return self._security_index.symbols
+
+    async def _refresh_security_index(self, missing: Optional[List[str]] = None) -> None:
+        """Downloads the security listing if the index is stale or `missing` symbols justify a refresh."""
+        index = self._security_index
+        async with self._security_index_lock:
+            needed = index.should_refresh(missing) if missing else index.is_stale()
+            if not needed:
+                return
+            logger.info("Fetching all security listings to build symbol-to-id map.")
+            endpoint = self.endpoints['security_api']
+            response = await self.session.get(endpoint['api'], bypass_cache=True)
+            index.update(self.session.decode(response))
+
+    async def _resolve_ticker_ids(self, tickers: List[str]) -> Dict[str, int]:
+        """Resolves a list of ticker symbols to their security IDs."""
+        resolved_tickers, missing = await self._partition_ticker_ids(tickers)
+        if missing:
+            logger.error(f"Could not find security IDs for the following tickers: {missing}")
+            raise ValueError(f"Ticker(s) not found: {missing}")
+        return resolved_tickers
+
+    async def _partition_ticker_ids(self, tickers: List[str]) -> Tuple[Dict[str, int], List[str]]:
+        """Splits tickers into known and unknown symbols, refreshing the index once for unknown ones."""
+        await self._refresh_security_index()
+        index = self._security_index
+        resolved_tickers, missing = index.resolve(tickers)
+        if missing and index.should_refresh(missing):
+            await self._refresh_security_index(missing)
+            resolved_tickers, missing = index.resolve(tickers)
+            index.mark_missing(missing)
+        return resolved_tickers, missing
+
+    @staticmethod
+    def _normalize_tickers(ticker: Union[str, List[str]]) -> List[str]:
+        """Upper-cases a single ticker or a list of tickers into a list."""
+        if not ticker:
+            raise ValueError('Ticker is required.')
+        return [ticker.upper()] if isinstance(ticker, str) else [t.upper() for t in ticker]
+
+    async def _fetch_batch(self, tickers: List[str], fetch: Callable[[int], Awaitable[Any]], max_workers: Optional[int]) -> BatchResult:
+        """Runs `fetch(security_id)` concurrently for every ticker, recording unknown tickers as errors."""
+        ticker_ids, missing = await self._partition_ticker_ids(tickers)
+        batch = await run_batch_async(fetch, ticker_ids, max_workers=max_workers)
+        for symbol in missing:
+            batch.errors[symbol] = ValueError(f"Ticker(s) not found: {[symbol]}")
+        return batch
+
+    async def _fetch_tickers(self, ticker: Union[str, List[str]], fetch: Callable[[int], Awaitable[Any]], max_workers: Optional[int]) -> Union[Any, Dict[str, Any]]:
+        """Fetches one or more tickers, returning a single result or a dict keyed by symbol; raises on any failure."""
+        ticker_list = self._normalize_tickers(ticker)
+        ticker_ids = await self._resolve_ticker_ids(ticker_list)
+        if len(ticker_list) == 1:
+            return await fetch(ticker_ids[ticker_list[0]])
+        batch = await run_batch_async(fetch, ticker_ids, max_workers=max_workers)
+        batch.raise_for_errors()
+        return batch.results
+
+    # =========================================================================
+    # Extensibility Methods
+    # =========================================================================
+
+    def register_endpoint(self, name: str, path: str, method: str = 'GET'):
+        """
+        Dynamically registers a new API endpoint.
+
+        This allows users to access new or custom NEPSE API endpoints that are
+        not yet officially supported by the library.
+
+        Args:
+            name: A unique name for the endpoint (e.g., 'new_market_data').
+            path: The API path (e.g., '/api/nots/new-data-point').
+            method: The HTTP method, 'GET' or 'POST'. Defaults to 'GET'.
+        """
+        if name in self.endpoints:
+            logger.warning(f"Endpoint '{name}' already exists. Overwriting.")
+        
+        self.endpoints[name] = {"api": path, "method": method.upper()}
+        logger.info(f"Successfully registered new endpoint: '{name}'")
+
+    async def call_endpoint(self, name: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None, bypass_cache: bool = False) -> Any:
+        """
+        Calls a registered endpoint by its name.
+
+        This is a generic method to interact with both built-in and
+        user-registered endpoints.
+
+        Args:
+            name: The name of the endpoint to call.
+            params: A dictionary of query string parameters for the request.
+            payload: A dictionary for the JSON request body.
+            which_payload (str, optional): The type of dynamic payload to generate ('stock-live' or 'sector-live').
+            bypass_cache (bool): If True, skips the response cache and refreshes it with the live response.
+
+        Returns:
+            The JSON response from the API.
+            
+        Raises:
+            ValueError: If the endpoint name is not found or the method is unsupported.
+        """
+        logger.info(f"Calling generic endpoint: '{name}'")
+        if name not in self.endpoints:
+            raise ValueError(f"Endpoint '{name}' not found. Please register it first using the register_endpoint method.")
+            
+        endpoint_info = self.endpoints[name]
+        method = endpoint_info['method']
+        path = endpoint_info['api']
+
+        if method == 'GET':
+            response = await self.session.get(path, params=params, bypass_cache=bypass_cache)
+        elif method == 'POST':
+            response = await self.session.post(path, params=params, payload=payload, which_payload=which_payload, bypass_cache=bypass_cache)
+        else:
+            raise ValueError(f"Unsupported HTTP method '{method}' for endpoint '{name}'.")
+            
+        return self.session.decode(response)
+
+    async def stream_endpoint(self, name: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None, key: Optional[str] = 'content') -> AsyncIterator[Any]:
+        """Calls a registered endpoint and yields the rows of its JSON array response as they download."""
+        logger.info(f"Streaming generic endpoint: '{name}'")
+        if name not in self.endpoints:
+            raise ValueError(f"Endpoint '{name}' not found. Please register it first using the register_endpoint method.")
+        endpoint_info = self.endpoints[name]
+        async for row in self.session.stream_json(endpoint_info['method'], endpoint_info['api'], params=params, payload=payload, which_payload=which_payload, key=key):
+            yield row
+
+    def invalidate_cache(self, name: Optional[str] = None) -> None:
+        """
+        Drops cached responses so the next call goes to the network.
+
+        Args:
+            name (str, optional): The endpoint name (e.g. 'sector_api'). Defaults to None, which clears every endpoint.
+        """
+        logger.info(f"Invalidating response cache for: {name or 'all endpoints'}")
+        self.session.invalidate_cache(name)
+
+    # =========================================================================
+    # Public API Methods
+    # =========================================================================
+
+    async def is_market_open(self) -> bool:
+        """
+        Checks if the NEPSE market is currently open.
+
+        Returns:
+            bool: True if the market is open, False otherwise.
+        """
+        logger.info("Checking market status.")
+        endpoint = self.endpoints['marketopen_api'] # Use self.endpoints
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response).get('isOpen', 'CLOSE') == 'OPEN'
+
+    async def get_today_price(self, business_date: Optional[str] = None, page_size: int = 500, max_workers: int = DEFAULT_MAX_WORKERS, as_format: Optional[str] = None) -> Any:
+        """
+        Get today's trading data from the Nepal Stock Exchange (NEPSE).
+
+        Every page is fetched: the first response tells how many pages there
+        are, and the remaining ones are requested concurrently.
+
+        Args:
+            business_date (str, optional): The date for which trading data should be retrieved in "YYYY-MM-DD" format. 
+                                           Defaults to None, which retrieves data for the latest trading day.
+            page_size (int): The number of records requested per page. Defaults to 500.
+            max_workers (int): The maximum number of pages fetched concurrently. Defaults to 8.
+            as_format (str, optional): 'numpy' or 'arrow' to return typed columns, or 'records' for a list of
+                                       `TodayPrice` records (see `nepse_scraper.models`), instead of a list
+                                       of dictionaries. Defaults to None.
+
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries, each representing a security's price data for the day.
+            Returns a dict of NumPy columns, a `pyarrow.Table` or records when `as_format` is given.
+        """
+        validate_format(as_format, TodayPrice)
+        logger.info(f"Fetching today's price for date: {business_date or 'latest'}")
+        fetch_page = self._today_price_page_fetcher(business_date, page_size)
+        merged = await collect_pages_async(fetch_page, max_workers)
+        return format_rows(merged.get('content', []), as_format, TodayPrice)
+
+    async def iter_today_price(self, business_date: Optional[str] = None, page_size: int = 500, prefetch: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams today's trading data row by row, holding one page in memory at a time.
+
+        Args:
+            business_date (str, optional): The date in "YYYY-MM-DD" format. Defaults to the latest trading day.
+            page_size (int): The number of records requested per page. Defaults to 500.
+            prefetch (int): The number of following pages requested in the background. Defaults to 0.
+
+        Yields:
+            Dict[str, Any]: A security's price data for the day.
+        """
+        logger.info(f"Streaming today's price for date: {business_date or 'latest'}")
+        async for row in aiter_rows(self._today_price_page_fetcher(business_date, page_size), prefetch=prefetch):
+            yield row
+
+    def _today_price_page_fetcher(self, business_date: Optional[str], page_size: int) -> Callable[[int], Awaitable[Any]]:
+        endpoint = self.endpoints['today_price_api']
+
+        async def fetch_page(page: int) -> Any:
+            params = {"page": str(page), "size": str(page_size), "businessDate": business_date}
+            response = await self.session.post(endpoint['api'], params=params)
+            return self.session.decode(response)
+
+        return fetch_page
+
+    async def get_top_stocks(self, category: str, show_all: bool = False, as_format: Optional[str] = None) -> Any:
+        """
+        Fetches top stocks based on a category (e.g., gainers, losers, turnover).
+
+        Args:
+            category (str): The category of top stocks to fetch. Valid options are:
+                            'top_gainer', 'top_loser', 'top_turnover', 'top_trade', 'top_transaction'.
+            show_all (bool): If True, fetches all stocks in the category, not just the top ten. Defaults to False.
+            as_format (str, optional): 'numpy' or 'arrow' to return typed columns instead of a list of
+                                       dictionaries (see `nepse_scraper.columnar`). Defaults to None.
+
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries representing the top stocks.
+            Returns a dict of NumPy columns or a `pyarrow.Table` when `as_format` is given.
+
+        Raises:
+            ValueError: If an invalid category is provided.
+        """
+        logger.info(f"Fetching top stocks for category: {category}, show_all: {show_all}")
+        valid_categories = ('top_gainer', 'top_loser', 'top_turnover', 'top_trade', 'top_transaction')
+        if category not in valid_categories:
+            raise ValueError(f"Invalid category: {category}. Must be one of {valid_categories}")
+        validate_format(as_format)
+
+        endpoint = self.endpoints[category]
+        params = {'all': str(show_all).lower()}
+        response = await self.session.get(endpoint['api'], params=params)
+        return format_rows(self.session.decode(response), as_format)
+
+    async def get_ticker_info(self, ticker: Union[str, List[str]], max_workers: int = DEFAULT_MAX_WORKERS, as_format: Optional[str] = None) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Retrieve all the information for one or more tickers from Nepse.
+
+        Args:
+            ticker (Union[str, List[str]]): A single ticker symbol as a string or a list of ticker symbols.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
+            as_format (str, optional): 'records' to return `TickerInfo` records (see `nepse_scraper.models`)
+                                       instead of dictionaries. Defaults to None.
+
+        Returns:
+            Union[Dict[str, Any], Dict[str, Dict[str, Any]]]: 
+                If a single ticker is provided, returns a dictionary with its information.
+                If a list of tickers is provided, returns a dictionary with tickers as keys and their info as values.
+
+        Raises:
+            ValueError: If the provided ticker is not found in NEPSE or if no ticker is provided.
+        """
+        if as_format not in (None, 'records'):
+            raise ValueError(f"Invalid as_format: {as_format}. Must be 'records' or None")
+        logger.info(f"Fetching ticker info for: {ticker}")
+        fetch = self._fetch_ticker_info
+        if as_format == 'records':
+            # Converted per ticker, so the single-ticker result is unwrapped the same way as without a format.
+            async def fetch(security_id: int) -> TickerInfo:
+                return TickerInfo.from_dict(await self._fetch_ticker_info(security_id))
+        return await self._fetch_tickers(ticker, fetch, max_workers)
+
+    async def get_ticker_info_batch(self, tickers: List[str], max_workers: int = DEFAULT_MAX_WORKERS) -> BatchResult:
+        """
+        Retrieve information for many tickers concurrently, tolerating individual failures.
+
+        Args:
+            tickers (List[str]): The ticker symbols to fetch.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
+
+        Returns:
+            BatchResult: Info dictionaries keyed by symbol in `results`, and the error for
+                         each symbol that could not be fetched (including unknown symbols) in `errors`.
+        """
+        ticker_list = self._normalize_tickers(tickers)
+        logger.info(f"Batch fetching ticker info for {len(ticker_list)} tickers.")
+        return await self._fetch_batch(ticker_list, self._fetch_ticker_info, max_workers)
+
+    async def _fetch_ticker_info(self, security_id: int) -> Dict[str, Any]:
+        endpoint = self.endpoints['ticker_info_api']
+        response = await self.session.post(f"{endpoint['api']}/{security_id}", which_payload='stock-live')
+        return self.session.decode(response)
+
+    async def get_live_trades(self, as_format: Optional[str] = None, check_market_open: bool = True) -> Any:
+        """
+        Fetches the live market trades if the market is open.
+
+        Args:
+            as_format (str, optional): 'numpy' or 'arrow' to return typed columns, or 'records' for a list of
+                                       `LiveTrade` records (see `nepse_scraper.models`), instead of a list
+                                       of dictionaries. Defaults to None.
+            check_market_open (bool): If True, first calls `is_market_open()` and returns an empty result
+                                      when the market is closed. Pollers that track the market state
+                                      themselves pass False to save a request. Defaults to True.
+
+        Returns:
+            List[Dict[str, Any]]: A list of live trade data, or an empty list if the market is closed.
+            Returns a dict of NumPy columns, a `pyarrow.Table` or records when `as_format` is given.
+        """
+        validate_format(as_format, LiveTrade)
+        if check_market_open and not await self.is_market_open():
+            logger.warning("Attempted to get live trades while market is closed.")
+            return format_rows([], as_format, LiveTrade)
+
+        logger.info("Fetching live trades.")
+        endpoint = self.endpoints['stock_live_api']
+        response = await self.session.post(endpoint['api'], which_payload='stock-live')
+        return format_rows(self.session.decode(response), as_format, LiveTrade)
+
+    async def get_indices_history(self, index_id: int, start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        """
+        Fetches the historical data for a given index ID within a date range.
+
+        Args:
+            index_id (int): The ID of the index to fetch (e.g., 58 for NEPSE Index).
+            start_date (str): The start date in "YYYY-MM-DD" format.
+            end_date (str): The end date in "YYYY-MM-DD" format.
+
+        Returns:
+            List[Dict[str, Any]]: A list of historical data points for the index.
+        """
+        logger.info(f"Fetching historical data for index ID: {index_id}")
+        endpoint = self.endpoints['head_indices_api']
+        path = f"{endpoint['api']}/{index_id}"
+        params = {'startDate': start_date, 'endDate': end_date}
+        response = await self.session.get(path, params=params)
+        return self.session.decode(response)
+
+    async def get_sectorwise_summary(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve the sector-wise summary from the Nepal Stock Exchange (NEPSE).
+
+        Returns:
+            List[Dict[str, Any]]: A JSON response from the NEPSE API containing the sector-wise summary.
+        """
+        logger.info("Fetching sector-wise summary.")
+        endpoint = self.endpoints['sectorwise_summary_api']
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response)
+
+    async def get_market_summary_history(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve the market summary history from the Nepal Stock Exchange (NEPSE).
+
+        Returns:
+            List[Dict[str, Any]]: A JSON response containing the historical market summary.
+        """
+        logger.info("Fetching historical market summary.")
+        endpoint = self.endpoints['market_summary_history_api']
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response)
+
+    async def get_company_disclosures(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve the latest news and announcements (disclosures) from NEPSE.
+
+        Returns:
+            List[Dict[str, Any]]: A list of news and announcements.
+        """
+        logger.info("Fetching company disclosures.")
+        endpoint = self.endpoints['disclosure']
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response).get('news', [])
+
+    async def get_market_summary(self) -> Dict[str, Any]:
+        """
+        Retrieve today's market summary from the Nepal Stock Exchange (NEPSE).
+
+        Returns:
+            Dict[str, Any]: A dictionary containing the current market summary.
+        """
+        logger.info("Fetching current market summary.")
+        endpoint = self.endpoints['market_summary_api']
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response)
+
+    async def get_all_securities(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve a list of all listed securities on the NEPSE.
+
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries, each with details of a security.
+        """
+        logger.info("Fetching all securities.")
+        endpoint = self.endpoints['security_api']
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response)
+
+    async def get_market_cap(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve market capitalization data from the Nepal Stock Exchange (NEPSE).
+
+        Returns:
+            List[Dict[str, Any]]: A list containing market capitalization data.
+        """
+        logger.info("Fetching market capitalization data.")
+        endpoint = self.endpoints['marketcap_api']
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response)
+    async def get_brokers(self, max_workers: int = DEFAULT_MAX_WORKERS, **kwargs) -> List[Dict[str, Any]]:
+        """Fetches a list of all registered brokers from NEPSE with optional filters, across every page."""
+        logger.info(f"Fetching list of brokers with filters: {kwargs}")
+        merged = await collect_pages_async(self._broker_page_fetcher(**kwargs), max_workers)
+        return merged.get('content', [])
+
+    async def iter_brokers(self, prefetch: int = 0, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Streams registered brokers page by page, accepting the same filters as `get_brokers`."""
+        logger.info(f"Streaming list of brokers with filters: {kwargs}")
+        async for row in aiter_rows(self._broker_page_fetcher(**kwargs), prefetch=prefetch):
+            yield row
+
+    def _broker_page_fetcher(self, page_size: int = 500, **kwargs) -> Callable[[int], Awaitable[Any]]:
+        endpoint = self.endpoints['broker_api']
+        
+        # Construct parameters with the filters
+        payload = {
+            "memberName": kwargs.get("member_name", ""),
+            "contactPerson": kwargs.get("contact_person", ""),
+            "contactNumber": kwargs.get("contact_number", ""),
+            "memberCode": kwargs.get("member_code", ""),
+            "provinceId": kwargs.get("province_id", 0),
+            "districtId": kwargs.get("district_id", 0),
+            "municipalityId": kwargs.get("municipality_id", 0)
+        }
+
+        async def fetch_page(page: int) -> Any:
+            params = {"page": str(page), "size": str(page_size)}
+            response = await self.session.post(endpoint['api'], payload=payload, params=params)
+            return self.session.decode(response)
+
+        return fetch_page
+
+    async def get_sectors(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve details of all sectors listed in the NEPSE.
+
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries, each containing sector details.
+        """
+        logger.info("Fetching list of all sectors.")
+        endpoint = self.endpoints['sector_api']
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response)
+
+    async def get_sector_indices(self, as_format: Optional[str] = None) -> Any:
+        """
+        Retrieve index information for all sectors listed in the NEPSE.
+
+        Args:
+            as_format (str, optional): 'numpy' or 'arrow' to return typed columns, or 'records' for a list of
+                                       `SectorIndex` records (see `nepse_scraper.models`), instead of a list
+                                       of dictionaries. Defaults to None.
+
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries containing sector index data.
+        """
+        validate_format(as_format, SectorIndex)
+        logger.info("Fetching list of all sector indices.")
+        endpoint = self.endpoints['sector_index_api']
+        response = await self.session.get(endpoint['api'])
+        return format_rows(self.session.decode(response), as_format, SectorIndex)
+        
+    async def get_live_indices(self, index_id: int = 58) -> List[Dict[str, Any]]:
+        """
+        Retrieve live indices data. If the market is closed, it retrieves the last trading day's index data.
+
+        Args:
+            index_id (int): The ID for the index. Defaults to 58 (NEPSE Index).
+                            Refer to NEPSE documentation for a full list of valid index IDs.
+
+        Returns:
+            List[Dict[str, Any]]: A list containing time-series data for the index.
+            
+        Raises:
+            ValueError: If the provided index ID is not within a valid range.
+        """
+        if not (51 <= index_id <= 67):
+             raise ValueError(f"'{index_id}' is not a valid index ID. Must be between 51 and 67.")
+
+        logger.info(f"Fetching live data for index ID: {index_id}")
+        return await self._fetch_live_index(index_id)
+
+    async def get_all_live_indices(self, index_ids: Optional[List[int]] = None, max_workers: Optional[int] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Retrieve the live time series of every index at once, fetched concurrently.
+
+        Authentication and the 'sector-live' payload id are settled once up
+        front, so the requests all reuse them and go out together over the
+        shared connection pool: the board refreshes in about one round-trip.
+
+        Args:
+            index_ids (List[int], optional): The index IDs to fetch. Defaults to every index (51 to 67).
+            max_workers (int, optional): The maximum number of concurrent requests. Defaults to one per index.
+
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: The time series of each index, keyed by index ID in the requested order.
+
+        Raises:
+            ValueError: If any index ID is not within the valid range.
+        """
+        index_ids = list(LIVE_INDEX_IDS if index_ids is None else index_ids)
+        invalid = [index_id for index_id in index_ids if index_id not in LIVE_INDEX_IDS]
+        if invalid:
+            raise ValueError(f"{invalid} are not valid index IDs. Must be between 51 and 67.")
+        logger.info(f"Fetching live data for {len(index_ids)} indices.")
+        await self.session.payload_id('sector-live')
+        batch = await run_batch_async(self._fetch_live_index, {index_id: index_id for index_id in index_ids}, max_workers=max_workers or len(index_ids))
+        batch.raise_for_errors()
+        return batch.results
+
+    async def _fetch_live_index(self, index_id: int) -> List[Dict[str, Any]]:
+        endpoint = self.endpoints['indices_live_api']
+        response = await self.session.post(f"{endpoint['api']}/{index_id}", which_payload='sector-live')
+        return self.session.decode(response)
+
+    async def get_ticker_contact(self, ticker: Union[str, List[str]], max_workers: int = DEFAULT_MAX_WORKERS) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Retrieve contact information for one or more tickers from Nepse.
+
+        Args:
+            ticker (Union[str, List[str]]): A single ticker symbol or a list of ticker symbols.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
+
+        Returns:
+            Union[Dict[str, Any], Dict[str, Dict[str, Any]]]: 
+                Contact information for a single ticker, or a dictionary of contact information keyed by ticker symbol.
+
+        Raises:
+            ValueError: If the ticker is not found or no ticker is provided.
+        """
+        logger.info(f"Fetching contact info for: {ticker}")
+        return await self._fetch_tickers(ticker, self._fetch_ticker_contact, max_workers)
+
+    async def get_ticker_contact_batch(self, tickers: List[str], max_workers: int = DEFAULT_MAX_WORKERS) -> BatchResult:
+        """
+        Retrieve contact information for many tickers concurrently, tolerating individual failures.
+
+        Args:
+            tickers (List[str]): The ticker symbols to fetch.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
+
+        Returns:
+            BatchResult: Contact dictionaries keyed by symbol, plus a per-symbol error map.
+        """
+        ticker_list = self._normalize_tickers(tickers)
+        logger.info(f"Batch fetching contact info for {len(ticker_list)} tickers.")
+        return await self._fetch_batch(ticker_list, self._fetch_ticker_contact, max_workers)
+
+    async def _fetch_ticker_contact(self, security_id: int) -> Dict[str, Any]:
+        endpoint = self.endpoints['ticker_contact_api']
+        response = await self.session.get(f"{endpoint['api']}/{security_id}")
+        return self.session.decode(response)
+
+    async def get_ticker_price_history(self, ticker: Union[str, List[str]], start_date: str, end_date: str, page: Optional[int] = None, size: int = 500, max_workers: int = DEFAULT_MAX_WORKERS) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Fetches the price history for one or more tickers within a date range.
+
+        Args:
+            ticker (Union[str, List[str]]): A single ticker symbol or a list of ticker symbols.
+            start_date (str): The start date in "YYYY-MM-DD" format.
+            end_date (str): The end date in "YYYY-MM-DD" format.
+            page (int, optional): A single page to fetch. Defaults to None, which fetches every page
+                                  and merges the rows into the first page's `content`.
+            size (int): The number of records per page.
+            max_workers (int): The maximum number of concurrent requests, shared between the tickers and their pages. Defaults to 8.
+
+        Returns:
+            Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+                The price history page for a single ticker, or a dictionary of pages keyed by ticker symbol.
+        """
+        logger.info(f"Fetching price history for ticker: {ticker}")
+        ticker_list = self._normalize_tickers(ticker)
+        fetch = self._price_history_fetcher(start_date, end_date, page, size, page_workers(max_workers, len(ticker_list)))
+        return await self._fetch_tickers(ticker_list, fetch, max_workers)
+
+    async def get_ticker_price_history_batch(self, tickers: List[str], start_date: str, end_date: str, page: Optional[int] = None, size: int = 500, max_workers: int = DEFAULT_MAX_WORKERS) -> BatchResult:
+        """
+        Fetches price history for many tickers concurrently, tolerating individual failures.
+
+        Args:
+            tickers (List[str]): The ticker symbols to fetch.
+            start_date (str): The start date in "YYYY-MM-DD" format.
+            end_date (str): The end date in "YYYY-MM-DD" format.
+            page (int, optional): A single page to fetch. Defaults to None, which fetches every page.
+            size (int): The number of records per page.
+            max_workers (int): The maximum number of concurrent requests, shared between the tickers and their pages. Defaults to 8.
+
+        Returns:
+            BatchResult: Price history pages keyed by symbol, plus a per-symbol error map.
+        """
+        ticker_list = self._normalize_tickers(tickers)
+        logger.info(f"Batch fetching price history for {len(ticker_list)} tickers.")
+        fetch = self._price_history_fetcher(start_date, end_date, page, size, page_workers(max_workers, len(ticker_list)))
+        return await self._fetch_batch(ticker_list, fetch, max_workers)
+
+    async def iter_ticker_price_history(self, ticker: str, start_date: str, end_date: str, size: int = 500, prefetch: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Streams the price history for a ticker row by row, holding one page in memory at a time.
+
+        Args:
+            ticker (str): The ticker symbol for the security.
+            start_date (str): The start date in "YYYY-MM-DD" format.
+            end_date (str): The end date in "YYYY-MM-DD" format.
+            size (int): The number of records per page.
+            prefetch (int): The number of following pages requested in the background. Defaults to 0.
+
+        Yields:
+            Dict[str, Any]: A single day's price record.
+        """
+        ticker_upper = ticker.upper()
+        logger.info(f"Streaming price history for ticker: {ticker_upper}")
+        security_id = (await self._resolve_ticker_ids([ticker_upper]))[ticker_upper]
+        fetch_page = self._price_history_page_fetcher(security_id, start_date, end_date, size)
+        async for row in aiter_rows(fetch_page, prefetch=prefetch):
+            yield row
+
+    def _price_history_page_fetcher(self, security_id: int, start_date: str, end_date: str, size: int) -> Callable[[int], Awaitable[Any]]:
+        endpoint = self.endpoints['ticker_price_api']
+
+        async def fetch_page(page: int) -> Any:
+            params = {
+                'startDate': start_date,
+                'endDate': end_date,
+                'page': page,
+                'size': size
+            }
+            response = await self.session.get(f"{endpoint['api']}/{security_id}", params=params)
+            return self.session.decode(response)
+
+        return fetch_page
+
+    def _price_history_fetcher(self, start_date: str, end_date: str, page: Optional[int], size: int, max_workers: Optional[int]) -> Callable[[int], Awaitable[Dict[str, Any]]]:
+        async def fetch(security_id: int) -> Dict[str, Any]:
+            fetch_page = self._price_history_page_fetcher(security_id, start_date, end_date, size)
+            if page is not None:
+                return await fetch_page(page)
+            return await collect_pages_async(fetch_page, max_workers)
+
+        return fetch
+
+    @property
+    def history_store(self) -> HistoryStore:
+        """The local price history store, created in the package cache directory on first use."""
+        if self._history_store is None:
+            self._history_store = HistoryStore()
+        return self._history_store
+
+    async def sync_history(self, tickers: Union[str, List[str]], start_date: str, end_date: str, size: int = 500, max_workers: int = DEFAULT_MAX_WORKERS) -> BatchResult:
+        """Downloads the price history of many tickers into the local `history_store`, fetching only missing dates."""
+        ticker_list = self._normalize_tickers(tickers)
+        logger.info(f"Syncing price history for {len(ticker_list)} tickers between {start_date} and {end_date}.")
+        return await self._fetch_batch(ticker_list, self._history_syncer(start_date, end_date, size, page_workers(max_workers, len(ticker_list))), max_workers)
+
+    async def get_stored_price_history(self, ticker: Union[str, List[str]], start_date: str, end_date: str, sync: bool = False, max_workers: int = DEFAULT_MAX_WORKERS) -> Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+        """Reads price history from the local `history_store`, optionally syncing missing dates first."""
+        ticker_list = self._normalize_tickers(ticker)
+        if sync:
+            (await self.sync_history(ticker_list, start_date, end_date, max_workers=max_workers)).raise_for_errors()
+        ticker_ids = await self._resolve_ticker_ids(ticker_list)
+        # The store is SQLite; its blocking calls run in a worker thread to keep the event loop free.
+        store = self.history_store
+        history = {symbol: await asyncio.to_thread(store.read, ticker_ids[symbol], start_date, end_date) for symbol in ticker_list}
+        return history[ticker_list[0]] if len(ticker_list) == 1 else history
+
+    def _history_syncer(self, start_date: str, end_date: str, size: int, max_workers: Optional[int]) -> Callable[[int], Awaitable[int]]:
+        store = self.history_store
+
+        async def sync(security_id: int) -> int:
+            fetched = 0
+            for gap_start, gap_end in await asyncio.to_thread(store.missing_ranges, security_id, start_date, end_date):
+                fetch_page = self._price_history_page_fetcher(security_id, gap_start.isoformat(), gap_end.isoformat(), size)
+                rows = page_rows(await collect_pages_async(fetch_page, max_workers))
+                fetched += await asyncio.to_thread(store.store_range, security_id, gap_start, gap_end, rows)
+            return fetched
+
+        return sync
+
+    # =========================================================================
+    # NEW METHODS ADDED
+    # =========================================================================
+
+    async def get_nepse_index(self) -> List[Dict[str, Any]]:
+        """
+        Retrieves the NEPSE index and sub-indices data.
+
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries, each representing an index.
+        """
+        logger.info("Fetching NEPSE index data.")
+        endpoint = self.endpoints['nepse_index_api']
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response)
+
+    async def get_security_daily_trade_stat(self, ticker: Union[str, List[str]], max_workers: int = DEFAULT_MAX_WORKERS) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Retrieves daily trade statistics for one or more securities.
+
+        Args:
+            ticker (Union[str, List[str]]): A single ticker symbol or a list of ticker symbols.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
+
+        Returns:
+            Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+                The daily trade statistics for a single ticker, or a dictionary of statistics keyed by ticker symbol.
+        """
+        logger.info(f"Fetching daily trade statistics for ticker: {ticker}")
+        return await self._fetch_tickers(ticker, self._fetch_daily_trade_stat, max_workers)
+
+    async def get_security_daily_trade_stat_batch(self, tickers: List[str], max_workers: int = DEFAULT_MAX_WORKERS) -> BatchResult:
+        """
+        Retrieves daily trade statistics for many securities concurrently, tolerating individual failures.
+
+        Args:
+            tickers (List[str]): The ticker symbols to fetch.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
+
+        Returns:
+            BatchResult: Daily trade statistics keyed by symbol, plus a per-symbol error map.
+        """
+        ticker_list = self._normalize_tickers(tickers)
+        logger.info(f"Batch fetching daily trade statistics for {len(ticker_list)} tickers.")
+        return await self._fetch_batch(ticker_list, self._fetch_daily_trade_stat, max_workers)
+
+    async def _fetch_daily_trade_stat(self, security_id: int) -> Dict[str, Any]:
+        endpoint = self.endpoints['security_daily_trade_stat_api']
+        response = await self.session.get(f"{endpoint['api']}/{security_id}")
+        return self.session.decode(response)
+
+    async def get_securities_list(self) -> List[Dict[str, Any]]:
+        """
+        Retrieves a simplified list of all securities.
+
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries, each representing a security.
+        """
+        logger.info("Fetching the simplified list of securities.")
+        endpoint = self.endpoints['securities_list_api']
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response)
+
+    async def get_supply_demand(self, show_all: bool = False) -> List[Dict[str, Any]]:
+        """
+        Retrieves the top supply and demand data.
+
+        Args:
+            show_all (bool): If True, fetches all supply/demand data, not just the top. Defaults to False.
+
+        Returns:
+            List[Dict[str, Any]]: A list of supply and demand data.
+        """
+        logger.info(f"Fetching supply and demand data, show_all: {show_all}")
+        endpoint = self.endpoints['supply_demand_api']
+        params = {'all': str(show_all).lower()}
+        response = await self.session.get(endpoint['api'], params=params)
+        return self.session.decode(response)
+
+
+    async def get_top_by_trade_quantity(self, show_all: bool = False) -> List[Dict[str, Any]]:
+        """
+        Retrieves the top securities ranked by trade quantity.
+
+        Args:
+            show_all (bool): If True, fetches all data, not just the top ten. Defaults to False.
+
+        Returns:
+            List[Dict[str, Any]]: A list of securities ranked by trade quantity.
+        """
+        logger.info(f"Fetching top stocks by trade quantity, show_all: {show_all}")
+        endpoint = self.endpoints['top_trade_qty_api']
+        params = {'all': str(show_all).lower()}
+        response = await self.session.get(endpoint['api'], params=params)
+        return self.session.decode(response)
+
+    async def get_trading_average(self, n_days: int = 120, business_date: Optional[str] = None, page_size: int = 500, max_workers: int = DEFAULT_MAX_WORKERS, as_format: Optional[str] = None) -> Any:
+        """
+        Retrieve the trading average for a specified number of days, across every page.
+
+        Args:
+            n_days (int): The number of days to include in the trading average calculation (must be between 1 and 180). 
+                          Defaults to 120.
+            business_date (str, optional): The end date for the calculation in "YYYY-MM-DD" format. 
+                                           Defaults to the latest date.
+            page_size (int): The number of records requested per page. Defaults to 500.
+            max_workers (int): The maximum number of pages fetched concurrently. Defaults to 8.
+            as_format (str, optional): 'numpy' or 'arrow' to return typed columns instead of a list of
+                                       dictionaries (see `nepse_scraper.columnar`). Defaults to None.
+
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries containing the trading average data.
+            Returns a dict of NumPy columns or a `pyarrow.Table` when `as_format` is given.
+            
+        Raises:
+            ValueError: If n_days is not between 1 and 180.
+        """
+        validate_format(as_format)
+        logger.info(f"Fetching trading average for {n_days} days, ending on {business_date or 'latest'}")
+        merged = await collect_pages_async(self._trading_average_page_fetcher(n_days, business_date, page_size), max_workers)
+        if as_format is None:
+            return merged
+        return format_rows(page_rows(merged), as_format)
+
+    async def iter_trading_average(self, n_days: int = 120, business_date: Optional[str] = None, page_size: int = 500, prefetch: int = 0) -> AsyncIterator[Dict[str, Any]]:
+        """Streams the trading average rows page by page; arguments match `get_trading_average`."""
+        logger.info(f"Streaming trading average for {n_days} days, ending on {business_date or 'latest'}")
+        async for row in aiter_rows(self._trading_average_page_fetcher(n_days, business_date, page_size), prefetch=prefetch):
+            yield row
+
+    def _trading_average_page_fetcher(self, n_days: int, business_date: Optional[str], page_size: int) -> Callable[[int], Awaitable[Any]]:
+        if not (1 <= n_days <= 180):
+            raise ValueError("n_days must be between 1 and 180.")
+
+        endpoint = self.endpoints['trading_average_api']
+
+        async def fetch_page(page: int) -> Any:
+            params = {
+                "nDays": n_days,
+                "businessDate": business_date,
+                "page": str(page),
+                "size": str(page_size)
+            }
+            response = await self.session.get(endpoint['api'], params=params)
+            return self.session.decode(response)
+
+        return fetch_page
+
+
+    async def get_sector_map(self, refresh: bool = False) -> SectorMap:
+        """
+        Returns the symbol-to-sector index used by `get_market_metrics`.
+
+        It is built from `get_all_securities()` and `get_sectors()` on first use
+        and kept for the lifetime of the client.
+
+        Args:
+            refresh (bool): Download the listings again, e.g. after new securities were listed. Defaults to False.
+        """
+        async with self._sector_map_lock:
+            if self._sector_map is None or refresh:
+                logger.info("Building the symbol-to-sector map.")
+                securities, sectors = await asyncio.gather(self.get_all_securities(), self.get_sectors())
+                self._sector_map = SectorMap.from_securities(securities, sectors)
+            return self._sector_map
+
+    async def get_market_metrics(self, business_date: Optional[str] = None, n_days: Optional[int] = None, max_workers: int = DEFAULT_MAX_WORKERS) -> MarketMetrics:
+        """
+        Computes market-wide metrics of today's prices in batched NumPy operations.
+
+        Percent change, VWAP, turnover share and per-sector aggregates are
+        computed over the whole market at once (see `nepse_scraper.analytics`).
+        Requires `pip install nepse-scraper[numpy]`.
+
+        Args:
+            business_date (str, optional): The date in "YYYY-MM-DD" format. Defaults to the latest trading day.
+            n_days (int, optional): Also join the `n_days` trading average into `average_price` and `premium`.
+                                    Defaults to None.
+            max_workers (int): The maximum number of pages fetched concurrently. Defaults to 8.
+
+        Returns:
+            MarketMetrics: Arrays aligned with the rows of `get_today_price()`.
+        """
+        sector_map = await self.get_sector_map()
+        snapshot = await self.get_today_price(business_date, max_workers=max_workers, as_format='numpy')
+        trading_average = None
+        if n_days is not None:
+            trading_average = await self.get_trading_average(n_days, business_date, max_workers=max_workers, as_format='numpy')
+        return market_metrics(snapshot, sector_map, trading_average)
+
+    async def get_notices(self) -> List[Dict[str, Any]]:
+        """
+        Retrieves general notices from NEPSE.
+
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries, each representing a notice.
+        """
+        logger.info("Fetching general notices.")
+        endpoint = self.endpoints['notice_api']
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response)
+
+    async def get_info_officers(self) -> List[Dict[str, Any]]:
+        """
+        Retrieves a list of information officers from NEPSE.
+
+        Returns:
+            List[Dict[str, Any]]: A list of dictionaries, each representing an information officer.
+        """
+        logger.info("Fetching list of information officers.")
+        endpoint = self.endpoints['info_officer_api']
+        response = await self.session.get(endpoint['api'])
+        return self.session.decode(response)
\ No newline at end of file
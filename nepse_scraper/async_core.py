@@ -0,0 +1,419 @@
+# nepse_scraper/async_core.py
+import asyncio
+import logging
+import ssl
+import time
+import warnings
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Union
+
+import certifi
+from urllib3.exceptions import InsecureRequestWarning
+
+from .auth import PayloadIdCache, PayloadParser, nepse_today
+from .core import COMPRESSED_ENCODINGS, DEFAULT_HEADERS, ROOT_URL, _body_size, _wire_size
+from .cache import CacheBackend, CachedResponse, MemoryCache, ResponseCache
+from .credentials import CredentialStore, make_credential_store
+from .decoding import JsonArrayParser, JsonDecoder, get_json_decoder
+from .endpoints import api_dict, resolve_endpoint_name
+from .exceptions import SSLCertVerificationError
+from .metrics import MetricsRegistry
+from .ratelimit import AdaptiveConcurrency, RateLimiter, make_rate_limiter
+from .replay import PathLike, Recorder, Replayer, make_async_transport, make_recorder, make_replayer
+from .singleflight import AsyncSingleFlight
+from .token_manager import DEFAULT_REFRESH_MARGIN, DEFAULT_TOKEN_TTL, TokenManager
+
+logger = logging.getLogger(__name__)
+
+# Mirrors the urllib3 Retry policy mounted on the synchronous session.
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 1
+RETRY_STATUSES = (500, 502, 503, 504)
+# Seconds between attempts to take a credential store's lock without blocking the event loop.
+CREDENTIAL_LOCK_POLL_INTERVAL = 0.05
+
+
+def _is_ssl_error(exc: BaseException) -> bool:
+    """Walks the exception chain looking for an SSL verification failure."""
+    while exc is not None:
+        if isinstance(exc, ssl.SSLError):
+            return True
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+class AsyncNepseAPISession:
+    """
+    The asyncio counterpart of `NepseAPISession`, built on `httpx.AsyncClient`.
+
+    Token and payload calculations are delegated to the same `TokenParser`
+    and `PayloadParser` used by the synchronous session. `record` and
+    `replay` take the same archives as the synchronous session.
+
+    With `http2=True` (which needs `pip install nepse-scraper[http2]`) the
+    client negotiates HTTP/2, so concurrent requests are multiplexed over a
+    few connections instead of one connection each.
+    """
+    def __init__(
+        self,
+        verify_ssl: bool = True,
+        max_connections: int = 100,
+        token_ttl: float = DEFAULT_TOKEN_TTL,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        endpoints: Optional[Dict[str, Dict[str, str]]] = None,
+        cache: Union[bool, CacheBackend, None] = None,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        json_decoder: Union[str, JsonDecoder, None] = None,
+        rate_limit: Union[float, RateLimiter, None] = None,
+        endpoint_rate_limits: Optional[Dict[str, float]] = None,
+        adaptive_concurrency: Union[bool, AdaptiveConcurrency, None] = None,
+        coalesce_requests: bool = True,
+        metrics: Union[bool, MetricsRegistry, None] = None,
+        base_url: str = ROOT_URL,
+        record: Union[PathLike, Recorder, None] = None,
+        replay: Union[PathLike, Replayer, None] = None,
+        compression: bool = True,
+        http2: bool = False,
+        credential_store: Union[bool, CredentialStore, None] = None,
+    ):
+        if record is not None and replay is not None:
+            raise ValueError("A session can either record or replay, not both.")
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError(
+                "AsyncNepseScraper requires the optional 'httpx' dependency. "
+                "Install it with: pip install nepse-scraper[async]"
+            ) from e
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    "HTTP/2 support requires the optional 'h2' dependency. "
+                    "Install it with: pip install nepse-scraper[http2]"
+                ) from e
+
+        self._httpx = httpx
+        self._payload_parser = PayloadParser()
+        self._token_manager = TokenManager(token_ttl=token_ttl, refresh_margin=refresh_margin)
+
+        self._payload_cache = PayloadIdCache(self._payload_parser)
+        self._auth_lock = asyncio.Lock()
+
+        self.endpoints = api_dict if endpoints is None else endpoints
+        if cache is True:
+            cache = MemoryCache()
+        self.cache: Optional[ResponseCache] = ResponseCache(cache, cache_ttls) if cache else None
+        self.json_decoder = get_json_decoder(json_decoder)
+        self.rate_limiter = make_rate_limiter(rate_limit, endpoint_rate_limits)
+        if adaptive_concurrency is True:
+            adaptive_concurrency = AdaptiveConcurrency()
+        self.concurrency: Optional[AdaptiveConcurrency] = adaptive_concurrency or None
+        self._single_flight: Optional[AsyncSingleFlight] = AsyncSingleFlight() if coalesce_requests else None
+        if metrics is True:
+            metrics = MetricsRegistry()
+        self.metrics: Optional[MetricsRegistry] = metrics or None
+        self.recorder = make_recorder(record)
+        self.replayer = make_replayer(replay)
+        self.credential_store = make_credential_store(credential_store)
+        # The store's own lock is per thread, and every task runs on the loop's thread.
+        self._credential_lock = asyncio.Lock()
+        self._market_id_lock = asyncio.Lock()
+
+        if verify_ssl:
+            verify: Any = certifi.where()
+        else:
+            verify = False
+            warnings.warn(
+                "SSL certificate verification has been disabled. This is not recommended and may be insecure.",
+                InsecureRequestWarning
+            )
+
+        limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        transport = httpx.AsyncHTTPTransport(verify=verify, limits=limits, retries=RETRY_TOTAL, http2=http2) if self.replayer is None else None
+        if self.replayer is not None or self.recorder is not None:
+            transport = make_async_transport(self.recorder, self.replayer, inner=transport)
+        headers = {**DEFAULT_HEADERS, 'Accept-Encoding': COMPRESSED_ENCODINGS if compression else 'identity'}
+        self.client = httpx.AsyncClient(base_url=base_url, headers=headers, transport=transport)
+        logger.debug("AsyncNepseAPISession initialized.")
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def _send(self, method: str, path: str, stream: bool = False, endpoint_name: Optional[str] = None, **kwargs) -> Any:
+        """
+        Sends a request, retrying server errors with exponential backoff.
+
+        With `stream=True` the body is left unread for `aiter_bytes()`; the
+        caller must close the response.
+        """
+        httpx = self._httpx
+        if kwargs.get('params'):
+            # requests silently drops None-valued params; httpx would send them as empty strings.
+            kwargs['params'] = {k: v for k, v in kwargs['params'].items() if v is not None}
+        sent_at = time.perf_counter()
+        resp = None
+        attempt = 0
+        try:
+            for attempt in range(RETRY_TOTAL + 1):
+                resp = None
+                try:
+                    resp = await self._send_limited(method, path, stream, endpoint_name, **kwargs)
+                except httpx.ConnectError as e:
+                    if _is_ssl_error(e):
+                        logger.error(f"SSL Certificate Verification failed: {e}", exc_info=True)
+                        raise SSLCertVerificationError(
+                            "SSL certificate verification failed. This is likely due to the NEPSE server's "
+                            "incomplete certificate chain or a network proxy. "
+                            "Try initializing the client with: AsyncNepseScraper(verify_ssl=False)"
+                        ) from e
+                    raise
+                if resp.status_code not in RETRY_STATUSES or attempt == RETRY_TOTAL:
+                    break
+                if stream:
+                    await resp.aclose()
+                delay = RETRY_BACKOFF_FACTOR * (2 ** attempt)
+                logger.debug(f"{method} {path} returned {resp.status_code}; retrying in {delay}s.")
+                await asyncio.sleep(delay)
+        finally:
+            if self.metrics is not None:
+                status_code = resp.status_code if resp is not None else None
+                response_bytes = _body_size(resp, stream) if resp is not None else 0
+                wire_bytes = _wire_size(resp, stream) if resp is not None else 0
+                self.metrics.record_request(endpoint_name, time.perf_counter() - sent_at, status_code, response_bytes, attempt, wire_bytes)
+        if stream and resp.is_error:
+            await resp.aclose()
+        resp.raise_for_status()
+        return resp
+
+    async def _send_limited(self, method: str, path: str, stream: bool, endpoint_name: Optional[str], **kwargs) -> Any:
+        """Sends one attempt through the rate limiter and the adaptive concurrency controller, when configured."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire_async(endpoint_name)
+        request = self.client.build_request(method, path, **kwargs)
+        if self.concurrency is None:
+            return await self.client.send(request, stream=stream)
+
+        started_at = await self.concurrency.acquire_async()
+        status_code, congested = None, False
+        try:
+            resp = await self.client.send(request, stream=stream)
+            status_code = resp.status_code
+            return resp
+        except self._httpx.TransportError:
+            congested = True
+            raise
+        finally:
+            self.concurrency.release(started_at, status_code, congested)
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self._token_manager.access_token
+
+    @property
+    def token_details(self) -> Optional[Dict[str, Any]]:
+        return self._token_manager.token_details
+
+    @asynccontextmanager
+    async def _shared_credentials(self) -> AsyncIterator[None]:
+        """
+        Holds the credential store's lock, excluding other tasks of this session and other processes.
+
+        The cross-process lock is polled for so the event loop is never blocked.
+        """
+        store = self.credential_store
+        if store is None:
+            yield
+            return
+        async with self._credential_lock:
+            while not store.acquire(blocking=False):
+                await asyncio.sleep(CREDENTIAL_LOCK_POLL_INTERVAL)
+            try:
+                yield
+            finally:
+                store.release()
+
+    async def _get_access_token(self) -> None:
+        if not self._token_manager.needs_refresh(): return
+        async with self._auth_lock, self._shared_credentials():
+            if self.credential_store is not None:
+                self.credential_store.load_token(self._token_manager)
+            if not self._token_manager.needs_refresh(): return
+            await self._renew_access_token()
+            if self.credential_store is not None:
+                self.credential_store.save_token(self._token_manager)
+
+    async def _renew_access_token(self) -> None:
+        if self._token_manager.can_refresh():
+            try:
+                await self._refresh_access_token()
+                return
+            except (self._httpx.HTTPError, KeyError, ValueError) as e:
+                logger.warning(f"Token refresh failed, re-authenticating: {e}")
+        await self._authenticate()
+
+    async def _invalidate_token(self, access_token: Optional[str]) -> None:
+        self._token_manager.invalidate(access_token)
+        if self.credential_store is not None and access_token:
+            async with self._shared_credentials():
+                self.credential_store.invalidate_token(access_token)
+
+    async def _authenticate(self) -> None:
+        logger.info("No active token found. Fetching new access token from NEPSE.")
+        auth_endpoint = api_dict['authenticate_api']
+        try:
+            response = await self._send(auth_endpoint['method'], auth_endpoint['api'], endpoint_name='authenticate_api')
+        except self._httpx.HTTPError as e:
+            logger.error(f"Failed to authenticate with NEPSE API: {e}", exc_info=True)
+            raise
+        self._store_token(response, 'authenticate_api')
+        logger.info("Successfully authenticated and stored new token.")
+
+    async def _refresh_access_token(self) -> None:
+        logger.info("Access token is about to expire. Refreshing it with the refresh token.")
+        endpoint = api_dict['refresh_token_api']
+        headers = {'Authorization': f'Salter {self.access_token}'}
+        response = await self._send(endpoint['method'], endpoint['api'], endpoint_name='refresh_token_api', json=self._token_manager.refresh_payload(), headers=headers)
+        self._store_token(response, 'refresh_token_api')
+        logger.info("Successfully refreshed access token.")
+
+    def _store_token(self, response: Any, endpoint_name: str) -> None:
+        token_response = self.decode(response)
+        started = time.perf_counter()
+        self._token_manager.update(token_response)
+        if self.metrics is not None:
+            self.metrics.record_token_parse(endpoint_name, time.perf_counter() - started)
+
+    async def _fetch_market_open_id(self) -> int:
+        market_open_id = self._payload_cache.market_open_id
+        if market_open_id is not None:
+            logger.debug(f"Using cached market_open_id: {market_open_id}")
+            return market_open_id
+
+        # No store lock is held across the request: a 401 on it re-authenticates, which takes it.
+        async with self._market_id_lock:
+            market_open_id = self._payload_cache.market_open_id
+            if market_open_id is not None:
+                return market_open_id
+            if self.credential_store is not None:
+                async with self._shared_credentials():
+                    market_open_id = self.credential_store.load_market_open_id(nepse_today())
+                if market_open_id is not None:
+                    logger.debug(f"Using shared market_open_id: {market_open_id}")
+                    self._payload_cache.market_open_id = market_open_id
+                    return market_open_id
+            logger.debug("Fetching market open ID for payload calculation.")
+            try:
+                # Sent directly rather than through the cache and single-flight.
+                response = await self._send_authenticated('GET', api_dict['marketopen_api']['api'], endpoint_name='marketopen_api')
+                market_open_id = self.decode(response)["id"]
+            except (self._httpx.HTTPError, KeyError, ValueError) as e:
+                logger.error(f"Failed to fetch or parse market open ID: {e}", exc_info=True)
+                raise IOError("Could not retrieve the necessary payload ID from NEPSE.") from e
+            self._payload_cache.market_open_id = market_open_id
+            if self.credential_store is not None:
+                async with self._shared_credentials():
+                    self.credential_store.save_market_open_id(nepse_today(), market_open_id)
+            return market_open_id
+
+    async def _get_payload_id(self, which_payload: str) -> int:
+        await self._get_access_token()
+        await self._fetch_market_open_id()
+        return self._payload_cache.payload_id(which_payload, self.token_details)
+
+    async def payload_id(self, which_payload: str) -> int:
+        """Returns the payload id POSTs of `which_payload` send, authenticating and fetching the market-open id if needed."""
+        return await self._get_payload_id(which_payload)
+
+    async def _request(self, method: str, path: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None, bypass_cache: bool = False) -> Any:
+        """Sends a request, serving it from the response cache when its endpoint has a TTL."""
+        endpoint_name = resolve_endpoint_name(method, path, self.endpoints)
+        request_key = ResponseCache.make_key(endpoint_name, method, path, params, payload if payload is not None else which_payload)
+        cache_key = None
+        if self.cache is not None and self.cache.ttl_for(endpoint_name) > 0:
+            cache_key = request_key
+            cached = None if bypass_cache else await self._cache_call(self.cache.get, cache_key)
+            if self.metrics is not None and not bypass_cache:
+                self.metrics.record_cache(endpoint_name, hit=cached is not None)
+            if cached is not None:
+                return self._response_from_cache(method, cached)
+
+        async def send():
+            resp = await self._send_authenticated(method, path, params=params, payload=payload, which_payload=which_payload, endpoint_name=endpoint_name)
+            if cache_key is not None:
+                await self._cache_call(self.cache.set, endpoint_name, cache_key, resp.status_code, resp.content, resp.url, resp.headers)
+            return resp
+
+        if self._single_flight is None:
+            return await send()
+        return await self._single_flight.do(request_key, send)
+
+    async def _cache_call(self, fn: Callable[..., Any], *args: Any) -> Any:
+        # A `DiskCache` may wait up to its busy timeout on another process's write lock.
+        if self.cache.backend.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def _response_from_cache(self, method: str, entry: CachedResponse) -> Any:
+        httpx = self._httpx
+        return httpx.Response(
+            entry.status_code, headers=entry.headers, content=entry.content,
+            request=httpx.Request(method, entry.url),
+        )
+
+    async def _send_authenticated(self, method: str, path: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None, stream: bool = False, endpoint_name: Optional[str] = None) -> Any:
+        """Sends an authenticated request, re-authenticating and retrying once on a 401."""
+        for attempt in range(2):
+            await self._get_access_token()
+            access_token = self.access_token
+            headers = {'Authorization': f'Salter {access_token}'}
+            try:
+                if method == 'POST':
+                    final_payload = payload if payload is not None else {'id': await self._get_payload_id(which_payload=which_payload)}
+                    logger.debug(f"Making POST request to: {path} with payload: {final_payload} and params: {params}")
+                    return await self._send('POST', path, stream=stream, endpoint_name=endpoint_name, json=final_payload, params=params, headers=headers)
+                logger.debug(f"Making GET request to: {path} with params: {params}")
+                return await self._send('GET', path, stream=stream, endpoint_name=endpoint_name, params=params, headers=headers)
+            except self._httpx.HTTPStatusError as e:
+                if e.response.status_code != 401 or attempt == 1:
+                    raise
+                logger.warning(f"Received 401 for {path}. Re-authenticating and retrying once.")
+                await self._invalidate_token(access_token)
+
+    def decode(self, response: Any) -> Any:
+        """Decodes a JSON response body with the configured `json_decoder`."""
+        if self.metrics is None:
+            return self.json_decoder(response.content)
+        started = time.perf_counter()
+        data = self.json_decoder(response.content)
+        elapsed = time.perf_counter() - started
+        request = response.request
+        self.metrics.record_decode(resolve_endpoint_name(request.method, request.url.path, self.endpoints), elapsed)
+        return data
+
+    async def stream_json(self, method: str, path: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None, key: Optional[str] = 'content', chunk_size: int = 64 * 1024) -> AsyncIterator[Any]:
+        """The asyncio counterpart of `NepseAPISession.stream_json`."""
+        endpoint_name = resolve_endpoint_name(method, path, self.endpoints)
+        resp = await self._send_authenticated(method, path, params=params, payload=payload, which_payload=which_payload, stream=True, endpoint_name=endpoint_name)
+        parser = JsonArrayParser(key)
+        try:
+            async for chunk in resp.aiter_bytes(chunk_size):
+                for value in parser.feed(chunk):
+                    yield value
+            for value in parser.close():
+                yield value
+        finally:
+            await resp.aclose()
+
+    def invalidate_cache(self, endpoint_name: Optional[str] = None) -> None:
+        """Drops cached responses for one endpoint name, or for all endpoints."""
+        if self.cache is not None:
+            self.cache.invalidate(endpoint_name)
+
+    async def get(self, path: str, params: Optional[Dict] = None, bypass_cache: bool = False) -> Any:
+        return await self._request('GET', path, params=params, bypass_cache=bypass_cache)
+
+    async def post(self, path: str, payload: Optional[Dict] = None, params: Optional[Dict] = None, which_payload: Optional[str] = None, bypass_cache: bool = False) -> Any:
+        return await self._request('POST', path, params=params, payload=payload, which_payload=which_payload, bypass_cache=bypass_cache)
+
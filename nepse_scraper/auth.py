@@ -1,53 +1,154 @@
 # nepse_scraper/auth.py
 
+import hashlib
 import json
 import logging ## LOGGING: Import the logging module
-from datetime import datetime
-from wasmtime import Store, Module, Instance
+import threading
+from datetime import date, datetime, timedelta, timezone
+from importlib.metadata import PackageNotFoundError, version
 from importlib.resources import files
-from typing import Any, Callable, Dict, List, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+from .utils import atomic_write_bytes, default_cache_dir
+
+if TYPE_CHECKING:
+    from wasmtime import Engine, Module
 
 ## LOGGING: Get a logger specific to this module
 logger = logging.getLogger(__name__)
 
 WASM_FILE = files('nepse_scraper').joinpath('nepse.wasm')
 
+# Nepal Standard Time (UTC+05:45). Nepal observes no daylight saving, so a fixed
+# offset is exact and avoids depending on the host's tz database.
+NEPAL_TZ = timezone(timedelta(hours=5, minutes=45), 'Asia/Kathmandu')
+
+
+def nepse_today() -> date:
+    """Returns the current calendar date in Nepal, which is what NEPSE's payload ids are keyed on."""
+    return datetime.now(NEPAL_TZ).date()
+
+
+## PERF: The wasmtime Engine and compiled Module are shared by every TokenParser
+# in the process, and the compiled module is persisted to disk so later processes
+# can skip compilation. wasmtime itself is only imported on first use.
+_wasm_engine: Optional["Engine"] = None
+_wasm_module: Optional["Module"] = None
+_wasm_module_lock = threading.Lock()
+
+
+def _module_cache_path(wasm_bytes: bytes) -> Any:
+    try:
+        wasmtime_version = version('wasmtime')
+    except PackageNotFoundError:
+        wasmtime_version = 'unknown'
+    # Serialized modules are only valid for the exact wasmtime build that produced them.
+    digest = hashlib.sha256(wasm_bytes + wasmtime_version.encode()).hexdigest()[:16]
+    return default_cache_dir() / f"nepse-{digest}.cwasm"
+
+
+def get_wasm_module() -> Tuple["Engine", "Module"]:
+    """
+    Returns the process-wide wasmtime engine and compiled `nepse.wasm` module.
+
+    The module is loaded from the on-disk cache when a serialization matching
+    both the WASM file's hash and the installed wasmtime version exists;
+    otherwise it is compiled and the serialized result is written back.
+    Cache failures are never fatal.
+    """
+    global _wasm_engine, _wasm_module
+    if _wasm_module is not None:
+        return _wasm_engine, _wasm_module
+
+    with _wasm_module_lock:
+        if _wasm_module is not None:
+            return _wasm_engine, _wasm_module
+
+        from wasmtime import Engine, Module
+
+        engine = Engine()
+        wasm_bytes = WASM_FILE.read_bytes()
+        cache_path = _module_cache_path(wasm_bytes)
+        module: Optional[Module] = None
+
+        if cache_path.exists():
+            try:
+                module = Module.deserialize_file(engine, str(cache_path))
+                logger.debug(f"Loaded compiled WASM module from cache: {cache_path}")
+            except Exception as e:
+                logger.debug(f"Ignoring unusable WASM module cache {cache_path}: {e}")
+
+        if module is None:
+            module = Module(engine, wasm_bytes)
+            logger.debug("Compiled WASM module.")
+            try:
+                atomic_write_bytes(cache_path, module.serialize())
+            except OSError as e:
+                logger.debug(f"Could not write WASM module cache {cache_path}: {e}")
+
+        _wasm_engine, _wasm_module = engine, module
+        return _wasm_engine, _wasm_module
+
 
 class TokenParser:
+    """
+    Decodes NEPSE token responses with the `nepse.wasm` helper functions.
+
+    A wasmtime `Store` must not be used from several threads at once, so each
+    thread that parses a token gets its own `Store` and `Instance` of the
+    shared compiled module. One parser can therefore be shared freely.
+    """
     def __init__(self) -> None:
-        self.store: Store = Store()
-        module: Module = Module.from_file(self.store.engine, WASM_FILE)
-        instance: Instance = Instance(self.store, module, [])
-
-        self.cdx: Callable[..., int] = instance.exports(self.store)["cdx"]
-        self.rdx: Callable[..., int] = instance.exports(self.store)["rdx"]
-        self.bdx: Callable[..., int] = instance.exports(self.store)["bdx"]
-        self.ndx: Callable[..., int] = instance.exports(self.store)["ndx"]
-        self.mdx: Callable[..., int] = instance.exports(self.store)["mdx"]
+        self._local = threading.local()
+        self._instantiate()
         logger.debug("TokenParser initialized with WASM module.") ## LOGGING
 
+    def _instantiate(self) -> threading.local:
+        from wasmtime import Instance, Store
+
+        engine, module = get_wasm_module()
+        local = self._local
+        local.store = Store(engine)
+        instance: Instance = Instance(local.store, module, [])
+        exports = instance.exports(local.store)
+
+        local.cdx = exports["cdx"]
+        local.rdx = exports["rdx"]
+        local.bdx = exports["bdx"]
+        local.ndx = exports["ndx"]
+        local.mdx = exports["mdx"]
+        return local
+
     def parse_token_response(self, token_response: Dict[str, Any]) -> Tuple[str, str]:
         logger.debug("Starting token response parsing.") ## LOGGING
-        n: int = self.cdx(self.store, token_response['salt1'], token_response['salt2'],
-                          token_response['salt3'], token_response['salt4'], token_response['salt5'])
-        l: int = self.rdx(self.store, token_response['salt1'], token_response['salt2'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        o: int = self.bdx(self.store, token_response['salt1'], token_response['salt2'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        p: int = self.ndx(self.store, token_response['salt1'], token_response['salt2'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        q: int = self.mdx(self.store, token_response['salt1'], token_response['salt2'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        i: int = self.cdx(self.store, token_response['salt2'], token_response['salt1'],
-                          token_response['salt3'], token_response['salt5'], token_response['salt4'])
-        r: int = self.rdx(self.store, token_response['salt2'], token_response['salt1'],
-                          token_response['salt3'], token_response['salt4'], token_response['salt5'])
-        s: int = self.bdx(self.store, token_response['salt2'], token_response['salt1'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        t: int = self.ndx(self.store, token_response['salt2'], token_response['salt1'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
-        u: int = self.mdx(self.store, token_response['salt2'], token_response['salt1'],
-                          token_response['salt4'], token_response['salt3'], token_response['salt5'])
+        local = self._local if hasattr(self._local, 'store') else self._instantiate()
+        store = local.store
+        cdx: Callable[..., int] = local.cdx
+        rdx: Callable[..., int] = local.rdx
+        bdx: Callable[..., int] = local.bdx
+        ndx: Callable[..., int] = local.ndx
+        mdx: Callable[..., int] = local.mdx
+
+        n: int = cdx(store, token_response['salt1'], token_response['salt2'],
+                     token_response['salt3'], token_response['salt4'], token_response['salt5'])
+        l: int = rdx(store, token_response['salt1'], token_response['salt2'],
+                     token_response['salt4'], token_response['salt3'], token_response['salt5'])
+        o: int = bdx(store, token_response['salt1'], token_response['salt2'],
+                     token_response['salt4'], token_response['salt3'], token_response['salt5'])
+        p: int = ndx(store, token_response['salt1'], token_response['salt2'],
+                     token_response['salt4'], token_response['salt3'], token_response['salt5'])
+        q: int = mdx(store, token_response['salt1'], token_response['salt2'],
+                     token_response['salt4'], token_response['salt3'], token_response['salt5'])
+        i: int = cdx(store, token_response['salt2'], token_response['salt1'],
+                     token_response['salt3'], token_response['salt5'], token_response['salt4'])
+        r: int = rdx(store, token_response['salt2'], token_response['salt1'],
+                     token_response['salt3'], token_response['salt4'], token_response['salt5'])
+        s: int = bdx(store, token_response['salt2'], token_response['salt1'],
+                     token_response['salt4'], token_response['salt3'], token_response['salt5'])
+        t: int = ndx(store, token_response['salt2'], token_response['salt1'],
+                     token_response['salt4'], token_response['salt3'], token_response['salt5'])
+        u: int = mdx(store, token_response['salt2'], token_response['salt1'],
+                     token_response['salt4'], token_response['salt3'], token_response['salt5'])
 
         access_token: str = token_response['accessToken']
         refresh_token: str = token_response['refreshToken']
@@ -85,9 +186,11 @@ class PayloadParser:
         self,
         given_id: int,
         token_details: Dict[str, Any],
-        which: str
+        which: str,
+        today: Optional[int] = None
     ) -> int:
-        today: int = datetime.now().day
+        if today is None:
+            today = nepse_today().day
         payload_id: int = self.dummyData[given_id] + given_id + 2 * today
         
         logger.debug(f"Initial payload calculation: id={payload_id} from given_id={given_id}, today={today}") ## LOGGING
@@ -107,4 +210,79 @@ class PayloadParser:
         )
         logger.debug(f"Final calculated payload_id: {payload_id} for type='{which}'") ## LOGGING
 
-        return payload_id
\ No newline at end of file
+        return payload_id
+
+
+class PayloadIdCache:
+    """
+    Caches the market-open id and the derived payload ids for one NEPSE business day.
+
+    Everything is keyed on the date in Asia/Kathmandu and dropped automatically
+    once that date rolls over. Computed payload ids are also tied to the salts
+    of the token they were computed with, so a new token recomputes them.
+    All operations are guarded by a lock, so the cache can be shared by threads.
+    """
+    PAYLOAD_TYPES = ('stock-live', 'sector-live')
+
+    def __init__(self, payload_parser: PayloadParser, clock: Callable[[], date] = nepse_today) -> None:
+        self._payload_parser = payload_parser
+        self._clock = clock
+        self._business_date: Optional[date] = None
+        self._market_open_id: Optional[int] = None
+        self._token_key: Optional[Tuple[int, ...]] = None
+        self._payload_ids: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def _roll_over(self) -> date:
+        today = self._clock()
+        if today != self._business_date:
+            if self._business_date is not None:
+                logger.info(f"NEPSE business day rolled over to {today}; dropping cached payload ids.")
+            self._business_date = today
+            self._market_open_id = None
+            self._token_key = None
+            self._payload_ids = {}
+        return today
+
+    @property
+    def market_open_id(self) -> Optional[int]:
+        """The cached market-open id for today, or None if it has not been fetched yet."""
+        with self._lock:
+            self._roll_over()
+            return self._market_open_id
+
+    @market_open_id.setter
+    def market_open_id(self, value: Optional[int]) -> None:
+        with self._lock:
+            self._roll_over()
+            if value != self._market_open_id:
+                self._payload_ids = {}
+            self._market_open_id = value
+
+    def payload_id(self, which: str, token_details: Dict[str, Any]) -> int:
+        """Returns the payload id for `which`, computing today's ids for the current token once."""
+        with self._lock:
+            today = self._roll_over()
+            if self._market_open_id is None:
+                raise ValueError("The market-open id must be set before computing payload ids.")
+
+            token_key = tuple(token_details.get(f"salt{i}", 0) for i in range(1, 6))
+            if token_key != self._token_key:
+                self._token_key = token_key
+                self._payload_ids = {}
+
+            if which not in self._payload_ids:
+                for payload_type in dict.fromkeys(self.PAYLOAD_TYPES + (which,)):
+                    self._payload_ids[payload_type] = self._payload_parser.calculate_payload_id(
+                        given_id=self._market_open_id,
+                        token_details=token_details,
+                        which=payload_type,
+                        today=today.day
+                    )
+            return self._payload_ids[which]
+
+    def clear(self) -> None:
+        """Drops every cached value."""
+        with self._lock:
+            self._business_date = None
+            self._roll_over()
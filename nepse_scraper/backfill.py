@@ -0,0 +1,243 @@
+# nepse_scraper/backfill.py
+import json
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+from .auth import nepse_today
+from .batch import DEFAULT_MAX_WORKERS
+from .history import DateLike, to_date
+from .pagination import iter_rows
+from .utils import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_DAYS = 365
+DEFAULT_PROGRESS_INTERVAL = 10.0
+
+# A unit of work: one symbol over one date chunk.
+Unit = Tuple[str, str, str]
+
+
+@dataclass
+class BackfillProgress:
+    """
+    A snapshot of a backfill's progress.
+
+    Attributes:
+        total_units: The number of (symbol, date range) units in the job.
+        completed_units: Units finished, including those skipped from the checkpoint.
+        skipped_units: Units already done before this run started.
+        failed_units: Units that raised; they are retried on the next run.
+        rows: Rows written during this run.
+        elapsed: Seconds since this run started.
+        errors: The exception raised for each failed unit.
+    """
+    total_units: int = 0
+    completed_units: int = 0
+    skipped_units: int = 0
+    failed_units: int = 0
+    rows: int = 0
+    elapsed: float = 0.0
+    errors: Dict[Unit, Exception] = field(default_factory=dict)
+
+    @property
+    def units_per_second(self) -> float:
+        done = self.completed_units - self.skipped_units + self.failed_units
+        return done / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Estimated seconds until every unit has been attempted, or None before the first unit finishes."""
+        rate = self.units_per_second
+        if rate <= 0:
+            return None
+        return (self.total_units - self.completed_units - self.failed_units) / rate
+
+
+class BackfillJob:
+    """
+    Backfills daily price history for every listed security into a `HistoryStore`, resumably.
+
+    The date range is split into chunks of `chunk_days`, and each (symbol,
+    chunk) unit is fetched, with all its pages, on a bounded thread pool.
+    Results are written to the scraper's `history_store` from the calling
+    thread as units complete, and each finished unit is then appended to a
+    JSON-lines checkpoint file. A restarted job skips every unit listed in the
+    checkpoint, and also any unit the store already covers.
+
+    Args:
+        scraper: The `NepseScraper` used for requests and whose `history_store` receives the rows.
+        start_date: The first date to backfill, "YYYY-MM-DD".
+        end_date: The last date to backfill, "YYYY-MM-DD". Defaults to today in Nepal.
+        tickers: The symbols to backfill. Defaults to every listed security.
+        checkpoint_path: The checkpoint file. Defaults to `backfill-<start>-<end>.jsonl` in the package cache directory.
+        chunk_days: The number of days covered by one unit.
+        max_workers: The maximum number of units fetched concurrently.
+        page_size: The number of records requested per page.
+        progress_interval: Seconds between progress reports.
+        on_progress: Called with a `BackfillProgress` at every report. Reports are also logged.
+    """
+    def __init__(
+        self,
+        scraper: Any,
+        start_date: DateLike,
+        end_date: Optional[DateLike] = None,
+        tickers: Optional[List[str]] = None,
+        checkpoint_path: Optional[Union[str, Path]] = None,
+        chunk_days: int = DEFAULT_CHUNK_DAYS,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        page_size: int = 500,
+        progress_interval: float = DEFAULT_PROGRESS_INTERVAL,
+        on_progress: Optional[Callable[[BackfillProgress], None]] = None,
+    ) -> None:
+        if chunk_days < 1:
+            raise ValueError("chunk_days must be at least 1.")
+        self.scraper = scraper
+        self.start_date = to_date(start_date)
+        self.end_date = to_date(end_date) if end_date is not None else nepse_today()
+        self.tickers = [t.upper() for t in tickers] if tickers else None
+        self.checkpoint_path = Path(checkpoint_path) if checkpoint_path else (
+            default_cache_dir() / f"backfill-{self.start_date}-{self.end_date}.jsonl"
+        )
+        self.chunk_days = chunk_days
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.progress_interval = progress_interval
+        self.on_progress = on_progress
+
+    def chunks(self) -> List[Tuple[date, date]]:
+        """Splits the job's date range into consecutive chunks of `chunk_days`."""
+        chunks = []
+        cursor = self.start_date
+        while cursor <= self.end_date:
+            chunk_end = min(cursor + timedelta(days=self.chunk_days - 1), self.end_date)
+            chunks.append((cursor, chunk_end))
+            cursor = chunk_end + timedelta(days=1)
+        return chunks
+
+    def load_checkpoint(self) -> Set[Unit]:
+        """Reads the units recorded as done; a line cut short by a crash is ignored."""
+        done: Set[Unit] = set()
+        if not self.checkpoint_path.exists():
+            return done
+        with open(self.checkpoint_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    done.add((record['symbol'], record['start'], record['end']))
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"Ignoring unreadable checkpoint line in {self.checkpoint_path}: {line!r}")
+        return done
+
+    def run(self) -> BackfillProgress:
+        """
+        Runs (or resumes) the backfill until every unit has been attempted.
+
+        Returns:
+            BackfillProgress: The final progress, with the error of every failed unit in `errors`.
+        """
+        security_ids = self._security_ids()
+        store = self.scraper.history_store
+        done = self.load_checkpoint()
+        units = [(symbol, start.isoformat(), end.isoformat()) for symbol in security_ids for start, end in self.chunks()]
+
+        progress = BackfillProgress(total_units=len(units))
+        pending: List[Unit] = []
+        for unit in units:
+            symbol, start, end = unit
+            if unit in done or not store.missing_ranges(security_ids[symbol], start, end):
+                progress.skipped_units += 1
+            else:
+                pending.append(unit)
+        progress.completed_units = progress.skipped_units
+        logger.info(f"Backfill of {len(security_ids)} securities: {len(pending)} of {len(units)} units to fetch.")
+
+        self._prepare_checkpoint()
+        started = time.monotonic()
+        last_report = started
+        # Units ending today or later may still change, so they are never checkpointed.
+        today = nepse_today().isoformat()
+        with open(self.checkpoint_path, 'a', encoding='utf-8') as checkpoint, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            queue = iter(pending)
+            in_flight = {}
+            # Keep a bounded number of units submitted so memory does not grow with the market size.
+            for unit in queue:
+                in_flight[executor.submit(self._fetch_unit, security_ids[unit[0]], unit)] = unit
+                if len(in_flight) >= self.max_workers * 2:
+                    break
+            while in_flight:
+                finished, _ = wait(in_flight, timeout=self.progress_interval, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    unit = in_flight.pop(future)
+                    symbol, start, end = unit
+                    try:
+                        rows = future.result()
+                        progress.rows += store.store_range(security_ids[symbol], start, end, rows)
+                    except Exception as e:
+                        logger.warning(f"Backfill unit {unit} failed: {e}")
+                        progress.failed_units += 1
+                        progress.errors[unit] = e
+                    else:
+                        progress.completed_units += 1
+                        if end < today:
+                            checkpoint.write(json.dumps({'symbol': symbol, 'start': start, 'end': end, 'rows': len(rows)}) + '\n')
+                            checkpoint.flush()
+                    next_unit = next(queue, None)
+                    if next_unit is not None:
+                        in_flight[executor.submit(self._fetch_unit, security_ids[next_unit[0]], next_unit)] = next_unit
+
+                now = time.monotonic()
+                progress.elapsed = now - started
+                if now - last_report >= self.progress_interval:
+                    last_report = now
+                    self._report(progress)
+
+        progress.elapsed = time.monotonic() - started
+        self._report(progress)
+        return progress
+
+    def _prepare_checkpoint(self) -> None:
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        if not self.checkpoint_path.exists():
+            return
+        # Terminate a line cut short by a crash so the next record starts on its own line.
+        with open(self.checkpoint_path, 'rb+') as f:
+            if f.seek(0, 2) == 0:
+                return
+            f.seek(-1, 2)
+            if f.read(1) != b'\n':
+                f.write(b'\n')
+
+    def _security_ids(self) -> Dict[str, int]:
+        if self.tickers is None:
+            return dict(self.scraper._get_security_map())
+        resolved, missing = self.scraper._partition_ticker_ids(self.tickers)
+        if missing:
+            logger.warning(f"Skipping unknown tickers in backfill: {missing}")
+        return resolved
+
+    def _fetch_unit(self, security_id: int, unit: Unit) -> List[Dict[str, Any]]:
+        _, start, end = unit
+        fetch_page = self.scraper._price_history_page_fetcher(security_id, start, end, self.page_size)
+        return list(iter_rows(fetch_page))
+
+    def _report(self, progress: BackfillProgress) -> None:
+        eta = progress.eta
+        logger.info(
+            f"Backfill: {progress.completed_units}/{progress.total_units} units "
+            f"({progress.failed_units} failed), {progress.rows} rows, "
+            f"{progress.units_per_second:.2f} units/s, {progress.rows_per_second:.0f} rows/s, "
+            f"ETA {'unknown' if eta is None else f'{eta:.0f}s'}"
+        )
+        if self.on_progress is not None:
+            self.on_progress(progress)
@@ -0,0 +1,89 @@
+# nepse_scraper/batch.py
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+DEFAULT_MAX_WORKERS = 8
+
+
+@dataclass
+class BatchResult:
+    """
+    The outcome of a concurrent multi-item fetch.
+
+    Attributes:
+        results: Successful responses keyed by item (usually the ticker symbol).
+        errors: The exception raised for each item that failed.
+    """
+    results: Dict[Any, Any] = field(default_factory=dict)
+    errors: Dict[Any, Exception] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """True if every item was fetched successfully."""
+        return not self.errors
+
+    def raise_for_errors(self) -> None:
+        """Re-raises the first recorded error, if any."""
+        if self.errors:
+            key, error = next(iter(self.errors.items()))
+            logger.error(f"Batch fetch failed for {len(self.errors)} item(s), first: {key!r}")
+            raise error
+
+
+def run_batch(fetch: Callable[[V], Any], items: Dict[K, V], max_workers: Optional[int] = None) -> BatchResult:
+    """
+    Calls `fetch(value)` for every entry of `items` on a bounded thread pool.
+
+    Failures are captured per key instead of aborting the whole batch. The
+    order of `results` and `errors` follows the order of `items`.
+    """
+    max_workers = max_workers or DEFAULT_MAX_WORKERS
+    batch = BatchResult()
+    if not items:
+        return batch
+
+    completed: Dict[K, Any] = {}
+    failed: Dict[K, Exception] = {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        futures = {executor.submit(fetch, value): key for key, value in items.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                completed[key] = future.result()
+            except Exception as e:
+                logger.warning(f"Batch item {key!r} failed: {e}")
+                failed[key] = e
+
+    # Built in input order, so the error `raise_for_errors` re-raises does not depend on timing.
+    batch.results = {key: completed[key] for key in items if key in completed}
+    batch.errors = {key: failed[key] for key in items if key in failed}
+    return batch
+
+
+async def run_batch_async(fetch: Callable[[V], Awaitable[Any]], items: Dict[K, V], max_workers: Optional[int] = None) -> BatchResult:
+    """The asyncio counterpart of `run_batch`, bounded by a semaphore."""
+    semaphore = asyncio.Semaphore(max_workers or DEFAULT_MAX_WORKERS)
+
+    async def bounded(value: V) -> Any:
+        async with semaphore:
+            return await fetch(value)
+
+    outcomes = await asyncio.gather(*(bounded(value) for value in items.values()), return_exceptions=True)
+    batch = BatchResult()
+    for key, outcome in zip(items.keys(), outcomes):
+        if isinstance(outcome, Exception):
+            logger.warning(f"Batch item {key!r} failed: {outcome}")
+            batch.errors[key] = outcome
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            batch.results[key] = outcome
+    return batch
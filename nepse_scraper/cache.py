@@ -0,0 +1,201 @@
+# nepse_scraper/cache.py
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .utils import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# How long a `DiskCache` write waits for another process's write to finish.
+DISK_CACHE_BUSY_TIMEOUT_MS = 10_000
+
+# Seconds a response may be served from the cache, per endpoint name in `api_dict`.
+# Only endpoints whose data barely changes during a trading day are cached by default.
+DEFAULT_CACHE_TTLS: Dict[str, float] = {
+    'sector_api': 6 * 60 * 60,
+    'security_api': 60 * 60,
+    'securities_list_api': 60 * 60,
+    'info_officer_api': 24 * 60 * 60,
+    'market_summary_history_api': 60 * 60,
+}
+
+
+@dataclass
+class CachedResponse:
+    """A transport-independent snapshot of an HTTP response."""
+    status_code: int
+    content: bytes
+    url: str
+    headers: Dict[str, str] = field(default_factory=dict)
+    expires_at: float = 0.0
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+
+class CacheBackend:
+    """
+    Storage interface for cached responses.
+
+    Keys are strings starting with the endpoint name followed by `|`, which
+    lets `delete_prefix` drop every entry of one endpoint. Backends whose
+    calls may block on I/O set `blocking`, and the async session runs them in
+    a worker thread instead of on the event loop.
+    """
+    blocking = False
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(CacheBackend):
+    """A bounded, thread-safe in-memory LRU cache."""
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expired:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DiskCache(CacheBackend):
+    """
+    A persistent cache stored in a SQLite database, shared by every process using the same file.
+
+    Args:
+        path: The database file. Defaults to `responses.sqlite3` in the package cache directory.
+    """
+    blocking = True
+
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        self.path = Path(path) if path else default_cache_dir() / 'responses.sqlite3'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        # WAL lets readers in other processes run alongside a writer; writers wait for each other
+        # for up to the busy timeout instead of failing with "database is locked".
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA busy_timeout={DISK_CACHE_BUSY_TIMEOUT_MS}")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, status_code INTEGER, url TEXT, headers TEXT, content BLOB, expires_at REAL)"
+        )
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, content, url, headers, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            entry = CachedResponse(row[0], row[1], row[2], json.loads(row[3]), row[4])
+            if entry.expired:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            return entry
+
+    def set(self, key: str, value: CachedResponse) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                (key, value.status_code, value.url, json.dumps(value.headers), value.content, value.expires_at)
+            )
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class ResponseCache:
+    """
+    Applies per-endpoint TTL policies on top of a `CacheBackend`.
+
+    Endpoints without a TTL (or with a TTL of 0) are never cached.
+    """
+    def __init__(self, backend: CacheBackend, ttls: Optional[Dict[str, float]] = None) -> None:
+        self.backend = backend
+        self.ttls = dict(DEFAULT_CACHE_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+
+    def ttl_for(self, endpoint_name: Optional[str]) -> float:
+        return self.ttls.get(endpoint_name, 0) if endpoint_name else 0
+
+    @staticmethod
+    def make_key(endpoint_name: Optional[str], method: str, path: str, params: Optional[Dict] = None, payload: Any = None) -> str:
+        params = {k: v for k, v in (params or {}).items() if v is not None}
+        return '|'.join((
+            endpoint_name or '', method, path,
+            json.dumps(params, sort_keys=True, default=str),
+            json.dumps(payload, sort_keys=True, default=str),
+        ))
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.backend.get(key)
+        if entry is not None:
+            logger.debug(f"Cache hit for {key}")
+        return entry
+
+    def set(self, endpoint_name: str, key: str, status_code: int, content: bytes, url: str, headers: Dict[str, str]) -> None:
+        ttl = self.ttl_for(endpoint_name)
+        if ttl <= 0:
+            return
+        # The stored body is already decoded, so transfer-level headers no longer apply.
+        headers = {k: v for k, v in headers.items() if k.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')}
+        self.backend.set(key, CachedResponse(status_code, content, str(url), headers, time.time() + ttl))
+
+    def invalidate(self, endpoint_name: Optional[str] = None) -> None:
+        """Drops the cached responses of one endpoint, or of every endpoint."""
+        if endpoint_name is None:
+            self.backend.clear()
+        else:
+            self.backend.delete_prefix(f"{endpoint_name}|")
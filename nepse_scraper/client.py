@@ -1,10 +1,25 @@
 # nepse_scraper/client.py
 
 import logging
-from typing import Any, Dict, List, Optional, Union
-
-from .core import NepseAPISession
-from .endpoints import api_dict
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .analytics import MarketMetrics, SectorMap, market_metrics
+from .batch import DEFAULT_MAX_WORKERS, BatchResult, run_batch
+from .cache import CacheBackend
+from .columnar import format_rows, validate_format
+from .core import DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, ROOT_URL, NepseAPISession
+from .credentials import CredentialStore
+from .decoding import JsonDecoder
+from .endpoints import LIVE_INDEX_IDS, api_dict
+from .history import HistoryStore
+from .metrics import MetricsRegistry
+from .models import LiveTrade, SectorIndex, TickerInfo, TodayPrice
+from .pagination import collect_pages, iter_rows, page_rows, page_workers
+from .ratelimit import AdaptiveConcurrency, RateLimiter
+from .replay import PathLike, Recorder, Replayer
+from .security_index import SecurityIndex
+from .token_manager import DEFAULT_TOKEN_TTL
 
 logger = logging.getLogger(__name__)
 
@@ -12,46 +27,173 @@ logger = logging.getLogger(__name__)
 class NepseScraper:
     """
     The main client for interacting with the Nepal Stock Exchange (NEPSE) API.
+
+    A client is thread-safe: one instance can be shared by every worker of a
+    `ThreadPoolExecutor`. Authentication, the market-open id and the security
+    map are each fetched once, however many threads need them concurrently.
     """
-    def __init__(self, verify_ssl: bool = True) -> None:
-        """Initializes the client and the underlying API session."""
-        self.session = NepseAPISession(verify_ssl=verify_ssl)
-        self._security_map: Optional[Dict[str, int]] = None
-        self._sector_map: Optional[Dict[str, int]] = None
+    def __init__(
+        self,
+        verify_ssl: bool = True,
+        token_ttl: float = DEFAULT_TOKEN_TTL,
+        cache: Union[bool, CacheBackend, None] = None,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        security_index: Optional[SecurityIndex] = None,
+        json_decoder: Union[str, JsonDecoder, None] = None,
+        history_store: Optional[HistoryStore] = None,
+        rate_limit: Union[float, RateLimiter, None] = None,
+        endpoint_rate_limits: Optional[Dict[str, float]] = None,
+        adaptive_concurrency: Union[bool, AdaptiveConcurrency, None] = None,
+        coalesce_requests: bool = True,
+        metrics: Union[bool, MetricsRegistry, None] = None,
+        base_url: str = ROOT_URL,
+        record: Union[PathLike, Recorder, None] = None,
+        replay: Union[PathLike, Replayer, None] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        compression: bool = True,
+        credential_store: Union[bool, CredentialStore, None] = None,
+    ) -> None:
+        """
+        Initializes the client and the underlying API session.
 
+        Args:
+            verify_ssl (bool): Whether to verify the server's SSL certificate. Defaults to True.
+            token_ttl (float): Seconds after which an access token is considered expired. It is
+                               refreshed shortly before that. Defaults to 45.
+            cache (Union[bool, CacheBackend], optional): Enables response caching for slow-changing
+                               endpoints. Pass True for an in-memory LRU cache, or a `MemoryCache`/`DiskCache`.
+            cache_ttls (Dict[str, float], optional): Per-endpoint TTLs in seconds, keyed by endpoint name,
+                               overriding `DEFAULT_CACHE_TTLS`. A TTL of 0 disables caching for that endpoint.
+            security_index (SecurityIndex, optional): The symbol-to-id index used to resolve tickers.
+                               Defaults to a `SecurityIndex` persisted in the package cache directory.
+            json_decoder (Union[str, Callable], optional): 'orjson', 'ujson', 'json' or a callable used to
+                               decode responses. Defaults to the fastest installed library.
+            history_store (HistoryStore, optional): The local store used by `sync_history`. Defaults to
+                               `history.sqlite3` in the package cache directory, opened on first use.
+            rate_limit (Union[float, RateLimiter], optional): Maximum requests per second across all endpoints.
+            endpoint_rate_limits (Dict[str, float], optional): Maximum requests per second for individual
+                               endpoints, keyed by endpoint name (e.g. {'stock_live_api': 1}).
+            adaptive_concurrency (Union[bool, AdaptiveConcurrency], optional): Caps in-flight requests with an
+                               AIMD controller that backs off when NEPSE answers 429/5xx or slows down.
+            coalesce_requests (bool): Whether identical requests made concurrently (e.g. by several threads
+                               checking `is_market_open`) share a single network call. Defaults to True.
+            metrics (Union[bool, MetricsRegistry], optional): Records per-endpoint request metrics, available
+                               from `scraper.metrics` as a snapshot or in Prometheus text format.
+            base_url (str): The server the client talks to. Defaults to https://www.nepalstock.com; point it
+                               at a local stand-in such as `benchmarks.fake_server` to run without network.
+            record (Union[str, Path, Recorder], optional): Writes every request and response to this archive
+                               (gzip-compressed if the path ends in .gz) for later replay.
+            replay (Union[str, Path, Replayer], optional): Serves every response from a recorded archive instead
+                               of the network. Cannot be combined with `record`.
+            pool_connections (int): The number of per-host connection pools to keep. Defaults to 10.
+            pool_maxsize (int): The maximum number of connections kept alive to NEPSE. Size it to the number
+                               of threads sharing the client. Defaults to 32.
+            pool_block (bool): Whether threads wait for a free pooled connection rather than opening extra,
+                               short-lived ones. Defaults to False.
+            compression (bool): Whether to request gzip/deflate (and brotli, when installed) compressed
+                               responses. Defaults to True.
+            credential_store (Union[bool, CredentialStore], optional): Shares the access token and market-open
+                               id with other processes. Pass True (or a `FileCredentialStore(path)`) in every
+                               worker of a process pool so only one of them authenticates.
+        """
         # for registring option
         self.endpoints = api_dict.copy() 
+        self.session = NepseAPISession(
+            verify_ssl=verify_ssl, token_ttl=token_ttl, endpoints=self.endpoints, cache=cache, cache_ttls=cache_ttls, json_decoder=json_decoder,
+            rate_limit=rate_limit, endpoint_rate_limits=endpoint_rate_limits, adaptive_concurrency=adaptive_concurrency,
+            coalesce_requests=coalesce_requests, metrics=metrics, base_url=base_url,
+            record=record, replay=replay, pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+            pool_block=pool_block, compression=compression, credential_store=credential_store,
+        )
+        self._security_index = security_index if security_index is not None else SecurityIndex()
+        self._sector_map: Optional[SectorMap] = None
+        self._sector_map_lock = threading.Lock()
+        self._history_store = history_store
+        self._history_store_lock = threading.Lock()
         logger.info("NepseScraper client initialized.")
 
+    @property
+    def metrics(self) -> Optional[MetricsRegistry]:
+        """The session's request metrics, or None unless the client was created with `metrics=True`."""
+        return self.session.metrics
+
     # =========================================================================
     # Private Helper Methods
     # =========================================================================
 
     def _get_security_map(self) -> Dict[str, int]:
-        """Internal helper to fetch all securities and return a symbol-to-id map."""
-        if self._security_map is not None:
-            logger.debug("Using cached security map.")
-            return self._security_map
-
-        logger.info("Fetching all security listings to build symbol-to-id map.")
-        ## MODIFIED: Use self.endpoints to respect user customizations.
-        endpoint = self.endpoints['security_api']
-        response = self.session.get(endpoint['api'])
-        securities = response.json()
-        self._security_map = {item.get('symbol'): item.get('id') for item in securities}
-        return self._security_map
+        """Internal helper returning the symbol-to-id map, downloading it only if the saved index is stale."""
+        self._refresh_security_index()
+        return self._security_index.symbols
 
+    def _refresh_security_index(self, missing: Optional[List[str]] = None) -> None:
+        """
+        Downloads the security listing into the index if it is stale or, when
+        `missing` is given, if those unknown symbols justify a (rate-limited) refresh.
+        """
+        index = self._security_index
+        with index.lock:
+            # Re-checked under the lock so concurrent callers trigger a single download.
+            needed = index.should_refresh(missing) if missing else index.is_stale()
+            if not needed:
+                return
+            logger.info("Fetching all security listings to build symbol-to-id map.")
+            ## MODIFIED: Use self.endpoints to respect user customizations.
+            endpoint = self.endpoints['security_api']
+            response = self.session.get(endpoint['api'], bypass_cache=True)
+            index.update(self.session.decode(response))
 
     def _resolve_ticker_ids(self, tickers: List[str]) -> Dict[str, int]:
         """Resolves a list of ticker symbols to their security IDs."""
-        security_map = self._get_security_map()
-        resolved_tickers = {s: security_map.get(s) for s in tickers if security_map.get(s)}
-        if len(resolved_tickers) != len(tickers):
-            missing = sorted(list(set(tickers).difference(resolved_tickers.keys())))
+        resolved_tickers, missing = self._partition_ticker_ids(tickers)
+        if missing:
             logger.error(f"Could not find security IDs for the following tickers: {missing}")
             raise ValueError(f"Ticker(s) not found: {missing}")
         return resolved_tickers
 
+    def _partition_ticker_ids(self, tickers: List[str]) -> Tuple[Dict[str, int], List[str]]:
+        """
+        Splits tickers into a symbol-to-id map of known symbols and a sorted list of unknown ones.
+
+        Unknown symbols trigger one rate-limited refresh of the index, so newly
+        listed securities resolve without a restart.
+        """
+        self._refresh_security_index()
+        index = self._security_index
+        resolved_tickers, missing = index.resolve(tickers)
+        if missing and index.should_refresh(missing):
+            self._refresh_security_index(missing)
+            resolved_tickers, missing = index.resolve(tickers)
+            index.mark_missing(missing)
+        return resolved_tickers, missing
+
+    @staticmethod
+    def _normalize_tickers(ticker: Union[str, List[str]]) -> List[str]:
+        """Upper-cases a single ticker or a list of tickers into a list."""
+        if not ticker:
+            raise ValueError('Ticker is required.')
+        return [ticker.upper()] if isinstance(ticker, str) else [t.upper() for t in ticker]
+
+    def _fetch_batch(self, tickers: List[str], fetch: Callable[[int], Any], max_workers: Optional[int]) -> BatchResult:
+        """Runs `fetch(security_id)` concurrently for every ticker, recording unknown tickers as errors."""
+        ticker_ids, missing = self._partition_ticker_ids(tickers)
+        batch = run_batch(fetch, ticker_ids, max_workers=max_workers)
+        for symbol in missing:
+            batch.errors[symbol] = ValueError(f"Ticker(s) not found: {[symbol]}")
+        return batch
+
+    def _fetch_tickers(self, ticker: Union[str, List[str]], fetch: Callable[[int], Any], max_workers: Optional[int]) -> Union[Any, Dict[str, Any]]:
+        """Fetches one or more tickers, returning a single result or a dict keyed by symbol; raises on any failure."""
+        ticker_list = self._normalize_tickers(ticker)
+        ticker_ids = self._resolve_ticker_ids(ticker_list)
+        if len(ticker_list) == 1:
+            return fetch(ticker_ids[ticker_list[0]])
+        batch = run_batch(fetch, ticker_ids, max_workers=max_workers)
+        batch.raise_for_errors()
+        return batch.results
+
     # =========================================================================
     # Extensibility Methods
     # =========================================================================
@@ -74,7 +216,7 @@ class NepseScraper:
         self.endpoints[name] = {"api": path, "method": method.upper()}
         logger.info(f"Successfully registered new endpoint: '{name}'")
 
-    def call_endpoint(self, name: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None) -> Any:
+    def call_endpoint(self, name: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None, bypass_cache: bool = False) -> Any:
         """
         Calls a registered endpoint by its name.
 
@@ -86,6 +228,7 @@ class NepseScraper:
             params: A dictionary of query string parameters for the request.
             payload: A dictionary for the JSON request body.
             which_payload (str, optional): The type of dynamic payload to generate ('stock-live' or 'sector-live').
+            bypass_cache (bool): If True, skips the response cache and refreshes it with the live response.
 
         Returns:
             The JSON response from the API.
@@ -102,13 +245,50 @@ class NepseScraper:
         path = endpoint_info['api']
 
         if method == 'GET':
-            response = self.session.get(path, params=params)
+            response = self.session.get(path, params=params, bypass_cache=bypass_cache)
         elif method == 'POST':
-            response = self.session.post(path, params=params, payload=payload, which_payload=which_payload)
+            response = self.session.post(path, params=params, payload=payload, which_payload=which_payload, bypass_cache=bypass_cache)
         else:
             raise ValueError(f"Unsupported HTTP method '{method}' for endpoint '{name}'.")
             
-        return response.json()
+        return self.session.decode(response)
+
+    def stream_endpoint(self, name: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None, key: Optional[str] = 'content') -> Iterator[Any]:
+        """
+        Calls a registered endpoint and yields the rows of its JSON array response as they download.
+
+        Rows are decoded one by one while the body is still arriving, instead of
+        after the whole response has been buffered. The response cache is bypassed.
+
+        Args:
+            name: The name of the endpoint to call.
+            params: A dictionary of query string parameters for the request.
+            payload: A dictionary for the JSON request body.
+            which_payload (str, optional): The type of dynamic payload to generate ('stock-live' or 'sector-live').
+            key (str, optional): The field holding the rows when the response is an object. Defaults to
+                                 'content', the rows of a paged response. Ignored for list responses.
+
+        Yields:
+            Each element of the response array.
+
+        Raises:
+            ValueError: If the endpoint name is not found or the response has no array to stream.
+        """
+        logger.info(f"Streaming generic endpoint: '{name}'")
+        if name not in self.endpoints:
+            raise ValueError(f"Endpoint '{name}' not found. Please register it first using the register_endpoint method.")
+        endpoint_info = self.endpoints[name]
+        return self.session.stream_json(endpoint_info['method'], endpoint_info['api'], params=params, payload=payload, which_payload=which_payload, key=key)
+
+    def invalidate_cache(self, name: Optional[str] = None) -> None:
+        """
+        Drops cached responses so the next call goes to the network.
+
+        Args:
+            name (str, optional): The endpoint name (e.g. 'sector_api'). Defaults to None, which clears every endpoint.
+        """
+        logger.info(f"Invalidating response cache for: {name or 'all endpoints'}")
+        self.session.invalidate_cache(name)
 
     # =========================================================================
     # Public API Methods
@@ -124,26 +304,59 @@ class NepseScraper:
         logger.info("Checking market status.")
         endpoint = self.endpoints['marketopen_api'] # Use self.endpoints
         response = self.session.get(endpoint['api'])
-        return response.json().get('isOpen', 'CLOSE') == 'OPEN'
+        return self.session.decode(response).get('isOpen', 'CLOSE') == 'OPEN'
 
-    def get_today_price(self, business_date: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_today_price(self, business_date: Optional[str] = None, page_size: int = 500, max_workers: int = DEFAULT_MAX_WORKERS, as_format: Optional[str] = None) -> Any:
         """
         Get today's trading data from the Nepal Stock Exchange (NEPSE).
 
+        Every page is fetched: the first response tells how many pages there
+        are, and the remaining ones are requested concurrently.
+
         Args:
             business_date (str, optional): The date for which trading data should be retrieved in "YYYY-MM-DD" format. 
                                            Defaults to None, which retrieves data for the latest trading day.
+            page_size (int): The number of records requested per page. Defaults to 500.
+            max_workers (int): The maximum number of pages fetched concurrently. Defaults to 8.
+            as_format (str, optional): 'numpy' or 'arrow' to return typed columns, or 'records' for a list of
+                                       `TodayPrice` records (see `nepse_scraper.models`), instead of a list
+                                       of dictionaries. Defaults to None.
 
         Returns:
             List[Dict[str, Any]]: A list of dictionaries, each representing a security's price data for the day.
+            Returns a dict of NumPy columns, a `pyarrow.Table` or records when `as_format` is given.
         """
+        validate_format(as_format, TodayPrice)
         logger.info(f"Fetching today's price for date: {business_date or 'latest'}")
+        fetch_page = self._today_price_page_fetcher(business_date, page_size)
+        return format_rows(collect_pages(fetch_page, max_workers).get('content', []), as_format, TodayPrice)
+
+    def iter_today_price(self, business_date: Optional[str] = None, page_size: int = 500, prefetch: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Streams today's trading data row by row, holding one page in memory at a time.
+
+        Args:
+            business_date (str, optional): The date in "YYYY-MM-DD" format. Defaults to the latest trading day.
+            page_size (int): The number of records requested per page. Defaults to 500.
+            prefetch (int): The number of following pages requested in the background. Defaults to 0.
+
+        Yields:
+            Dict[str, Any]: A security's price data for the day.
+        """
+        logger.info(f"Streaming today's price for date: {business_date or 'latest'}")
+        return iter_rows(self._today_price_page_fetcher(business_date, page_size), prefetch=prefetch)
+
+    def _today_price_page_fetcher(self, business_date: Optional[str], page_size: int) -> Callable[[int], Any]:
         endpoint = self.endpoints['today_price_api']
-        params = {"page": "0", "size": "500", "businessDate": business_date}
-        response = self.session.post(endpoint['api'], params=params)
-        return response.json().get('content', [])
 
-    def get_top_stocks(self, category: str, show_all: bool = False) -> List[Dict[str, Any]]:
+        def fetch_page(page: int) -> Any:
+            params = {"page": str(page), "size": str(page_size), "businessDate": business_date}
+            response = self.session.post(endpoint['api'], params=params)
+            return self.session.decode(response)
+
+        return fetch_page
+
+    def get_top_stocks(self, category: str, show_all: bool = False, as_format: Optional[str] = None) -> Any:
         """
         Fetches top stocks based on a category (e.g., gainers, losers, turnover).
 
@@ -151,9 +364,12 @@ class NepseScraper:
             category (str): The category of top stocks to fetch. Valid options are:
                             'top_gainer', 'top_loser', 'top_turnover', 'top_trade', 'top_transaction'.
             show_all (bool): If True, fetches all stocks in the category, not just the top ten. Defaults to False.
+            as_format (str, optional): 'numpy' or 'arrow' to return typed columns instead of a list of
+                                       dictionaries (see `nepse_scraper.columnar`). Defaults to None.
 
         Returns:
             List[Dict[str, Any]]: A list of dictionaries representing the top stocks.
+            Returns a dict of NumPy columns or a `pyarrow.Table` when `as_format` is given.
 
         Raises:
             ValueError: If an invalid category is provided.
@@ -162,18 +378,22 @@ class NepseScraper:
         valid_categories = ('top_gainer', 'top_loser', 'top_turnover', 'top_trade', 'top_transaction')
         if category not in valid_categories:
             raise ValueError(f"Invalid category: {category}. Must be one of {valid_categories}")
-        
+        validate_format(as_format)
+
         endpoint = self.endpoints[category]
         params = {'all': str(show_all).lower()}
         response = self.session.get(endpoint['api'], params=params)
-        return response.json()
+        return format_rows(self.session.decode(response), as_format)
 
-    def get_ticker_info(self, ticker: Union[str, List[str]]) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    def get_ticker_info(self, ticker: Union[str, List[str]], max_workers: int = DEFAULT_MAX_WORKERS, as_format: Optional[str] = None) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
         """
         Retrieve all the information for one or more tickers from Nepse.
 
         Args:
             ticker (Union[str, List[str]]): A single ticker symbol as a string or a list of ticker symbols.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
+            as_format (str, optional): 'records' to return `TickerInfo` records (see `nepse_scraper.models`)
+                                       instead of dictionaries. Defaults to None.
 
         Returns:
             Union[Dict[str, Any], Dict[str, Dict[str, Any]]]: 
@@ -183,39 +403,61 @@ class NepseScraper:
         Raises:
             ValueError: If the provided ticker is not found in NEPSE or if no ticker is provided.
         """
-        if not ticker:
-            raise ValueError('Ticker is required.')
-            
-        ticker_list = [ticker.upper()] if isinstance(ticker, str) else [t.upper() for t in ticker]
-        logger.info(f"Fetching ticker info for: {ticker_list}")
-        
-        ticker_ids = self._resolve_ticker_ids(ticker_list)
-        endpoint_info = self.endpoints['ticker_info_api']
-        base_path = endpoint_info['api']
-        results = {}
-
-        for symbol, security_id in ticker_ids.items():
-            path = f"{base_path}/{security_id}"
-            response = self.session.post(path, which_payload='stock-live')
-            results[symbol] = response.json()
-            
-        return results[ticker_list[0]] if len(ticker_list) == 1 else results
+        if as_format not in (None, 'records'):
+            raise ValueError(f"Invalid as_format: {as_format}. Must be 'records' or None")
+        logger.info(f"Fetching ticker info for: {ticker}")
+        fetch = self._fetch_ticker_info
+        if as_format == 'records':
+            # Converted per ticker, so the single-ticker result is unwrapped the same way as without a format.
+            fetch = lambda security_id: TickerInfo.from_dict(self._fetch_ticker_info(security_id))
+        return self._fetch_tickers(ticker, fetch, max_workers)
+
+    def get_ticker_info_batch(self, tickers: List[str], max_workers: int = DEFAULT_MAX_WORKERS) -> BatchResult:
+        """
+        Retrieve information for many tickers concurrently, tolerating individual failures.
 
-    def get_live_trades(self) -> List[Dict[str, Any]]:
+        Args:
+            tickers (List[str]): The ticker symbols to fetch.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
+
+        Returns:
+            BatchResult: Info dictionaries keyed by symbol in `results`, and the error for
+                         each symbol that could not be fetched (including unknown symbols) in `errors`.
+        """
+        ticker_list = self._normalize_tickers(tickers)
+        logger.info(f"Batch fetching ticker info for {len(ticker_list)} tickers.")
+        return self._fetch_batch(ticker_list, self._fetch_ticker_info, max_workers)
+
+    def _fetch_ticker_info(self, security_id: int) -> Dict[str, Any]:
+        endpoint = self.endpoints['ticker_info_api']
+        response = self.session.post(f"{endpoint['api']}/{security_id}", which_payload='stock-live')
+        return self.session.decode(response)
+
+    def get_live_trades(self, as_format: Optional[str] = None, check_market_open: bool = True) -> Any:
         """
         Fetches the live market trades if the market is open.
 
+        Args:
+            as_format (str, optional): 'numpy' or 'arrow' to return typed columns, or 'records' for a list of
+                                       `LiveTrade` records (see `nepse_scraper.models`), instead of a list
+                                       of dictionaries. Defaults to None.
+            check_market_open (bool): If True, first calls `is_market_open()` and returns an empty result
+                                      when the market is closed. Pollers that track the market state
+                                      themselves pass False to save a request. Defaults to True.
+
         Returns:
             List[Dict[str, Any]]: A list of live trade data, or an empty list if the market is closed.
+            Returns a dict of NumPy columns, a `pyarrow.Table` or records when `as_format` is given.
         """
-        if not self.is_market_open():
+        validate_format(as_format, LiveTrade)
+        if check_market_open and not self.is_market_open():
             logger.warning("Attempted to get live trades while market is closed.")
-            return []
-            
+            return format_rows([], as_format, LiveTrade)
+
         logger.info("Fetching live trades.")
         endpoint = self.endpoints['stock_live_api']
         response = self.session.post(endpoint['api'], which_payload='stock-live')
-        return response.json()
+        return format_rows(self.session.decode(response), as_format, LiveTrade)
 
     def get_indices_history(self, index_id: int, start_date: str, end_date: str) -> List[Dict[str, Any]]:
         """
@@ -234,7 +476,7 @@ class NepseScraper:
         path = f"{endpoint['api']}/{index_id}"
         params = {'startDate': start_date, 'endDate': end_date}
         response = self.session.get(path, params=params)
-        return response.json()
+        return self.session.decode(response)
 
     def get_sectorwise_summary(self) -> List[Dict[str, Any]]:
         """
@@ -246,7 +488,7 @@ class NepseScraper:
         logger.info("Fetching sector-wise summary.")
         endpoint = self.endpoints['sectorwise_summary_api']
         response = self.session.get(endpoint['api'])
-        return response.json()
+        return self.session.decode(response)
 
     def get_market_summary_history(self) -> List[Dict[str, Any]]:
         """
@@ -258,7 +500,7 @@ class NepseScraper:
         logger.info("Fetching historical market summary.")
         endpoint = self.endpoints['market_summary_history_api']
         response = self.session.get(endpoint['api'])
-        return response.json()
+        return self.session.decode(response)
 
     def get_company_disclosures(self) -> List[Dict[str, Any]]:
         """
@@ -270,7 +512,7 @@ class NepseScraper:
         logger.info("Fetching company disclosures.")
         endpoint = self.endpoints['disclosure']
         response = self.session.get(endpoint['api'])
-        return response.json().get('news', [])
+        return self.session.decode(response).get('news', [])
 
     def get_market_summary(self) -> Dict[str, Any]:
         """
@@ -282,7 +524,7 @@ class NepseScraper:
         logger.info("Fetching current market summary.")
         endpoint = self.endpoints['market_summary_api']
         response = self.session.get(endpoint['api'])
-        return response.json()
+        return self.session.decode(response)
 
     def get_all_securities(self) -> List[Dict[str, Any]]:
         """
@@ -294,7 +536,7 @@ class NepseScraper:
         logger.info("Fetching all securities.")
         endpoint = self.endpoints['security_api']
         response = self.session.get(endpoint['api'])
-        return response.json()
+        return self.session.decode(response)
 
     def get_market_cap(self) -> List[Dict[str, Any]]:
         """
@@ -306,10 +548,18 @@ class NepseScraper:
         logger.info("Fetching market capitalization data.")
         endpoint = self.endpoints['marketcap_api']
         response = self.session.get(endpoint['api'])
-        return response.json()
-    def get_brokers(self, **kwargs) -> List[Dict[str, Any]]:
-        """Fetches a list of all registered brokers from NEPSE with optional filters."""
+        return self.session.decode(response)
+    def get_brokers(self, max_workers: int = DEFAULT_MAX_WORKERS, **kwargs) -> List[Dict[str, Any]]:
+        """Fetches a list of all registered brokers from NEPSE with optional filters, across every page."""
         logger.info(f"Fetching list of brokers with filters: {kwargs}")
+        return collect_pages(self._broker_page_fetcher(**kwargs), max_workers).get('content', [])
+
+    def iter_brokers(self, prefetch: int = 0, **kwargs) -> Iterator[Dict[str, Any]]:
+        """Streams registered brokers page by page, accepting the same filters as `get_brokers`."""
+        logger.info(f"Streaming list of brokers with filters: {kwargs}")
+        return iter_rows(self._broker_page_fetcher(**kwargs), prefetch=prefetch)
+
+    def _broker_page_fetcher(self, page_size: int = 500, **kwargs) -> Callable[[int], Any]:
         endpoint = self.endpoints['broker_api']
         
         # Construct parameters with the filters
@@ -322,9 +572,13 @@ class NepseScraper:
             "districtId": kwargs.get("district_id", 0),
             "municipalityId": kwargs.get("municipality_id", 0)
         }
-        params = {"page": "0", "size": "500"}
-        response = self.session.post(endpoint['api'], payload=payload, params=params)
-        return response.json().get('content', [])
+
+        def fetch_page(page: int) -> Any:
+            params = {"page": str(page), "size": str(page_size)}
+            response = self.session.post(endpoint['api'], payload=payload, params=params)
+            return self.session.decode(response)
+
+        return fetch_page
 
     def get_sectors(self) -> List[Dict[str, Any]]:
         """
@@ -336,19 +590,25 @@ class NepseScraper:
         logger.info("Fetching list of all sectors.")
         endpoint = self.endpoints['sector_api']
         response = self.session.get(endpoint['api'])
-        return response.json()
+        return self.session.decode(response)
 
-    def get_sector_indices(self) -> List[Dict[str, Any]]:
+    def get_sector_indices(self, as_format: Optional[str] = None) -> Any:
         """
         Retrieve index information for all sectors listed in the NEPSE.
 
+        Args:
+            as_format (str, optional): 'numpy' or 'arrow' to return typed columns, or 'records' for a list of
+                                       `SectorIndex` records (see `nepse_scraper.models`), instead of a list
+                                       of dictionaries. Defaults to None.
+
         Returns:
             List[Dict[str, Any]]: A list of dictionaries containing sector index data.
         """
+        validate_format(as_format, SectorIndex)
         logger.info("Fetching list of all sector indices.")
         endpoint = self.endpoints['sector_index_api']
         response = self.session.get(endpoint['api'])
-        return response.json()
+        return format_rows(self.session.decode(response), as_format, SectorIndex)
         
     def get_live_indices(self, index_id: int = 58) -> List[Dict[str, Any]]:
         """
@@ -368,17 +628,48 @@ class NepseScraper:
              raise ValueError(f"'{index_id}' is not a valid index ID. Must be between 51 and 67.")
 
         logger.info(f"Fetching live data for index ID: {index_id}")
+        return self._fetch_live_index(index_id)
+
+    def get_all_live_indices(self, index_ids: Optional[List[int]] = None, max_workers: Optional[int] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Retrieve the live time series of every index at once, fetched concurrently.
+
+        Authentication and the 'sector-live' payload id are settled once up
+        front, so the requests all reuse them and go out together over the
+        shared connection pool: the board refreshes in about one round-trip.
+
+        Args:
+            index_ids (List[int], optional): The index IDs to fetch. Defaults to every index (51 to 67).
+            max_workers (int, optional): The maximum number of concurrent requests. Defaults to one per index.
+
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: The time series of each index, keyed by index ID in the requested order.
+
+        Raises:
+            ValueError: If any index ID is not within the valid range.
+        """
+        index_ids = list(LIVE_INDEX_IDS if index_ids is None else index_ids)
+        invalid = [index_id for index_id in index_ids if index_id not in LIVE_INDEX_IDS]
+        if invalid:
+            raise ValueError(f"{invalid} are not valid index IDs. Must be between 51 and 67.")
+        logger.info(f"Fetching live data for {len(index_ids)} indices.")
+        self.session.payload_id('sector-live')
+        batch = run_batch(self._fetch_live_index, {index_id: index_id for index_id in index_ids}, max_workers=max_workers or len(index_ids))
+        batch.raise_for_errors()
+        return batch.results
+
+    def _fetch_live_index(self, index_id: int) -> List[Dict[str, Any]]:
         endpoint = self.endpoints['indices_live_api']
-        path = f"{endpoint['api']}/{index_id}"
-        response = self.session.post(path, which_payload='sector-live')
-        return response.json()
+        response = self.session.post(f"{endpoint['api']}/{index_id}", which_payload='sector-live')
+        return self.session.decode(response)
 
-    def get_ticker_contact(self, ticker: Union[str, List[str]]) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    def get_ticker_contact(self, ticker: Union[str, List[str]], max_workers: int = DEFAULT_MAX_WORKERS) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
         """
         Retrieve contact information for one or more tickers from Nepse.
 
         Args:
             ticker (Union[str, List[str]]): A single ticker symbol or a list of ticker symbols.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
 
         Returns:
             Union[Dict[str, Any], Dict[str, Dict[str, Any]]]: 
@@ -387,54 +678,184 @@ class NepseScraper:
         Raises:
             ValueError: If the ticker is not found or no ticker is provided.
         """
-        if not ticker:
-            raise ValueError('Ticker is required.')
+        logger.info(f"Fetching contact info for: {ticker}")
+        return self._fetch_tickers(ticker, self._fetch_ticker_contact, max_workers)
 
-        ticker_list = [ticker.upper()] if isinstance(ticker, str) else [t.upper() for t in ticker]
-        logger.info(f"Fetching contact info for: {ticker_list}")
+    def get_ticker_contact_batch(self, tickers: List[str], max_workers: int = DEFAULT_MAX_WORKERS) -> BatchResult:
+        """
+        Retrieve contact information for many tickers concurrently, tolerating individual failures.
 
-        ticker_ids = self._resolve_ticker_ids(ticker_list)
+        Args:
+            tickers (List[str]): The ticker symbols to fetch.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
+
+        Returns:
+            BatchResult: Contact dictionaries keyed by symbol, plus a per-symbol error map.
+        """
+        ticker_list = self._normalize_tickers(tickers)
+        logger.info(f"Batch fetching contact info for {len(ticker_list)} tickers.")
+        return self._fetch_batch(ticker_list, self._fetch_ticker_contact, max_workers)
+
+    def _fetch_ticker_contact(self, security_id: int) -> Dict[str, Any]:
         endpoint = self.endpoints['ticker_contact_api']
-        base_path = endpoint['api']
-        results = {}
+        response = self.session.get(f"{endpoint['api']}/{security_id}")
+        return self.session.decode(response)
 
-        for symbol, security_id in ticker_ids.items():
-            path = f"{base_path}/{security_id}"
-            response = self.session.get(path)
-            results[symbol] = response.json()
+    def get_ticker_price_history(self, ticker: Union[str, List[str]], start_date: str, end_date: str, page: Optional[int] = None, size: int = 500, max_workers: int = DEFAULT_MAX_WORKERS) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+        """
+        Fetches the price history for one or more tickers within a date range.
+
+        Args:
+            ticker (Union[str, List[str]]): A single ticker symbol or a list of ticker symbols.
+            start_date (str): The start date in "YYYY-MM-DD" format.
+            end_date (str): The end date in "YYYY-MM-DD" format.
+            page (int, optional): A single page to fetch. Defaults to None, which fetches every page
+                                  and merges the rows into the first page's `content`.
+            size (int): The number of records per page.
+            max_workers (int): The maximum number of concurrent requests, shared between the tickers and their pages. Defaults to 8.
 
-        return results[ticker_list[0]] if len(ticker_list) == 1 else results
+        Returns:
+            Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+                The price history page for a single ticker, or a dictionary of pages keyed by ticker symbol.
+        """
+        logger.info(f"Fetching price history for ticker: {ticker}")
+        ticker_list = self._normalize_tickers(ticker)
+        fetch = self._price_history_fetcher(start_date, end_date, page, size, page_workers(max_workers, len(ticker_list)))
+        return self._fetch_tickers(ticker_list, fetch, max_workers)
 
-    def get_ticker_price_history(self, ticker: str, start_date: str, end_date: str, page: int = 0, size: int = 500) -> List[Dict[str, Any]]:
+    def get_ticker_price_history_batch(self, tickers: List[str], start_date: str, end_date: str, page: Optional[int] = None, size: int = 500, max_workers: int = DEFAULT_MAX_WORKERS) -> BatchResult:
         """
-        Fetches the price history for a given ticker within a date range.
+        Fetches price history for many tickers concurrently, tolerating individual failures.
 
         Args:
-            ticker (str): The ticker symbol for the security.
+            tickers (List[str]): The ticker symbols to fetch.
             start_date (str): The start date in "YYYY-MM-DD" format.
             end_date (str): The end date in "YYYY-MM-DD" format.
-            page (int): The page number for pagination.
+            page (int, optional): A single page to fetch. Defaults to None, which fetches every page.
             size (int): The number of records per page.
+            max_workers (int): The maximum number of concurrent requests, shared between the tickers and their pages. Defaults to 8.
 
         Returns:
-            List[Dict[str, Any]]: A list of price history data for the ticker.
+            BatchResult: Price history pages keyed by symbol, plus a per-symbol error map.
+        """
+        ticker_list = self._normalize_tickers(tickers)
+        logger.info(f"Batch fetching price history for {len(ticker_list)} tickers.")
+        fetch = self._price_history_fetcher(start_date, end_date, page, size, page_workers(max_workers, len(ticker_list)))
+        return self._fetch_batch(ticker_list, fetch, max_workers)
+
+    def iter_ticker_price_history(self, ticker: str, start_date: str, end_date: str, size: int = 500, prefetch: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the price history for a ticker row by row, holding one page in memory at a time.
+
+        Args:
+            ticker (str): The ticker symbol for the security.
+            start_date (str): The start date in "YYYY-MM-DD" format.
+            end_date (str): The end date in "YYYY-MM-DD" format.
+            size (int): The number of records per page.
+            prefetch (int): The number of following pages requested in the background. Defaults to 0.
+
+        Yields:
+            Dict[str, Any]: A single day's price record.
         """
         ticker_upper = ticker.upper()
-        logger.info(f"Fetching price history for ticker: {ticker_upper}")
-        
-        ticker_id = self._resolve_ticker_ids([ticker_upper])[ticker_upper]
+        logger.info(f"Streaming price history for ticker: {ticker_upper}")
+        security_id = self._resolve_ticker_ids([ticker_upper])[ticker_upper]
+        fetch_page = self._price_history_page_fetcher(security_id, start_date, end_date, size)
+        return iter_rows(fetch_page, prefetch=prefetch)
+
+    def _price_history_page_fetcher(self, security_id: int, start_date: str, end_date: str, size: int) -> Callable[[int], Any]:
         endpoint = self.endpoints['ticker_price_api']
-        
-        path = f"{endpoint['api']}/{ticker_id}"
-        
-        params = {
-            'startDate': start_date,
-            'endDate': end_date,
-            'page': page,
-            'size': size
-        }
-        response = self.session.get(path, params=params)
-        return response.json()
+
+        def fetch_page(page: int) -> Any:
+            params = {
+                'startDate': start_date,
+                'endDate': end_date,
+                'page': page,
+                'size': size
+            }
+            response = self.session.get(f"{endpoint['api']}/{security_id}", params=params)
+            return self.session.decode(response)
+
+        return fetch_page
+
+    def _price_history_fetcher(self, start_date: str, end_date: str, page: Optional[int], size: int, max_workers: Optional[int]) -> Callable[[int], Dict[str, Any]]:
+        def fetch(security_id: int) -> Dict[str, Any]:
+            fetch_page = self._price_history_page_fetcher(security_id, start_date, end_date, size)
+            if page is not None:
+                return fetch_page(page)
+            return collect_pages(fetch_page, max_workers)
+
+        return fetch
+
+    @property
+    def history_store(self) -> HistoryStore:
+        """The local price history store, created in the package cache directory on first use."""
+        if self._history_store is None:
+            with self._history_store_lock:
+                if self._history_store is None:
+                    self._history_store = HistoryStore()
+        return self._history_store
+
+    def sync_history(self, tickers: Union[str, List[str]], start_date: str, end_date: str, size: int = 500, max_workers: int = DEFAULT_MAX_WORKERS) -> BatchResult:
+        """
+        Downloads the price history of many tickers into the local `history_store`, fetching only missing dates.
+
+        For each ticker, the date ranges already synced are looked up in the
+        store and only the gaps within `[start_date, end_date]` are requested.
+
+        Args:
+            tickers (Union[str, List[str]]): A single ticker symbol or a list of ticker symbols.
+            start_date (str): The start date in "YYYY-MM-DD" format.
+            end_date (str): The end date in "YYYY-MM-DD" format.
+            size (int): The number of records per page.
+            max_workers (int): The maximum number of concurrent requests, shared between the tickers and their pages. Defaults to 8.
+
+        Returns:
+            BatchResult: The number of rows downloaded for each symbol in `results` (0 if nothing
+                         was missing), and the error for each symbol that could not be synced in `errors`.
+        """
+        ticker_list = self._normalize_tickers(tickers)
+        logger.info(f"Syncing price history for {len(ticker_list)} tickers between {start_date} and {end_date}.")
+        return self._fetch_batch(ticker_list, self._history_syncer(start_date, end_date, size, page_workers(max_workers, len(ticker_list))), max_workers)
+
+    def get_stored_price_history(self, ticker: Union[str, List[str]], start_date: str, end_date: str, sync: bool = False, max_workers: int = DEFAULT_MAX_WORKERS) -> Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+        """
+        Reads price history from the local `history_store`.
+
+        Args:
+            ticker (Union[str, List[str]]): A single ticker symbol or a list of ticker symbols.
+            start_date (str): The start date in "YYYY-MM-DD" format.
+            end_date (str): The end date in "YYYY-MM-DD" format.
+            sync (bool): If True, downloads any missing dates first with `sync_history`. Defaults to False.
+            max_workers (int): The maximum number of tickers synced concurrently. Defaults to 8.
+
+        Returns:
+            Union[List[Dict[str, Any]], Dict[str, List[Dict[str, Any]]]]:
+                The daily rows of a single ticker (oldest first), or a dictionary of them keyed by ticker symbol.
+
+        Raises:
+            ValueError: If a ticker is not found in NEPSE.
+        """
+        ticker_list = self._normalize_tickers(ticker)
+        if sync:
+            self.sync_history(ticker_list, start_date, end_date, max_workers=max_workers).raise_for_errors()
+        ticker_ids = self._resolve_ticker_ids(ticker_list)
+        history = {symbol: self.history_store.read(ticker_ids[symbol], start_date, end_date) for symbol in ticker_list}
+        return history[ticker_list[0]] if len(ticker_list) == 1 else history
+
+    def _history_syncer(self, start_date: str, end_date: str, size: int, max_workers: Optional[int]) -> Callable[[int], int]:
+        store = self.history_store
+
+        def sync(security_id: int) -> int:
+            fetched = 0
+            for gap_start, gap_end in store.missing_ranges(security_id, start_date, end_date):
+                logger.debug(f"Fetching history gap {gap_start} to {gap_end} for security {security_id}.")
+                fetch_page = self._price_history_page_fetcher(security_id, gap_start.isoformat(), gap_end.isoformat(), size)
+                rows = page_rows(collect_pages(fetch_page, max_workers))
+                fetched += store.store_range(security_id, gap_start, gap_end, rows)
+            return fetched
+
+        return sync
 
     # =========================================================================
     # NEW METHODS ADDED
@@ -450,25 +871,42 @@ class NepseScraper:
         logger.info("Fetching NEPSE index data.")
         endpoint = self.endpoints['nepse_index_api']
         response = self.session.get(endpoint['api'])
-        return response.json()
+        return self.session.decode(response)
 
-    def get_security_daily_trade_stat(self, ticker: str) -> Dict[str, Any]:
+    def get_security_daily_trade_stat(self, ticker: Union[str, List[str]], max_workers: int = DEFAULT_MAX_WORKERS) -> Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
         """
-        Retrieves daily trade statistics for a specific security.
+        Retrieves daily trade statistics for one or more securities.
 
         Args:
-            ticker (str): The ticker symbol of the security.
+            ticker (Union[str, List[str]]): A single ticker symbol or a list of ticker symbols.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
 
         Returns:
-            Dict[str, Any]: A dictionary containing the daily trade statistics.
+            Union[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+                The daily trade statistics for a single ticker, or a dictionary of statistics keyed by ticker symbol.
         """
-        ticker_upper = ticker.upper()
-        logger.info(f"Fetching daily trade statistics for ticker: {ticker_upper}")
-        ticker_id = self._resolve_ticker_ids([ticker_upper])[ticker_upper]
+        logger.info(f"Fetching daily trade statistics for ticker: {ticker}")
+        return self._fetch_tickers(ticker, self._fetch_daily_trade_stat, max_workers)
+
+    def get_security_daily_trade_stat_batch(self, tickers: List[str], max_workers: int = DEFAULT_MAX_WORKERS) -> BatchResult:
+        """
+        Retrieves daily trade statistics for many securities concurrently, tolerating individual failures.
+
+        Args:
+            tickers (List[str]): The ticker symbols to fetch.
+            max_workers (int): The maximum number of tickers fetched concurrently. Defaults to 8.
+
+        Returns:
+            BatchResult: Daily trade statistics keyed by symbol, plus a per-symbol error map.
+        """
+        ticker_list = self._normalize_tickers(tickers)
+        logger.info(f"Batch fetching daily trade statistics for {len(ticker_list)} tickers.")
+        return self._fetch_batch(ticker_list, self._fetch_daily_trade_stat, max_workers)
+
+    def _fetch_daily_trade_stat(self, security_id: int) -> Dict[str, Any]:
         endpoint = self.endpoints['security_daily_trade_stat_api']
-        path = f"{endpoint['api']}/{ticker_id}"
-        response = self.session.get(path)
-        return response.json()
+        response = self.session.get(f"{endpoint['api']}/{security_id}")
+        return self.session.decode(response)
 
     def get_securities_list(self) -> List[Dict[str, Any]]:
         """
@@ -480,7 +918,7 @@ class NepseScraper:
         logger.info("Fetching the simplified list of securities.")
         endpoint = self.endpoints['securities_list_api']
         response = self.session.get(endpoint['api'])
-        return response.json()
+        return self.session.decode(response)
 
     def get_supply_demand(self, show_all: bool = False) -> List[Dict[str, Any]]:
         """
@@ -496,7 +934,7 @@ class NepseScraper:
         endpoint = self.endpoints['supply_demand_api']
         params = {'all': str(show_all).lower()}
         response = self.session.get(endpoint['api'], params=params)
-        return response.json()
+        return self.session.decode(response)
 
 
     def get_top_by_trade_quantity(self, show_all: bool = False) -> List[Dict[str, Any]]:
@@ -513,40 +951,99 @@ class NepseScraper:
         endpoint = self.endpoints['top_trade_qty_api']
         params = {'all': str(show_all).lower()}
         response = self.session.get(endpoint['api'], params=params)
-        return response.json()
+        return self.session.decode(response)
 
-    def get_trading_average(self, n_days: int = 120, business_date: Optional[str] = None) -> List[Dict[str, Any]]:
+    def get_trading_average(self, n_days: int = 120, business_date: Optional[str] = None, page_size: int = 500, max_workers: int = DEFAULT_MAX_WORKERS, as_format: Optional[str] = None) -> Any:
         """
-        Retrieve the trading average for a specified number of days.
+        Retrieve the trading average for a specified number of days, across every page.
 
         Args:
             n_days (int): The number of days to include in the trading average calculation (must be between 1 and 180). 
                           Defaults to 120.
             business_date (str, optional): The end date for the calculation in "YYYY-MM-DD" format. 
                                            Defaults to the latest date.
+            page_size (int): The number of records requested per page. Defaults to 500.
+            max_workers (int): The maximum number of pages fetched concurrently. Defaults to 8.
+            as_format (str, optional): 'numpy' or 'arrow' to return typed columns instead of a list of
+                                       dictionaries (see `nepse_scraper.columnar`). Defaults to None.
 
         Returns:
             List[Dict[str, Any]]: A list of dictionaries containing the trading average data.
+            Returns a dict of NumPy columns or a `pyarrow.Table` when `as_format` is given.
             
         Raises:
             ValueError: If n_days is not between 1 and 180.
         """
+        validate_format(as_format)
+        logger.info(f"Fetching trading average for {n_days} days, ending on {business_date or 'latest'}")
+        merged = collect_pages(self._trading_average_page_fetcher(n_days, business_date, page_size), max_workers)
+        if as_format is None:
+            return merged
+        return format_rows(page_rows(merged), as_format)
+
+    def iter_trading_average(self, n_days: int = 120, business_date: Optional[str] = None, page_size: int = 500, prefetch: int = 0) -> Iterator[Dict[str, Any]]:
+        """Streams the trading average rows page by page; arguments match `get_trading_average`."""
+        logger.info(f"Streaming trading average for {n_days} days, ending on {business_date or 'latest'}")
+        return iter_rows(self._trading_average_page_fetcher(n_days, business_date, page_size), prefetch=prefetch)
+
+    def _trading_average_page_fetcher(self, n_days: int, business_date: Optional[str], page_size: int) -> Callable[[int], Any]:
         if not (1 <= n_days <= 180):
             raise ValueError("n_days must be between 1 and 180.")
 
-        logger.info(f"Fetching trading average for {n_days} days, ending on {business_date or 'latest'}")
         endpoint = self.endpoints['trading_average_api']
-        
-        params = {
-            "nDays": n_days,
-            "businessDate": business_date,
-            "page": "0", 
-            "size": "500" # Use a large size to get all data
-        }
-        
-        response = self.session.get(endpoint['api'], params=params)
-        return response.json()
 
+        def fetch_page(page: int) -> Any:
+            params = {
+                "nDays": n_days,
+                "businessDate": business_date,
+                "page": str(page),
+                "size": str(page_size)
+            }
+            response = self.session.get(endpoint['api'], params=params)
+            return self.session.decode(response)
+
+        return fetch_page
+
+
+    def get_sector_map(self, refresh: bool = False) -> SectorMap:
+        """
+        Returns the symbol-to-sector index used by `get_market_metrics`.
+
+        It is built from `get_all_securities()` and `get_sectors()` on first use
+        and kept for the lifetime of the client.
+
+        Args:
+            refresh (bool): Download the listings again, e.g. after new securities were listed. Defaults to False.
+        """
+        with self._sector_map_lock:
+            if self._sector_map is None or refresh:
+                logger.info("Building the symbol-to-sector map.")
+                self._sector_map = SectorMap.from_securities(self.get_all_securities(), self.get_sectors())
+            return self._sector_map
+
+    def get_market_metrics(self, business_date: Optional[str] = None, n_days: Optional[int] = None, max_workers: int = DEFAULT_MAX_WORKERS) -> MarketMetrics:
+        """
+        Computes market-wide metrics of today's prices in batched NumPy operations.
+
+        Percent change, VWAP, turnover share and per-sector aggregates are
+        computed over the whole market at once (see `nepse_scraper.analytics`).
+        Requires `pip install nepse-scraper[numpy]`.
+
+        Args:
+            business_date (str, optional): The date in "YYYY-MM-DD" format. Defaults to the latest trading day.
+            n_days (int, optional): Also join the `n_days` trading average into `average_price` and `premium`.
+                                    Defaults to None.
+            max_workers (int): The maximum number of pages fetched concurrently. Defaults to 8.
+
+        Returns:
+            MarketMetrics: Arrays aligned with the rows of `get_today_price()`.
+        """
+        sector_map = self.get_sector_map()
+        snapshot = self.get_today_price(business_date, max_workers=max_workers, as_format='numpy')
+        trading_average = None
+        if n_days is not None:
+            trading_average = self.get_trading_average(n_days, business_date, max_workers=max_workers, as_format='numpy')
+        return market_metrics(snapshot, sector_map, trading_average)
 
     def get_notices(self) -> List[Dict[str, Any]]:
         """
@@ -558,7 +1055,7 @@ class NepseScraper:
         logger.info("Fetching general notices.")
         endpoint = self.endpoints['notice_api']
         response = self.session.get(endpoint['api'])
-        return response.json()
+        return self.session.decode(response)
 
     def get_info_officers(self) -> List[Dict[str, Any]]:
         """
@@ -570,4 +1067,4 @@ class NepseScraper:
         logger.info("Fetching list of information officers.")
         endpoint = self.endpoints['info_officer_api']
         response = self.session.get(endpoint['api'])
-        return response.json()
\ No newline at end of file
+        return self.session.decode(response)
\ No newline at end of file
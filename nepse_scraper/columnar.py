@@ -0,0 +1,179 @@
+# nepse_scraper/columnar.py
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from .models import Record
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ('numpy', 'arrow', 'records')
+
+# Fixed dtypes for the numeric fields of the bulk market endpoints (today's
+# price, live trades, trading average, top stocks). Prices and values are
+# float64 so turnover figures keep their paisa; quantities and ids are int64.
+FLOAT_FIELDS = frozenset((
+    'openPrice', 'highPrice', 'lowPrice', 'closePrice', 'closingPrice', 'previousDayClosePrice',
+    'previousClose', 'lastTradedPrice', 'lastUpdatedPrice', 'ltp', 'averageTradedPrice',
+    'fiftyTwoWeekHigh', 'fiftyTwoWeekLow', 'percentageChange', 'pointChange',
+    'totalTradedValue', 'totalTradeValue', 'turnover', 'marketCapitalization',
+))
+INT_FIELDS = frozenset((
+    'id', 'securityId', 'totalTradedQuantity', 'totalTradeQuantity', 'lastTradedVolume',
+    'shareTraded', 'totalTrades', 'noOfTransactions',
+))
+
+
+@dataclass
+class EncodedColumn:
+    """
+    A dictionary-encoded string column of a NumPy result.
+
+    `codes` holds one int32 index into `categories` per row, with -1 for missing values.
+    """
+    codes: Any
+    categories: Any
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def decode(self) -> Any:
+        """Returns the column as an object array of strings (None for missing values)."""
+        import numpy as np
+        values = np.empty(len(self.codes), dtype=object)
+        present = self.codes >= 0
+        values[present] = self.categories[self.codes[present]]
+        return values
+
+
+def validate_format(as_format: Optional[str], record_type: Optional[Type[Record]] = None) -> None:
+    """Raises ValueError for an unsupported `as_format` value, including 'records' where no `record_type` exists."""
+    if as_format is not None and as_format not in SUPPORTED_FORMATS:
+        raise ValueError(f"Invalid as_format: {as_format}. Must be one of {SUPPORTED_FORMATS} or None")
+    if as_format == 'records' and record_type is None:
+        raise ValueError("as_format='records' is not available for this method; use 'numpy', 'arrow' or None")
+
+
+def format_rows(rows: List[Dict[str, Any]], as_format: Optional[str], record_type: Optional[Type[Record]] = None) -> Any:
+    """Returns `rows` unchanged, converted to the columnar `as_format`, or as `record_type` records."""
+    validate_format(as_format, record_type)
+    if as_format == 'records':
+        return record_type.from_rows(rows)
+    if as_format == 'numpy':
+        return rows_to_numpy(rows)
+    if as_format == 'arrow':
+        return rows_to_arrow(rows)
+    return rows
+
+
+def _column_names(rows: Sequence[Dict[str, Any]]) -> List[str]:
+    # NEPSE rows share one shape; only scan every row if the first one looks incomplete.
+    names = dict.fromkeys(rows[0]) if rows else {}
+    if any(len(row) != len(names) for row in rows):
+        for row in rows:
+            names.update(dict.fromkeys(row))
+    return list(names)
+
+
+def _column_kind(name: str, values: List[Any]) -> str:
+    if name in FLOAT_FIELDS:
+        return 'float'
+    if name in INT_FIELDS:
+        return 'int'
+    sample = next((v for v in values if v is not None), None)
+    if isinstance(sample, bool):
+        return 'bool'
+    if isinstance(sample, int):
+        return 'int'
+    if isinstance(sample, float):
+        return 'float'
+    if isinstance(sample, str):
+        return 'string'
+    return 'object'
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ImportError as e:
+        raise ImportError(
+            "as_format='numpy' requires the optional 'numpy' dependency. "
+            "Install it with: pip install nepse-scraper[numpy]"
+        ) from e
+    return np
+
+
+def _encode_strings(np, values: List[Any]) -> EncodedColumn:
+    lookup: Dict[str, int] = {}
+    codes = np.fromiter(
+        (-1 if v is None else lookup.setdefault(v, len(lookup)) for v in values),
+        dtype=np.int32, count=len(values),
+    )
+    return EncodedColumn(codes, np.array(list(lookup), dtype=str))
+
+
+def rows_to_numpy(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Converts API rows into a dict of NumPy columns.
+
+    Numeric fields become float64/int64 arrays (float64 with NaN if an integer
+    column has missing values), and string fields become `EncodedColumn`s.
+    """
+    np = _numpy()
+    columns: Dict[str, Any] = {}
+    for name in _column_names(rows):
+        values = [row.get(name) for row in rows]
+        kind = _column_kind(name, values)
+        try:
+            if kind == 'int' and None in values:
+                kind = 'float'
+            if kind == 'float':
+                columns[name] = np.array(values, dtype=np.float64)
+            elif kind == 'int':
+                columns[name] = np.array(values, dtype=np.int64)
+            elif kind == 'bool' and None not in values:
+                columns[name] = np.array(values, dtype=bool)
+            elif kind == 'string':
+                columns[name] = _encode_strings(np, values)
+            else:
+                columns[name] = np.array(values, dtype=object)
+        except (TypeError, ValueError):
+            logger.debug(f"Column '{name}' does not fit dtype '{kind}', keeping Python objects.")
+            columns[name] = np.array(values, dtype=object)
+    return columns
+
+
+def rows_to_arrow(rows: List[Dict[str, Any]]) -> Any:
+    """
+    Converts API rows into a `pyarrow.Table`.
+
+    Numeric fields use float64/int64 columns with nulls for missing values, and
+    string fields are dictionary-encoded.
+    """
+    try:
+        import pyarrow as pa
+    except ImportError as e:
+        raise ImportError(
+            "as_format='arrow' requires the optional 'pyarrow' dependency. "
+            "Install it with: pip install nepse-scraper[arrow]"
+        ) from e
+
+    arrow_types = {'float': pa.float64(), 'int': pa.int64(), 'bool': pa.bool_(), 'string': pa.string()}
+    columns: Dict[str, Any] = {}
+    for name in _column_names(rows):
+        values = [row.get(name) for row in rows]
+        kind = _column_kind(name, values)
+        try:
+            array = pa.array(values, type=arrow_types.get(kind))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Some endpoints send numbers as strings (e.g. `securityId` of live trades).
+            array = pa.array([None if v is None else str(v) for v in values], type=pa.string())
+            if kind in ('float', 'int'):
+                try:
+                    array = array.cast(arrow_types[kind])
+                except (pa.ArrowInvalid, pa.ArrowTypeError):
+                    logger.debug(f"Column '{name}' does not fit dtype '{kind}', storing it as strings.")
+        if pa.types.is_string(array.type):
+            array = array.dictionary_encode()
+        columns[name] = array
+    return pa.table(columns)
@@ -1,68 +1,226 @@
 # nepse_scraper/core.py
 import logging
+import threading
+import time
 import warnings
-from typing import Any, Dict, Optional
+from contextlib import nullcontext
+from urllib.parse import urlsplit
+from typing import Any, Dict, Iterator, Optional, Union
 
 import requests
-import certifi
 from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.request import ACCEPT_ENCODING
 from urllib3.util.retry import Retry
 from urllib3.exceptions import InsecureRequestWarning
 
-from .auth import PayloadParser, TokenParser
-from .endpoints import api_dict
+from .auth import PayloadIdCache, PayloadParser, nepse_today
+from .cache import CacheBackend, CachedResponse, MemoryCache, ResponseCache
+from .credentials import CredentialStore, make_credential_store
+from .decoding import JsonDecoder, get_json_decoder, iter_json_array
+from .endpoints import api_dict, resolve_endpoint_name
 from .exceptions import SSLCertVerificationError, NepseScraperException
+from .metrics import MetricsRegistry
+from .ratelimit import CONGESTION_STATUSES, AdaptiveConcurrency, RateLimiter, make_rate_limiter
+from .replay import PathLike, Recorder, RecordingAdapter, ReplayAdapter, Replayer, make_recorder, make_replayer
+from .singleflight import SingleFlight
+from .token_manager import DEFAULT_REFRESH_MARGIN, DEFAULT_TOKEN_TTL, TokenManager
 
 logger = logging.getLogger(__name__)
 ROOT_URL = 'https://www.nepalstock.com'
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:89.0) Gecko/20100101 Firefox/89.0',
+    'Accept': 'application/json, text/plain, */*', 'Accept-Language': 'en-US,en;q=0.5',
+    'Connection': 'keep-alive', 'Referer': f'{ROOT_URL}/',
+}
+# urllib3's list only names the codings whose decoders are installed (br needs `brotli`).
+COMPRESSED_ENCODINGS = ACCEPT_ENCODING.replace(',', ', ')
+DEFAULT_POOL_CONNECTIONS = 10
+# Large enough for a batch with max_workers=32 to keep every connection alive.
+DEFAULT_POOL_MAXSIZE = 32
 
 
 class NepseAPISession:
-    def __init__(self, verify_ssl: bool = True):
-        self._token_parser = TokenParser()
+    """
+    Owns the HTTP session and authentication state for talking to NEPSE.
+
+    Construction is cheap: the WASM token parser and the underlying
+    `requests.Session` are only created when the first request needs them.
+
+    A session is thread-safe and can be shared by a thread pool. The token,
+    the market-open id and the HTTP session are each initialized exactly once
+    under a lock, however many threads ask for them at the same time.
+
+    Args:
+        verify_ssl: Whether to verify the server's SSL certificate.
+        token_ttl: Seconds after which an access token is considered expired.
+        refresh_margin: How many seconds before expiry the token is refreshed.
+        endpoints: The endpoint registry used to name requests. Defaults to `api_dict`.
+        cache: A `CacheBackend` for responses, or True for an in-memory LRU cache.
+        cache_ttls: Per-endpoint TTL overrides (in seconds) merged over `DEFAULT_CACHE_TTLS`.
+        json_decoder: 'orjson', 'ujson', 'json' or a callable used by `decode()`. Defaults to the
+            fastest installed library.
+        rate_limit: Requests per second across all endpoints, or a `RateLimiter`. None for no limit.
+        endpoint_rate_limits: Requests per second for individual endpoints, keyed by endpoint name.
+        adaptive_concurrency: True (or an `AdaptiveConcurrency`) to cap in-flight requests with an AIMD
+            controller that backs off on 429/5xx responses and rising latency.
+        coalesce_requests: Whether identical concurrent requests share one in-flight response. Defaults to True.
+        metrics: True (or a shared `MetricsRegistry`) to record per-endpoint request counts, latencies,
+            response sizes, retries, status classes, cache hits and JSON decode/token parse times.
+        base_url: The server to talk to. Defaults to NEPSE; point it at a local stand-in for offline runs.
+        pool_connections: The number of per-host connection pools to keep.
+        pool_maxsize: The maximum number of connections kept alive per host. Size it to the number of
+            threads sharing the session; extra connections are opened and discarded after use.
+        pool_block: Whether a thread waits for a free pooled connection instead of opening an extra one.
+        compression: Whether to ask for gzip/deflate (and brotli, when installed) compressed responses.
+        credential_store: A `CredentialStore` (or True for a `FileCredentialStore` in the cache directory)
+            through which sessions in several processes share one access token and market-open id.
+        record: An archive path (or a `Recorder`) that every request and response is written to.
+        replay: An archive path (or a `Replayer`) that serves every response instead of the network.
+    """
+    def __init__(
+        self,
+        verify_ssl: bool = True,
+        token_ttl: float = DEFAULT_TOKEN_TTL,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        endpoints: Optional[Dict[str, Dict[str, str]]] = None,
+        cache: Union[bool, CacheBackend, None] = None,
+        cache_ttls: Optional[Dict[str, float]] = None,
+        json_decoder: Union[str, JsonDecoder, None] = None,
+        rate_limit: Union[float, RateLimiter, None] = None,
+        endpoint_rate_limits: Optional[Dict[str, float]] = None,
+        adaptive_concurrency: Union[bool, AdaptiveConcurrency, None] = None,
+        coalesce_requests: bool = True,
+        metrics: Union[bool, MetricsRegistry, None] = None,
+        base_url: str = ROOT_URL,
+        record: Union[PathLike, Recorder, None] = None,
+        replay: Union[PathLike, Replayer, None] = None,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        pool_block: bool = False,
+        compression: bool = True,
+        credential_store: Union[bool, CredentialStore, None] = None,
+    ):
+        if record is not None and replay is not None:
+            raise ValueError("A session can either record or replay, not both.")
         self._payload_parser = PayloadParser()
-        self.access_token: Optional[str] = None
-        self.token_details: Optional[Dict[str, Any]] = None
+        self._token_manager = TokenManager(token_ttl=token_ttl, refresh_margin=refresh_margin)
         
-        self._market_open_id: Optional[int] = None
+        self._payload_cache = PayloadIdCache(self._payload_parser)
         
-        self.session = requests.Session()
+        self._verify_ssl = verify_ssl
+        self.base_url = base_url.rstrip('/')
+        self._session: Optional[requests.Session] = None
+        self._pool_options = {'pool_connections': pool_connections, 'pool_maxsize': pool_maxsize, 'pool_block': pool_block}
+        self._accept_encoding = COMPRESSED_ENCODINGS if compression else 'identity'
+
+        self.endpoints = api_dict if endpoints is None else endpoints
+        if cache is True:
+            cache = MemoryCache()
+        self.cache: Optional[ResponseCache] = ResponseCache(cache, cache_ttls) if cache else None
+        self.json_decoder = get_json_decoder(json_decoder)
+        self.rate_limiter = make_rate_limiter(rate_limit, endpoint_rate_limits)
+        if adaptive_concurrency is True:
+            adaptive_concurrency = AdaptiveConcurrency()
+        self.concurrency: Optional[AdaptiveConcurrency] = adaptive_concurrency or None
+        self._single_flight: Optional[SingleFlight] = SingleFlight() if coalesce_requests else None
+        if metrics is True:
+            metrics = MetricsRegistry()
+        self.metrics: Optional[MetricsRegistry] = metrics or None
+        self.recorder = make_recorder(record)
+        self.replayer = make_replayer(replay)
+        self.credential_store = make_credential_store(credential_store)
+
+        self._session_lock = threading.Lock()
+        self._auth_lock = threading.RLock()
+        self._market_id_lock = threading.Lock()
         
-        if verify_ssl:
-            self.session.verify = certifi.where()
-        else:
-            self.session.verify = False
+        if not verify_ssl:
             warnings.warn(
                 "SSL certificate verification has been disabled. This is not recommended and may be insecure.",
                 InsecureRequestWarning
             )
+        logger.debug("NepseAPISession initialized.")
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        if self._verify_ssl:
+            import certifi
+            session.verify = certifi.where()
+        else:
+            session.verify = False
 
         retry_strategy = Retry(
             total=3, backoff_factor=1, status_forcelist=[500, 502, 503, 504],
             allowed_methods=["HEAD", "GET", "POST"]
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("https://", adapter)
-        self.session.mount("http://", adapter)
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (X11; Ubuntu; Linux x86_64; rv:89.0) Gecko/20100101 Firefox/89.0',
-            'Accept': 'application/json, text/plain, */*', 'Accept-Language': 'en-US,en;q=0.5',
-            'Connection': 'keep-alive', 'Referer': f'{ROOT_URL}/',
-        })
-        logger.debug("NepseAPISession initialized.")
+        if self.replayer is not None:
+            adapter = ReplayAdapter(self.replayer)
+        elif self.recorder is not None:
+            adapter = RecordingAdapter(self.recorder, max_retries=retry_strategy, **self._pool_options)
+        else:
+            adapter = HTTPAdapter(max_retries=retry_strategy, **self._pool_options)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(DEFAULT_HEADERS)
+        session.headers['Accept-Encoding'] = self._accept_encoding
+        logger.debug("Created HTTP session.")
+        return session
+
+    @property
+    def access_token(self) -> Optional[str]:
+        return self._token_manager.access_token
+
+    @property
+    def token_details(self) -> Optional[Dict[str, Any]]:
+        return self._token_manager.token_details
+
+    def _shared_credentials(self) -> Any:
+        """Holds the credential store's cross-process lock, when a store is configured."""
+        return self.credential_store.lock() if self.credential_store is not None else nullcontext()
 
     def _get_access_token(self) -> None:
-        if self.access_token: return
+        if not self._token_manager.needs_refresh(): return
+        with self._auth_lock, self._shared_credentials():
+            # Another thread, or another process sharing the store, may have refreshed the token while we waited.
+            if self.credential_store is not None:
+                self.credential_store.load_token(self._token_manager)
+            if not self._token_manager.needs_refresh(): return
+            self._renew_access_token()
+            if self.credential_store is not None:
+                self.credential_store.save_token(self._token_manager)
+
+    def _renew_access_token(self) -> None:
+        if self._token_manager.can_refresh():
+            try:
+                self._refresh_access_token()
+                return
+            except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                logger.warning(f"Token refresh failed, re-authenticating: {e}")
+        self._authenticate()
+
+    def _invalidate_token(self, access_token: Optional[str]) -> None:
+        with self._auth_lock:
+            self._token_manager.invalidate(access_token)
+            if self.credential_store is not None and access_token:
+                self.credential_store.invalidate_token(access_token)
+
+    def _authenticate(self) -> None:
         logger.info("No active token found. Fetching new access token from NEPSE.")
         auth_endpoint = api_dict['authenticate_api']
-        url = ROOT_URL + auth_endpoint['api']
+        url = self.base_url + auth_endpoint['api']
         try:
-            response = self.session.request(auth_endpoint['method'], url)
+            response = self._send_limited(auth_endpoint['method'], url, 'authenticate_api')
             response.raise_for_status()
-            token_response = response.json()
-            for i in range(1, 6): token_response[f'salt{i}'] = int(token_response[f'salt{i}'])
-            self.access_token, _ = self._token_parser.parse_token_response(token_response)
-            self.token_details = token_response
+            self._store_token(response, 'authenticate_api')
             logger.info("Successfully authenticated and stored new token.")
         except requests.exceptions.SSLError as e:
             logger.error(f"SSL Certificate Verification failed: {e}", exc_info=True)
@@ -76,58 +234,220 @@ class NepseAPISession:
             logger.error(f"Failed to authenticate with NEPSE API: {e}", exc_info=True)
             raise e
 
-    def _fetch_market_open_id(self) -> int:
-        if self._market_open_id is not None:
-            logger.debug(f"Using cached market_open_id: {self._market_open_id}")
-            return self._market_open_id
-
-        self._get_access_token() # We need to be authenticated to call this.
-        logger.debug("Fetching market open ID for payload calculation.")
-        endpoint = api_dict['marketopen_api']
-        url = ROOT_URL + endpoint['api']
+    def _refresh_access_token(self) -> None:
+        logger.info("Access token is about to expire. Refreshing it with the refresh token.")
+        endpoint = api_dict['refresh_token_api']
+        url = self.base_url + endpoint['api']
         headers = {'Authorization': f'Salter {self.access_token}'}
-        
-        try:
-            response = self.session.get(url, headers=headers)
-            response.raise_for_status()
-            market_data = response.json()
-            self._market_open_id = market_data["id"]
-            return self._market_open_id
-        except (requests.exceptions.RequestException, KeyError) as e:
-            logger.error(f"Failed to fetch or parse market open ID: {e}", exc_info=True)
-            raise IOError("Could not retrieve the necessary payload ID from NEPSE.") from e
+        response = self._send_limited(endpoint['method'], url, 'refresh_token_api', json=self._token_manager.refresh_payload(), headers=headers)
+        response.raise_for_status()
+        self._store_token(response, 'refresh_token_api')
+        logger.info("Successfully refreshed access token.")
+
+    def _store_token(self, response: requests.Response, endpoint_name: str) -> None:
+        token_response = self.decode(response)
+        started = time.perf_counter()
+        self._token_manager.update(token_response)
+        if self.metrics is not None:
+            self.metrics.record_token_parse(endpoint_name, time.perf_counter() - started)
+
+    def _fetch_market_open_id(self) -> int:
+        market_open_id = self._payload_cache.market_open_id
+        if market_open_id is not None:
+            logger.debug(f"Using cached market_open_id: {market_open_id}")
+            return market_open_id
+
+        # Only one thread fetches the id. No auth or store lock is held across the request: a
+        # 401 on it re-authenticates, which takes both.
+        with self._market_id_lock:
+            market_open_id = self._payload_cache.market_open_id
+            if market_open_id is not None:
+                return market_open_id
+            if self.credential_store is not None:
+                with self.credential_store.lock():
+                    market_open_id = self.credential_store.load_market_open_id(nepse_today())
+                if market_open_id is not None:
+                    logger.debug(f"Using shared market_open_id: {market_open_id}")
+                    self._payload_cache.market_open_id = market_open_id
+                    return market_open_id
+
+            logger.debug("Fetching market open ID for payload calculation.")
+            endpoint = api_dict['marketopen_api']
+            
+            try:
+                # Sent directly rather than through the cache and single-flight, which may hand
+                # this thread a request another thread is running.
+                response = self._send_authenticated('GET', endpoint['api'], endpoint_name='marketopen_api')
+                market_open_id = self.decode(response)["id"]
+            except (requests.exceptions.RequestException, KeyError, ValueError) as e:
+                logger.error(f"Failed to fetch or parse market open ID: {e}", exc_info=True)
+                raise IOError("Could not retrieve the necessary payload ID from NEPSE.") from e
+            self._payload_cache.market_open_id = market_open_id
+            if self.credential_store is not None:
+                with self.credential_store.lock():
+                    self.credential_store.save_market_open_id(nepse_today(), market_open_id)
+            return market_open_id
 
 
     def _get_payload_id(self, which_payload: str) -> int:
         self._get_access_token()
-        given_id = self._fetch_market_open_id()
-        
-        return self._payload_parser.calculate_payload_id(
-            given_id=given_id,
-            token_details=self.token_details,
-            which=which_payload
-        )
+        self._fetch_market_open_id()
+        return self._payload_cache.payload_id(which_payload, self.token_details)
 
-    def get(self, path: str, params: Optional[Dict] = None) -> requests.Response:
-        self._get_access_token()
-        url = ROOT_URL + path
-        headers = {'Authorization': f'Salter {self.access_token}'}
-        logger.debug(f"Making GET request to: {url} with params: {params}")
-        resp = self.session.get(url, params=params, headers=headers)
-        resp.raise_for_status()
+    def payload_id(self, which_payload: str) -> int:
+        """Returns the payload id POSTs of `which_payload` send, authenticating and fetching the market-open id if needed."""
+        return self._get_payload_id(which_payload)
+
+    def _request(self, method: str, path: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None, bypass_cache: bool = False) -> requests.Response:
+        """
+        Sends a request, serving it from the response cache when its endpoint has a TTL.
+
+        With `bypass_cache=True` the cache is not read, but the fresh response
+        still replaces the cached one. Concurrent calls with the same method,
+        path, params and payload are coalesced into a single request whose
+        response they all receive.
+        """
+        endpoint_name = resolve_endpoint_name(method, path, self.endpoints)
+        request_key = ResponseCache.make_key(endpoint_name, method, path, params, payload if payload is not None else which_payload)
+        cache_key = None
+        if self.cache is not None and self.cache.ttl_for(endpoint_name) > 0:
+            cache_key = request_key
+            cached = None if bypass_cache else self.cache.get(cache_key)
+            if self.metrics is not None and not bypass_cache:
+                self.metrics.record_cache(endpoint_name, hit=cached is not None)
+            if cached is not None:
+                return self._response_from_cache(method, cached)
+
+        def send():
+            resp = self._send_authenticated(method, path, params=params, payload=payload, which_payload=which_payload, endpoint_name=endpoint_name)
+            if cache_key is not None:
+                self.cache.set(endpoint_name, cache_key, resp.status_code, resp.content, resp.url, resp.headers)
+            return resp
+
+        if self._single_flight is None:
+            return send()
+        return self._single_flight.do(request_key, send)
+
+    @staticmethod
+    def _response_from_cache(method: str, entry: CachedResponse) -> requests.Response:
+        resp = requests.Response()
+        resp.request = requests.Request(method, entry.url).prepare()
+        resp.status_code = entry.status_code
+        resp.headers = CaseInsensitiveDict(entry.headers)
+        resp.url = entry.url
+        resp._content = entry.content
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
         return resp
 
-    def post(self, path: str, payload: Optional[Dict] = None, params: Optional[Dict] = None, which_payload: Optional[str] = None) -> requests.Response:
-        self._get_access_token()
-        url = ROOT_URL + path
-        headers = {'Authorization': f'Salter {self.access_token}'}
-        
-        if payload is None:
-            final_payload = {'id': self._get_payload_id(which_payload=which_payload)}
-        else:
-            final_payload = payload
+    def _send_authenticated(self, method: str, path: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None, stream: bool = False, endpoint_name: Optional[str] = None) -> requests.Response:
+        """
+        Sends an authenticated request.
+
+        A 401 response invalidates the token; the request is then retried
+        once with a fresh token (and a freshly computed payload id for POSTs).
+        With `stream=True` the body is left unread for `iter_content()`.
+        """
+        url = self.base_url + path
+        for attempt in range(2):
+            self._get_access_token()
+            access_token = self.access_token
+            headers = {'Authorization': f'Salter {access_token}'}
+            if method == 'POST':
+                final_payload = payload if payload is not None else {'id': self._get_payload_id(which_payload=which_payload)}
+                logger.debug(f"Making POST request to: {url} with payload: {final_payload} and params: {params}")
+                resp = self._send_limited('POST', url, endpoint_name, json=final_payload, params=params, headers=headers, stream=stream)
+            else:
+                logger.debug(f"Making GET request to: {url} with params: {params}")
+                resp = self._send_limited('GET', url, endpoint_name, params=params, headers=headers, stream=stream)
 
-        logger.debug(f"Making POST request to: {url} with payload: {final_payload} and params: {params}")
-        resp = self.session.post(url, json=final_payload, params=params, headers=headers)
+            if resp.status_code == 401 and attempt == 0:
+                logger.warning(f"Received 401 for {url}. Re-authenticating and retrying once.")
+                resp.close()
+                self._invalidate_token(access_token)
+                continue
+            break
+        if stream and not resp.ok:
+            resp.close()
         resp.raise_for_status()
-        return resp
\ No newline at end of file
+        return resp
+
+    def _send_limited(self, method: str, url: str, endpoint_name: Optional[str], **kwargs) -> requests.Response:
+        """Sends one request through the rate limiter and the adaptive concurrency controller, when configured."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(endpoint_name)
+        if self.concurrency is None and self.metrics is None:
+            return self.session.request(method, url, **kwargs)
+
+        started_at = self.concurrency.acquire() if self.concurrency is not None else None
+        sent_at = time.perf_counter()
+        status_code, response_bytes, wire_bytes, history, congested = None, 0, 0, (), False
+        try:
+            resp = self.session.request(method, url, **kwargs)
+            status_code = resp.status_code
+            response_bytes = _body_size(resp, kwargs.get('stream', False))
+            wire_bytes = _wire_size(resp, kwargs.get('stream', False))
+            # urllib3 retries 5xx responses internally; they still signal an overloaded server.
+            history = getattr(getattr(resp.raw, 'retries', None), 'history', None) or ()
+            congested = any(entry.status in CONGESTION_STATUSES for entry in history)
+            return resp
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            congested = True
+            raise
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_request(endpoint_name, time.perf_counter() - sent_at, status_code, response_bytes, len(history), wire_bytes)
+            if started_at is not None:
+                self.concurrency.release(started_at, status_code, congested)
+
+    def decode(self, response: requests.Response) -> Any:
+        """Decodes a JSON response body with the configured `json_decoder`."""
+        if self.metrics is None:
+            return self.json_decoder(response.content)
+        started = time.perf_counter()
+        data = self.json_decoder(response.content)
+        elapsed = time.perf_counter() - started
+        request = response.request
+        endpoint_name = resolve_endpoint_name(request.method, urlsplit(response.url).path, self.endpoints) if request is not None else None
+        self.metrics.record_decode(endpoint_name, elapsed)
+        return data
+
+    def stream_json(self, method: str, path: str, params: Optional[Dict] = None, payload: Optional[Dict] = None, which_payload: Optional[str] = None, key: Optional[str] = 'content', chunk_size: int = 64 * 1024) -> Iterator[Any]:
+        """
+        Sends a request and yields the elements of its JSON array body while it downloads.
+
+        The response cache is bypassed. `key` names the top-level field holding
+        the array when the body is an object (Spring pages use 'content').
+        """
+        endpoint_name = resolve_endpoint_name(method, path, self.endpoints)
+        resp = self._send_authenticated(method, path, params=params, payload=payload, which_payload=which_payload, stream=True, endpoint_name=endpoint_name)
+        with resp:
+            yield from iter_json_array(resp.iter_content(chunk_size), key=key)
+
+    def invalidate_cache(self, endpoint_name: Optional[str] = None) -> None:
+        """Drops cached responses for one endpoint name, or for all endpoints."""
+        if self.cache is not None:
+            self.cache.invalidate(endpoint_name)
+
+    def get(self, path: str, params: Optional[Dict] = None, bypass_cache: bool = False) -> requests.Response:
+        return self._request('GET', path, params=params, bypass_cache=bypass_cache)
+
+    def post(self, path: str, payload: Optional[Dict] = None, params: Optional[Dict] = None, which_payload: Optional[str] = None, bypass_cache: bool = False) -> requests.Response:
+        return self._request('POST', path, params=params, payload=payload, which_payload=which_payload, bypass_cache=bypass_cache)
+
+
+def _body_size(resp: requests.Response, stream: bool) -> int:
+    """The size of a response body; for unread streamed bodies, the declared Content-Length."""
+    if stream:
+        return int(resp.headers.get('Content-Length') or 0)
+    return len(resp.content)
+
+
+def _wire_size(resp: Any, stream: bool) -> int:
+    """The number of body bytes received on the wire, before decompression."""
+    if stream:
+        return int(resp.headers.get('Content-Length') or 0)
+    downloaded = getattr(resp, 'num_bytes_downloaded', None)  # httpx
+    if downloaded is None:
+        tell = getattr(resp.raw, 'tell', None)  # urllib3 counts the raw bytes it read.
+        downloaded = tell() if tell is not None else None
+    return downloaded if downloaded else len(resp.content)
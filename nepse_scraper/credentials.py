@@ -0,0 +1,197 @@
+# nepse_scraper/credentials.py
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import date
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, Optional, Union
+
+from .token_manager import TokenManager
+from .utils import atomic_write_bytes, default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+if os.name == 'nt':
+    import msvcrt
+
+    def _lock_file(f: IO[bytes], blocking: bool) -> bool:
+        f.seek(0)
+        while True:
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                return True
+            except OSError:
+                if not blocking:
+                    return False
+                time.sleep(0.05)
+
+    def _unlock_file(f: IO[bytes]) -> None:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(f: IO[bytes], blocking: bool) -> bool:
+        try:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except BlockingIOError:
+            return False
+
+    def _unlock_file(f: IO[bytes]) -> None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+@dataclass
+class SharedCredentials:
+    """The authentication state shared between processes; `issued_at` is a Unix timestamp."""
+    access_token: Optional[str] = None
+    refresh_token: Optional[str] = None
+    token_details: Optional[Dict[str, Any]] = None
+    issued_at: Optional[float] = None
+    business_date: Optional[str] = None
+    market_open_id: Optional[int] = None
+
+
+class CredentialStore:
+    """
+    Storage interface for sharing the access token and market-open id between sessions.
+
+    Implementations provide `load`/`save` and an exclusive `acquire`/`release`
+    lock that is reentrant within a thread. Sessions hold the lock while they
+    authenticate, refresh or fetch the market-open id, so only one of them does
+    the work and the others pick up its result.
+    """
+    def load(self) -> SharedCredentials:
+        raise NotImplementedError
+
+    def save(self, credentials: SharedCredentials) -> None:
+        raise NotImplementedError
+
+    def acquire(self, blocking: bool = True) -> bool:
+        raise NotImplementedError
+
+    def release(self) -> None:
+        raise NotImplementedError
+
+    @contextmanager
+    def lock(self) -> Iterator[None]:
+        self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    def load_token(self, token_manager: TokenManager) -> bool:
+        """Copies a stored token into `token_manager` if it differs from its own and has not expired."""
+        credentials = self.load()
+        if not credentials.access_token or credentials.access_token == token_manager.access_token:
+            return False
+        age = time.time() - (credentials.issued_at or 0.0)
+        if age >= token_manager.token_ttl:
+            return False
+        token_manager.adopt(credentials.access_token, credentials.refresh_token, credentials.token_details, max(age, 0.0))
+        logger.debug(f"Reusing a shared access token issued {age:.1f}s ago.")
+        return True
+
+    def save_token(self, token_manager: TokenManager) -> None:
+        credentials = self.load()
+        credentials.access_token = token_manager.access_token
+        credentials.refresh_token = token_manager.refresh_token
+        credentials.token_details = token_manager.token_details
+        credentials.issued_at = time.time() - (token_manager.age or 0.0)
+        self.save(credentials)
+
+    def invalidate_token(self, access_token: str) -> None:
+        """Drops the stored token if it is `access_token`, e.g. after NEPSE rejected it."""
+        with self.lock():
+            credentials = self.load()
+            if credentials.access_token == access_token:
+                credentials.access_token = credentials.refresh_token = credentials.issued_at = None
+                self.save(credentials)
+
+    def load_market_open_id(self, business_date: date) -> Optional[int]:
+        credentials = self.load()
+        return credentials.market_open_id if credentials.business_date == business_date.isoformat() else None
+
+    def save_market_open_id(self, business_date: date, market_open_id: int) -> None:
+        credentials = self.load()
+        credentials.business_date = business_date.isoformat()
+        credentials.market_open_id = market_open_id
+        self.save(credentials)
+
+
+class FileCredentialStore(CredentialStore):
+    """
+    Shares credentials through a JSON file, locked with `fcntl.flock` (`msvcrt.locking` on Windows).
+
+    Point every worker of a process pool at the same file: the first one to
+    need a token authenticates, and the others reuse it instead of each
+    calling `authenticate/prove`. Refreshes and the daily market-open lookup
+    are coordinated the same way. The file holds live tokens, so it is
+    created readable by its owner only.
+
+    Args:
+        path: The credentials file. Defaults to `credentials.json` in the package cache directory.
+    """
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        self.path = Path(path) if path else default_cache_dir() / 'credentials.json'
+        self.lock_path = self.path.with_name(self.path.name + '.lock')
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # The file lock excludes other processes; this lock excludes other threads sharing the store.
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._lock_file: Optional[IO[bytes]] = None
+
+    def load(self) -> SharedCredentials:
+        try:
+            data = json.loads(self.path.read_bytes())
+            return SharedCredentials(**{key: data.get(key) for key in SharedCredentials.__dataclass_fields__})
+        except FileNotFoundError:
+            return SharedCredentials()
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable credentials file {self.path}: {e}")
+            return SharedCredentials()
+
+    def save(self, credentials: SharedCredentials) -> None:
+        atomic_write_bytes(self.path, json.dumps(asdict(credentials)).encode('utf-8'), mode=0o600)
+
+    def acquire(self, blocking: bool = True) -> bool:
+        if not self._thread_lock.acquire(blocking):
+            return False
+        if self._depth == 0:
+            f = open(self.lock_path, 'a+b')
+            if not _lock_file(f, blocking):
+                f.close()
+                self._thread_lock.release()
+                return False
+            self._lock_file = f
+        self._depth += 1
+        return True
+
+    def release(self) -> None:
+        self._depth -= 1
+        if self._depth == 0:
+            _unlock_file(self._lock_file)
+            self._lock_file.close()
+            self._lock_file = None
+        self._thread_lock.release()
+
+    def clear(self) -> None:
+        """Deletes the stored credentials."""
+        with self.lock():
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def make_credential_store(credential_store: Union[bool, CredentialStore, None]) -> Optional[CredentialStore]:
+    """Accepts a `CredentialStore`, True for a `FileCredentialStore` in the cache directory, or None."""
+    if credential_store is True:
+        return FileCredentialStore()
+    return credential_store or None
@@ -0,0 +1,217 @@
+# nepse_scraper/decoding.py
+import codecs
+import json
+import logging
+import re
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+JsonDecoder = Callable[[Union[bytes, str]], Any]
+
+# Tried in order when no decoder is configured; the stdlib is always available.
+DECODER_PREFERENCE = ('orjson', 'ujson', 'json')
+
+# A complete or unterminated string, or a structural character. Strings are
+# matched whole so brackets inside them are never mistaken for structure.
+_TOKEN = re.compile(r'"(?:[^"\\]|\\.)*(?:"|\\?\Z)|[\[\]{}]', re.DOTALL)
+_WHITESPACE = ' \t\r\n'
+_DELIMITERS = _WHITESPACE + ',]'
+
+
+def _load_decoder(name: str) -> JsonDecoder:
+    if name == 'orjson':
+        import orjson
+        return orjson.loads
+    if name == 'ujson':
+        import ujson
+        return ujson.loads
+    if name == 'json':
+        return json.loads
+    raise ValueError(f"Unknown JSON decoder: {name}. Must be one of {DECODER_PREFERENCE}")
+
+
+def get_json_decoder(decoder: Union[str, JsonDecoder, None] = None) -> JsonDecoder:
+    """
+    Resolves the JSON decoder used for response bodies.
+
+    Args:
+        decoder: A library name ('orjson', 'ujson' or 'json'), a callable taking
+                 bytes or str, or None to use the fastest installed library.
+
+    Returns:
+        A callable that decodes a JSON document.
+
+    Raises:
+        ImportError: If the named library is not installed.
+        ValueError: If the name is not a known library.
+    """
+    if callable(decoder):
+        return decoder
+    if decoder is not None:
+        return _load_decoder(decoder)
+    for name in DECODER_PREFERENCE:
+        try:
+            loads = _load_decoder(name)
+        except ImportError:
+            continue
+        logger.debug(f"Using '{name}' to decode JSON responses.")
+        return loads
+    return json.loads
+
+
+class JsonArrayParser:
+    """
+    Incrementally parses a JSON array fed as byte chunks, returning each element as soon as it is complete.
+
+    Only the current element (plus one chunk) is buffered, so rows of a large
+    response can be consumed while the rest of the body is still downloading.
+    Elements are decoded with the C scanner of the standard `json` module.
+
+    Args:
+        key: If the document is an object, the top-level key holding the array (e.g. 'content'
+             for paged endpoints). A top-level array is streamed whatever the key.
+    """
+    def __init__(self, key: Optional[str] = None) -> None:
+        self.key = key
+        self.done = False
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._raw_decode = json.JSONDecoder().raw_decode
+        self._locator = _ArrayLocator(key)
+        self._buffer = ''
+        self._in_array = False
+        self._expect_value = True
+        self._has_values = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Adds a chunk of the body and returns the elements it completed.
+
+        Raises:
+            ValueError: If the document is not an array, has no array under `key`, or is malformed.
+        """
+        if self.done:
+            return []
+        return self._parse(self._text_decoder.decode(chunk), eof=False)
+
+    def close(self) -> List[Any]:
+        """
+        Signals the end of the body and returns any last elements.
+
+        Raises:
+            ValueError: If the body ended before the array was closed.
+        """
+        if self.done:
+            return []
+        values = self._parse(self._text_decoder.decode(b'', final=True), eof=True)
+        if not self.done:
+            if not self._in_array:
+                raise ValueError(f"No JSON array found{f' under key {self.key!r}' if self.key else ''}.")
+            raise ValueError("JSON array ended before its closing bracket.")
+        return values
+
+    def _parse(self, text: str, eof: bool) -> List[Any]:
+        buffer = self._buffer + text
+        if not self._in_array:
+            pos = self._locator.feed(buffer)
+            if pos is None:
+                self._buffer = buffer[self._locator.pos:]
+                self._locator.pos = 0
+                return []
+            self._in_array = True
+        else:
+            pos = 0
+
+        values = []
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if char == ']':
+                if self._expect_value and self._has_values:
+                    raise ValueError(f"Trailing comma in JSON array near: {buffer[max(pos - 40, 0):pos + 1]!r}")
+                # The rest of the envelope (page counts etc.) is not needed.
+                self.done = True
+                pos = len(buffer)
+                break
+            if not self._expect_value:
+                if char != ',':
+                    raise ValueError(f"Malformed JSON array near: {buffer[pos:pos + 40]!r}")
+                pos += 1
+                self._expect_value = True
+                continue
+            try:
+                value, end = self._raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                break  # The element is incomplete: wait for more data.
+            if not eof and isinstance(value, (int, float)) and (end == len(buffer) or buffer[end] not in _DELIMITERS):
+                break  # The number may continue in the next chunk (e.g. "12" of "12.5").
+            values.append(value)
+            pos = end
+            self._expect_value = False
+            self._has_values = True
+
+        self._buffer = buffer[pos:]
+        return values
+
+
+def iter_json_array(chunks: Iterable[bytes], key: Optional[str] = None) -> Iterator[Any]:
+    """
+    Yields the elements of a JSON array streamed as byte chunks, e.g. `response.iter_content(65536)`.
+
+    See `JsonArrayParser` for the meaning of `key`. The remaining chunks are
+    still consumed after the array closes so the connection can be reused.
+    """
+    parser = JsonArrayParser(key)
+    for chunk in chunks:
+        if chunk and not parser.done:
+            yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+class _ArrayLocator:
+    """Scans the prefix of a document for the opening bracket of the array to stream."""
+    def __init__(self, key: Optional[str]) -> None:
+        self.key_token = json.dumps(key) if key is not None else None
+        self.key = key
+        self.depth = 0
+        self.last_key = None
+        self.pos = 0  # Next character of the buffer to scan.
+
+    def feed(self, buffer: str) -> Optional[int]:
+        """Returns the position just after the array's opening bracket, or None if more data is needed."""
+        while True:
+            match = _TOKEN.search(buffer, self.pos)
+            if match is None:
+                return None
+            token = match.group()
+            if token[0] == '"':
+                if len(token) < 2 or not token.endswith('"') or _escaped_quote(token):
+                    return None  # Unterminated string: wait for more data.
+                if self.depth == 1:
+                    self.last_key = token
+                self.pos = match.end()
+                continue
+
+            self.pos = match.end()
+            if token == '[' and (self.depth == 0 or (self.depth == 1 and self.last_key == self.key_token)):
+                return self.pos
+            if token == '{' and self.depth == 0 and self.key is None:
+                raise ValueError("Expected a JSON array; pass `key` to stream an array inside an object.")
+            if token in '[{':
+                self.depth += 1
+            elif token in ']}':
+                self.depth -= 1
+                if self.depth == 0:
+                    break
+        raise ValueError(f"No JSON array found under key {self.key!r}.")
+
+
+def _escaped_quote(token: str) -> bool:
+    """True if the final quote of a matched string token is escaped by an odd run of backslashes."""
+    backslashes = len(token) - 1 - len(token[:-1].rstrip('\\'))
+    return backslashes % 2 == 1
@@ -1,5 +1,8 @@
+from typing import Dict, Optional
+
 api_dict = {
     "authenticate_api": {"api":"/api/authenticate/prove", "method":"GET"},
+    "refresh_token_api": {"api":"/api/authenticate/refresh-token", "method":"POST"},
     "today_price_api": {"api":"/api/nots/nepse-data/today-price", "method":"POST"},
     "marketopen_api":{"api":"/api/nots/nepse-data/market-open", "method":"GET"},
     "refer_api":{"api":"", "method":"GET"},
@@ -32,4 +35,28 @@ api_dict = {
     "top_trade_qty_api": {"api": "/api/nots/top-ten/trade-qty", "method": "GET"},
     "notice_api": {"api": "/api/web/notice/", "method": "GET"},
     "info_officer_api": {"api": "/api/web/info-officer", "method": "GET"},
-}
\ No newline at end of file
+}
+
+# The index ids `indices_live_api` accepts: the NEPSE index (58), the sensitive,
+# float and sensitive float indices and the sector sub-indices.
+LIVE_INDEX_IDS = tuple(range(51, 68))
+
+def resolve_endpoint_name(method: str, path: str, endpoints: Optional[Dict[str, Dict[str, str]]] = None) -> Optional[str]:
+    """
+    Maps a request back to the name of the endpoint it targets.
+
+    Paths may carry a trailing id segment (e.g. `/api/nots/security/131`), which
+    is matched against the endpoint's base path. Returns None for unknown paths.
+    """
+    endpoints = api_dict if endpoints is None else endpoints
+    method = method.upper()
+    base_path = path.rsplit('/', 1)[0]
+    fallback = None
+    for name, info in endpoints.items():
+        if not info['api'] or info['method'] != method:
+            continue
+        if info['api'] == path:
+            return name
+        if fallback is None and info['api'] == base_path:
+            fallback = name
+    return fallback
@@ -0,0 +1,148 @@
+# nepse_scraper/history.py
+import json
+import logging
+import sqlite3
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .auth import nepse_today
+from .utils import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+DateLike = Union[str, date]
+DateRange = Tuple[date, date]
+
+_ONE_DAY = timedelta(days=1)
+
+
+def to_date(value: DateLike) -> date:
+    """Parses a "YYYY-MM-DD" string (a trailing time part is ignored) or passes a `date` through."""
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value[:10])
+
+
+class HistoryStore:
+    """
+    A local SQLite store of daily price history, keyed by security id and business date.
+
+    Besides the rows themselves, the store records which date ranges have been
+    synced for each security, including days without trading, so that
+    `missing_ranges()` can tell exactly which gaps still need downloading.
+    Reads are range queries on the `(security_id, business_date)` primary key.
+
+    Args:
+        path: The database file. Defaults to `history.sqlite3` in the package cache directory.
+    """
+    def __init__(self, path: Optional[Union[str, Path]] = None) -> None:
+        self.path = Path(path) if path else default_cache_dir() / 'history.sqlite3'
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS prices ("
+            "security_id INTEGER NOT NULL, business_date TEXT NOT NULL, data TEXT NOT NULL, "
+            "PRIMARY KEY (security_id, business_date)) WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS coverage ("
+            "security_id INTEGER NOT NULL, start_date TEXT NOT NULL, end_date TEXT NOT NULL, "
+            "PRIMARY KEY (security_id, start_date)) WITHOUT ROWID"
+        )
+
+    def covered_ranges(self, security_id: int) -> List[DateRange]:
+        """The synced date ranges of a security, sorted and non-overlapping."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT start_date, end_date FROM coverage WHERE security_id = ? ORDER BY start_date", (security_id,)
+            ).fetchall()
+        return [(date.fromisoformat(start), date.fromisoformat(end)) for start, end in rows]
+
+    def missing_ranges(self, security_id: int, start_date: DateLike, end_date: DateLike) -> List[DateRange]:
+        """Returns the sub-ranges of `[start_date, end_date]` that have not been synced for a security."""
+        start, end = to_date(start_date), to_date(end_date)
+        gaps: List[DateRange] = []
+        cursor = start
+        for covered_start, covered_end in self.covered_ranges(security_id):
+            if covered_end < cursor:
+                continue
+            if covered_start > end:
+                break
+            if covered_start > cursor:
+                gaps.append((cursor, covered_start - _ONE_DAY))
+            cursor = covered_end + _ONE_DAY
+            if cursor > end:
+                break
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def store_range(self, security_id: int, start_date: DateLike, end_date: DateLike, rows: Iterable[Dict[str, Any]], date_field: str = 'businessDate') -> int:
+        """
+        Saves the rows fetched for a date range and records the range as synced.
+
+        Days from today (Nepal time) onwards are not marked as synced because
+        their data may still change, so the next sync fetches them again.
+
+        Returns:
+            The number of rows written.
+        """
+        start, end = to_date(start_date), to_date(end_date)
+        records = [
+            (security_id, row[date_field][:10], json.dumps(row, separators=(',', ':')))
+            for row in rows if row.get(date_field)
+        ]
+        final_end = min(end, nepse_today() - _ONE_DAY)
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO prices VALUES (?, ?, ?)", records)
+                if start <= final_end:
+                    self._add_coverage(security_id, start, final_end)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.debug(f"Stored {len(records)} rows for security {security_id} between {start} and {end}.")
+        return len(records)
+
+    def _add_coverage(self, security_id: int, start: date, end: date) -> None:
+        # Merge with every range that overlaps or touches the new one.
+        overlapping = self._conn.execute(
+            "SELECT start_date, end_date FROM coverage WHERE security_id = ? AND start_date <= ? AND end_date >= ?",
+            (security_id, (end + _ONE_DAY).isoformat(), (start - _ONE_DAY).isoformat())
+        ).fetchall()
+        for covered_start, covered_end in overlapping:
+            start = min(start, date.fromisoformat(covered_start))
+            end = max(end, date.fromisoformat(covered_end))
+        self._conn.executemany(
+            "DELETE FROM coverage WHERE security_id = ? AND start_date = ?",
+            [(security_id, covered_start) for covered_start, _ in overlapping]
+        )
+        self._conn.execute("INSERT INTO coverage VALUES (?, ?, ?)", (security_id, start.isoformat(), end.isoformat()))
+
+    def read(self, security_id: int, start_date: DateLike, end_date: DateLike) -> List[Dict[str, Any]]:
+        """Returns the stored rows of a security between two dates (inclusive), oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM prices WHERE security_id = ? AND business_date BETWEEN ? AND ? ORDER BY business_date",
+                (security_id, to_date(start_date).isoformat(), to_date(end_date).isoformat())
+            ).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def clear(self, security_id: Optional[int] = None) -> None:
+        """Deletes the stored rows and sync records of one security, or of every security."""
+        with self._lock:
+            if security_id is None:
+                self._conn.execute("DELETE FROM prices")
+                self._conn.execute("DELETE FROM coverage")
+            else:
+                self._conn.execute("DELETE FROM prices WHERE security_id = ?", (security_id,))
+                self._conn.execute("DELETE FROM coverage WHERE security_id = ?", (security_id,))
+
+    def close(self) -> None:
+        self._conn.close()
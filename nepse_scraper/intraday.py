@@ -0,0 +1,212 @@
+# nepse_scraper/intraday.py
+import logging
+import threading
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# NEPSE's graph endpoint sends about one point a minute over a four-hour
+# session, so this keeps several days of points per index.
+DEFAULT_CAPACITY = 4096
+
+Point = Tuple[float, float]
+
+
+class IndexSeries:
+    """
+    A fixed-capacity ring buffer of `(timestamp, value)` points for one index, oldest first.
+
+    Timestamps are Unix seconds, as sent by `indices_live_api`, and strictly
+    increase: points at or before the latest one are ignored. Once full, each
+    new point overwrites the oldest, so memory stays bounded however long a
+    poller runs. The latest point is O(1) and time windows are found by binary
+    search, O(log n) plus the points returned.
+
+    Args:
+        capacity: The maximum number of points kept.
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self._times = array('d', bytes(8 * capacity))
+        self._values = array('d', bytes(8 * capacity))
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _slot(self, i: int) -> int:
+        return (self._start + i) % self.capacity
+
+    def append(self, timestamp: float, value: float) -> bool:
+        """Adds a point if it is newer than the latest one; returns whether it was added."""
+        if self._size and timestamp <= self._times[self._slot(self._size - 1)]:
+            return False
+        if self._size < self.capacity:
+            slot = self._slot(self._size)
+            self._size += 1
+        else:
+            slot = self._start
+            self._start = (self._start + 1) % self.capacity
+        self._times[slot] = timestamp
+        self._values[slot] = value
+        return True
+
+    def extend(self, points: Sequence[Sequence[Any]]) -> int:
+        """
+        Adds the points of a full intraday response that are newer than the latest one.
+
+        The response is ordered by time, so it is scanned backwards from its end
+        only until a known point is reached: the work per call is proportional
+        to the number of new points, not to the length of the day.
+
+        Returns:
+            int: The number of points added.
+        """
+        latest = self.latest()
+        last_seen = latest[0] if latest else None
+        first_new = len(points)
+        while first_new > 0:
+            point = _point(points[first_new - 1])
+            if last_seen is not None and point is not None and point[0] <= last_seen:
+                break
+            first_new -= 1
+        added = 0
+        for raw in points[first_new:]:
+            point = _point(raw)
+            if point is None:
+                logger.debug(f"Skipping malformed index point: {raw!r}")
+                continue
+            added += self.append(*point)
+        return added
+
+    def latest(self) -> Optional[Point]:
+        """Returns the newest point, or None if the series is empty."""
+        if not self._size:
+            return None
+        slot = self._slot(self._size - 1)
+        return self._times[slot], self._values[slot]
+
+    def _bisect(self, timestamp: float, right: bool = False) -> int:
+        # The first logical index whose timestamp is >= `timestamp` (> with `right`).
+        lo, hi = 0, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            t = self._times[self._slot(mid)]
+            if t < timestamp or (right and t == timestamp):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _points(self, start: int, stop: Optional[int] = None) -> List[Point]:
+        times, values = self._times, self._values
+        return [(times[slot], values[slot]) for slot in map(self._slot, range(start, self._size if stop is None else stop))]
+
+    def since(self, timestamp: float) -> List[Point]:
+        """Returns the points at or after `timestamp`, oldest first."""
+        return self._points(self._bisect(timestamp))
+
+    def window(self, seconds: float, end: Optional[float] = None) -> List[Point]:
+        """Returns the points of the last `seconds` seconds up to `end` (default: the latest point), oldest first."""
+        if not self._size:
+            return []
+        if end is None:
+            end = self.latest()[0]
+        return self._points(self._bisect(end - seconds), self._bisect(end, right=True))
+
+    def change(self, seconds: float) -> Optional[float]:
+        """Returns the latest value minus the first value of the last `seconds` seconds, or None if empty."""
+        if not self._size:
+            return None
+        latest_time, latest_value = self.latest()
+        first = self._bisect(latest_time - seconds)
+        return latest_value - self._values[self._slot(first)]
+
+    def __iter__(self) -> Iterator[Point]:
+        return iter(self._points(0))
+
+    def clear(self) -> None:
+        self._start = self._size = 0
+
+
+def _point(raw: Any) -> Optional[Point]:
+    try:
+        return float(raw[0]), float(raw[1])
+    except (TypeError, ValueError, IndexError, KeyError):
+        return None
+
+
+class IntradayIndexTracker:
+    """
+    Keeps the intraday series of NEPSE indices up to date from `get_live_indices()`.
+
+    `indices_live_api` always returns the whole day so far; the tracker keeps
+    an `IndexSeries` per index id and appends only the points newer than the
+    last one it has seen, so consumers read the latest value or a time window
+    without re-processing the day on every tick. Safe to share between threads.
+
+    Args:
+        scraper: The `NepseScraper` used by `poll_once()`.
+        index_ids: The index ids (51 to 67) polled by `poll_once()`. Defaults to the NEPSE index (58).
+        capacity: The maximum number of points kept per index.
+    """
+    def __init__(self, scraper: Any = None, index_ids: Iterable[int] = (58,), capacity: int = DEFAULT_CAPACITY) -> None:
+        self.scraper = scraper
+        self.index_ids = tuple(index_ids)
+        self.capacity = capacity
+        self.series: Dict[int, IndexSeries] = {}
+        self._lock = threading.Lock()
+
+    def _series(self, index_id: int) -> IndexSeries:
+        series = self.series.get(index_id)
+        if series is None:
+            series = self.series[index_id] = IndexSeries(self.capacity)
+        return series
+
+    def update(self, index_id: int, points: Sequence[Sequence[Any]]) -> int:
+        """Merges one `get_live_indices(index_id)` response; returns the number of new points."""
+        with self._lock:
+            added = self._series(index_id).extend(points or ())
+        logger.debug(f"Index {index_id}: {added} new point(s).")
+        return added
+
+    def poll_once(self) -> Dict[int, int]:
+        """Fetches every tracked index concurrently and returns the number of new points per index id."""
+        if self.scraper is None:
+            raise ValueError("poll_once() requires a scraper; pass one to the tracker or feed responses to update().")
+        responses = self.scraper.get_all_live_indices(list(self.index_ids))
+        return {index_id: self.update(index_id, points) for index_id, points in responses.items()}
+
+    def latest(self, index_id: int) -> Optional[Point]:
+        """Returns the newest `(timestamp, value)` of an index, or None if none was seen."""
+        with self._lock:
+            series = self.series.get(index_id)
+            return series.latest() if series is not None else None
+
+    def window(self, index_id: int, seconds: float, end: Optional[float] = None) -> List[Point]:
+        """Returns the points of an index in the last `seconds` seconds; see `IndexSeries.window`."""
+        with self._lock:
+            series = self.series.get(index_id)
+            return series.window(seconds, end) if series is not None else []
+
+    def clear(self, index_id: Optional[int] = None) -> None:
+        """Forgets the points of one index, or of every index."""
+        with self._lock:
+            if index_id is None:
+                self.series.clear()
+            else:
+                self.series.pop(index_id, None)
+
+
+class AsyncIntradayIndexTracker(IntradayIndexTracker):
+    """The asyncio counterpart of `IntradayIndexTracker`, driven by an `AsyncNepseScraper`."""
+    async def poll_once(self) -> Dict[int, int]:
+        """Fetches every tracked index concurrently and returns the number of new points per index id."""
+        if self.scraper is None:
+            raise ValueError("poll_once() requires a scraper; pass one to the tracker or feed responses to update().")
+        responses = await self.scraper.get_all_live_indices(list(self.index_ids))
+        return {index_id: self.update(index_id, points) for index_id, points in responses.items()}
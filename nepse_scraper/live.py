@@ -0,0 +1,220 @@
+# nepse_scraper/live.py
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 5.0
+DEFAULT_MARKET_CHECK_INTERVAL = 60.0
+
+ADDED = 'added'
+CHANGED = 'changed'
+REMOVED = 'removed'
+
+Snapshot = Dict[str, Dict[str, Any]]
+
+
+@dataclass
+class DeltaEvent:
+    """
+    A change to one security between two live market snapshots.
+
+    Attributes:
+        symbol: The security's symbol.
+        kind: 'added', 'changed' or 'removed'.
+        row: The current row (the last known row for 'removed').
+        changes: For 'changed' events, the changed fields mapped to `(old, new)` values.
+    """
+    symbol: str
+    kind: str
+    row: Dict[str, Any]
+    changes: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+
+
+def diff_snapshots(previous: Snapshot, rows: List[Dict[str, Any]], key: str = 'symbol') -> Tuple[Snapshot, List[DeltaEvent]]:
+    """
+    Indexes `rows` by `key` and compares them with the previous snapshot.
+
+    Unchanged rows cost one dict comparison each; field-level changes are only
+    worked out for rows that differ.
+
+    Returns:
+        The new snapshot and the delta events, in the order of `rows` (removals last).
+    """
+    current: Snapshot = {}
+    events: List[DeltaEvent] = []
+    for row in rows:
+        symbol = row.get(key)
+        if symbol is None:
+            continue
+        current[symbol] = row
+        old = previous.get(symbol)
+        if old is None:
+            events.append(DeltaEvent(symbol, ADDED, row))
+        elif old != row:
+            changes = {name: (old.get(name), value) for name, value in row.items() if old.get(name) != value}
+            changes.update({name: (value, None) for name, value in old.items() if name not in row})
+            events.append(DeltaEvent(symbol, CHANGED, row, changes))
+    if len(current) != len(previous) or events:
+        events.extend(DeltaEvent(symbol, REMOVED, row) for symbol, row in previous.items() if symbol not in current)
+    return current, events
+
+
+class LiveMarketPoller:
+    """
+    Polls `stock_live_api` and emits only the rows that changed since the previous tick.
+
+    The previous snapshot is kept indexed by symbol, so consumers handle
+    O(changes) events per tick instead of the whole market. The first tick
+    reports every security as 'added'. Whether the market is open is checked
+    at most once per `market_check_interval`, not on every tick; while it is
+    closed no live data is requested.
+
+    Args:
+        scraper: The `NepseScraper` used to fetch live trades.
+        interval: Seconds between ticks. Ticks run at a fixed rate, so slow responses do not add drift.
+        on_delta: Called with the list of events of every tick that has changes, when using `run()`.
+        market_check_interval: Seconds between market-open checks.
+        clock: Returns the current time in seconds. Pass `Replayer.clock` to follow a recording's timeline.
+    """
+    def __init__(
+        self,
+        scraper: Any,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        on_delta: Optional[Callable[[List[DeltaEvent]], None]] = None,
+        market_check_interval: float = DEFAULT_MARKET_CHECK_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.scraper = scraper
+        self.interval = interval
+        self.on_delta = on_delta
+        self.market_check_interval = market_check_interval
+        self._clock = clock
+
+        self.snapshot: Snapshot = {}
+        self._market_open: Optional[bool] = None
+        self._market_checked_at: Optional[float] = None
+        self._stop = threading.Event()
+
+    def _is_market_open(self) -> bool:
+        now = self._clock()
+        if self._market_checked_at is None or now - self._market_checked_at >= self.market_check_interval:
+            self._market_open = self.scraper.is_market_open()
+            self._market_checked_at = now
+            logger.debug(f"Market open: {self._market_open}")
+        return self._market_open
+
+    def poll_once(self) -> List[DeltaEvent]:
+        """Fetches one snapshot if the market is open and returns its delta events."""
+        if not self._is_market_open():
+            return []
+        rows = self.scraper.get_live_trades(check_market_open=False)
+        self.snapshot, events = diff_snapshots(self.snapshot, rows)
+        logger.debug(f"Live tick: {len(rows)} rows, {len(events)} change(s).")
+        return events
+
+    def stream(self, max_ticks: Optional[int] = None) -> Iterator[List[DeltaEvent]]:
+        """
+        Polls every `interval` seconds and yields the events of each tick that has changes.
+
+        Args:
+            max_ticks (int, optional): Stop after this many ticks. Defaults to polling until `stop()`.
+        """
+        self._stop.clear()
+        next_tick = self._clock()
+        ticks = 0
+        while not self._stop.is_set() and (max_ticks is None or ticks < max_ticks):
+            events = self.poll_once()
+            ticks += 1
+            if events:
+                yield events
+            next_tick += self.interval
+            # Skip ticks that were missed rather than firing them back to back.
+            now = self._clock()
+            if next_tick < now:
+                next_tick = now
+            if max_ticks is None or ticks < max_ticks:
+                self._stop.wait(next_tick - now)
+
+    def run(self, max_ticks: Optional[int] = None) -> None:
+        """Polls like `stream()`, passing every non-empty list of events to `on_delta`."""
+        if self.on_delta is None:
+            raise ValueError("run() requires an on_delta callback; use stream() to iterate over events instead.")
+        for events in self.stream(max_ticks=max_ticks):
+            self.on_delta(events)
+
+    def stop(self) -> None:
+        """Stops `stream()`/`run()` after the current tick; safe to call from another thread."""
+        self._stop.set()
+
+
+class AsyncLiveMarketPoller:
+    """The asyncio counterpart of `LiveMarketPoller`, driven by an `AsyncNepseScraper`."""
+    def __init__(
+        self,
+        scraper: Any,
+        interval: float = DEFAULT_POLL_INTERVAL,
+        on_delta: Optional[Callable[[List[DeltaEvent]], Any]] = None,
+        market_check_interval: float = DEFAULT_MARKET_CHECK_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.scraper = scraper
+        self.interval = interval
+        self.on_delta = on_delta
+        self.market_check_interval = market_check_interval
+        self._clock = clock
+
+        self.snapshot: Snapshot = {}
+        self._market_open: Optional[bool] = None
+        self._market_checked_at: Optional[float] = None
+        self._stop = asyncio.Event()
+
+    async def _is_market_open(self) -> bool:
+        now = self._clock()
+        if self._market_checked_at is None or now - self._market_checked_at >= self.market_check_interval:
+            self._market_open = await self.scraper.is_market_open()
+            self._market_checked_at = now
+        return self._market_open
+
+    async def poll_once(self) -> List[DeltaEvent]:
+        """Fetches one snapshot if the market is open and returns its delta events."""
+        if not await self._is_market_open():
+            return []
+        rows = await self.scraper.get_live_trades(check_market_open=False)
+        self.snapshot, events = diff_snapshots(self.snapshot, rows)
+        return events
+
+    async def stream(self, max_ticks: Optional[int] = None) -> AsyncIterator[List[DeltaEvent]]:
+        """Polls every `interval` seconds and yields the events of each tick that has changes."""
+        self._stop.clear()
+        next_tick = self._clock()
+        ticks = 0
+        while not self._stop.is_set() and (max_ticks is None or ticks < max_ticks):
+            events = await self.poll_once()
+            ticks += 1
+            if events:
+                yield events
+            now = self._clock()
+            next_tick = max(next_tick + self.interval, now)
+            if max_ticks is None or ticks < max_ticks:
+                try:
+                    await asyncio.wait_for(self._stop.wait(), next_tick - now)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run(self, max_ticks: Optional[int] = None) -> None:
+        """Polls like `stream()`, passing every non-empty list of events to `on_delta` (which may be a coroutine function)."""
+        if self.on_delta is None:
+            raise ValueError("run() requires an on_delta callback; use stream() to iterate over events instead.")
+        async for events in self.stream(max_ticks=max_ticks):
+            result = self.on_delta(events)
+            if asyncio.iscoroutine(result):
+                await result
+
+    def stop(self) -> None:
+        """Stops `stream()`/`run()` after the current tick."""
+        self._stop.set()
@@ -0,0 +1,226 @@
+# nepse_scraper/metrics.py
+import bisect
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Upper bounds (in seconds) of the latency histogram buckets.
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Decoding and token parsing are CPU-bound and much faster than a round trip.
+DEFAULT_CPU_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
+UNKNOWN_ENDPOINT = 'unknown'
+
+
+class Histogram:
+    """A fixed-bucket histogram, in the cumulative-bucket model used by Prometheus."""
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # The last slot counts values above every bucket.
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """`(upper bound, count of values <= bound)` for every bucket, ending with `+Inf`."""
+        total = 0
+        result = []
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimates the `q` quantile by interpolating inside its bucket; None if nothing was observed."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        lower, seen = 0.0, 0
+        for bound, total in self.cumulative():
+            if total >= rank:
+                if bound == float('inf'):
+                    return lower  # Beyond the last bucket, the best estimate is its upper bound.
+                in_bucket = total - seen
+                return lower + (bound - lower) * ((rank - seen) / in_bucket if in_bucket else 0.0)
+            lower, seen = bound, total
+        return lower
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'mean': self.sum / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p95': self.quantile(0.95),
+            'p99': self.quantile(0.99),
+            'buckets': {_format_bound(bound): total for bound, total in self.cumulative()},
+        }
+
+
+class EndpointMetrics:
+    """Counters and histograms for one endpoint."""
+    def __init__(self, latency_buckets: Sequence[float], cpu_buckets: Sequence[float]) -> None:
+        self.statuses: Counter = Counter()
+        self.latency = Histogram(latency_buckets)
+        self.response_bytes = 0
+        self.wire_bytes = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.decode = Histogram(cpu_buckets)
+        self.token_parse = Histogram(cpu_buckets)
+
+    @property
+    def requests(self) -> int:
+        return sum(self.statuses.values())
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            'requests': self.requests,
+            'statuses': dict(self.statuses),
+            'latency': self.latency.summary(),
+            'response_bytes': self.response_bytes,
+            'wire_bytes': self.wire_bytes,
+            'retries': self.retries,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'decode': self.decode.summary(),
+            'token_parse': self.token_parse.summary(),
+        }
+
+
+class MetricsRegistry:
+    """
+    Collects per-endpoint request metrics for a session.
+
+    Requests are grouped by their endpoint name from `api_dict` (ids in the
+    path are ignored), so every ticker looked up through `ticker_info_api`
+    lands in the same series. The registry is thread-safe and can be shared by
+    several sessions. Read it with `snapshot()`, or expose `to_prometheus()`
+    from an HTTP handler for scraping.
+
+    Args:
+        latency_buckets: Bucket bounds, in seconds, of the request latency histograms.
+        cpu_buckets: Bucket bounds, in seconds, of the JSON decode and token parse histograms.
+    """
+    def __init__(self, latency_buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS, cpu_buckets: Sequence[float] = DEFAULT_CPU_BUCKETS) -> None:
+        self.latency_buckets = tuple(latency_buckets)
+        self.cpu_buckets = tuple(cpu_buckets)
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, EndpointMetrics] = {}
+
+    def _endpoint(self, endpoint_name: Optional[str]) -> EndpointMetrics:
+        name = endpoint_name or UNKNOWN_ENDPOINT
+        metrics = self._endpoints.get(name)
+        if metrics is None:
+            metrics = self._endpoints[name] = EndpointMetrics(self.latency_buckets, self.cpu_buckets)
+        return metrics
+
+    def record_request(self, endpoint_name: Optional[str], latency: float, status_code: Optional[int], response_bytes: int = 0, retries: int = 0, wire_bytes: Optional[int] = None) -> None:
+        """
+        Records one request, including any retries made while sending it.
+
+        Args:
+            endpoint_name: The endpoint name, or None for unknown paths.
+            latency: Seconds from sending to the final response, retries and backoff included.
+            status_code: The final HTTP status, or None if no response was received.
+            response_bytes: The size of the response body, after decompression.
+            retries: The number of attempts made after the first one.
+            wire_bytes: The size of the body as received, before decompression. Defaults to `response_bytes`.
+        """
+        status_class = f'{status_code // 100}xx' if status_code is not None else 'error'
+        with self._lock:
+            metrics = self._endpoint(endpoint_name)
+            metrics.statuses[status_class] += 1
+            metrics.latency.observe(latency)
+            metrics.response_bytes += response_bytes
+            metrics.wire_bytes += response_bytes if wire_bytes is None else wire_bytes
+            metrics.retries += retries
+
+    def record_cache(self, endpoint_name: Optional[str], hit: bool) -> None:
+        with self._lock:
+            metrics = self._endpoint(endpoint_name)
+            if hit:
+                metrics.cache_hits += 1
+            else:
+                metrics.cache_misses += 1
+
+    def record_decode(self, endpoint_name: Optional[str], seconds: float) -> None:
+        with self._lock:
+            self._endpoint(endpoint_name).decode.observe(seconds)
+
+    def record_token_parse(self, endpoint_name: Optional[str], seconds: float) -> None:
+        with self._lock:
+            self._endpoint(endpoint_name).token_parse.observe(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns a point-in-time copy of every endpoint's metrics.
+
+        Returns:
+            A dict keyed by endpoint name. Each value holds `requests`, `statuses` (counts
+            by class, e.g. '2xx', or 'error' for failures without a response),
+            `response_bytes` (decompressed), `wire_bytes` (as received), `retries`, `cache_hits`, `cache_misses`, and `latency`,
+            `decode` and `token_parse` histogram summaries (count, sum, mean,
+            estimated p50/p95/p99 and cumulative bucket counts).
+        """
+        with self._lock:
+            return {name: metrics.snapshot() for name, metrics in sorted(self._endpoints.items())}
+
+    def reset(self) -> None:
+        """Clears every metric."""
+        with self._lock:
+            self._endpoints.clear()
+
+    def to_prometheus(self, prefix: str = 'nepse_scraper') -> str:
+        """Renders every metric in the Prometheus text exposition format."""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines: List[str] = []
+
+            def family(name: str, kind: str, help_text: str) -> str:
+                full_name = f'{prefix}_{name}'
+                lines.append(f'# HELP {full_name} {help_text}')
+                lines.append(f'# TYPE {full_name} {kind}')
+                return full_name
+
+            name = family('requests_total', 'counter', 'Requests sent to NEPSE, by endpoint and status class.')
+            for endpoint, metrics in endpoints:
+                for status_class, count in sorted(metrics.statuses.items()):
+                    lines.append(f'{name}{{endpoint="{endpoint}",status="{status_class}"}} {count}')
+
+            for metric, help_text in (
+                ('response_bytes_total', 'Response body bytes, after decompression.'),
+                ('wire_bytes_total', 'Response body bytes received on the wire, before decompression.'),
+                ('retries_total', 'Attempts repeated after a server error.'),
+                ('cache_hits_total', 'Requests answered from the response cache.'),
+                ('cache_misses_total', 'Cacheable requests that had to be sent.'),
+            ):
+                name = family(metric, 'counter', help_text)
+                attribute = metric[:-len('_total')]
+                for endpoint, metrics in endpoints:
+                    lines.append(f'{name}{{endpoint="{endpoint}"}} {getattr(metrics, attribute)}')
+
+            for metric, attribute, help_text in (
+                ('request_duration_seconds', 'latency', 'Request latency, retries included.'),
+                ('json_decode_seconds', 'decode', 'Time spent decoding JSON response bodies.'),
+                ('token_parse_seconds', 'token_parse', 'Time spent parsing access tokens.'),
+            ):
+                name = family(metric, 'histogram', help_text)
+                for endpoint, metrics in endpoints:
+                    histogram = getattr(metrics, attribute)
+                    if histogram.count == 0:
+                        continue
+                    for bound, total in histogram.cumulative():
+                        lines.append(f'{name}_bucket{{endpoint="{endpoint}",le="{_format_bound(bound)}"}} {total}')
+                    lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {histogram.sum}')
+                    lines.append(f'{name}_count{{endpoint="{endpoint}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(bound)
@@ -0,0 +1,268 @@
+# nepse_scraper/models.py
+import functools
+from datetime import date, datetime
+from typing import Any, Callable, ClassVar, Dict, Iterable, List, Optional, Tuple, Union
+
+Converter = Callable[[Any], Any]
+# A JSON key, or a path of keys into nested objects.
+FieldKey = Union[str, Tuple[str, ...]]
+
+
+def to_int(value: Any) -> Any:
+    """Converts numbers and numeric strings (some endpoints send ids as strings); other values are returned unchanged."""
+    if value is None or type(value) is int:
+        return value
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        try:
+            return int(float(value))
+        except (TypeError, ValueError):
+            return value
+
+
+def to_float(value: Any) -> Any:
+    if value is None or type(value) is float:
+        return value
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def to_date(value: Any) -> Any:
+    """Parses the date part of a "YYYY-MM-DD[...]" string; unparseable values are returned unchanged."""
+    return _parse_date(value) if isinstance(value, str) else value
+
+
+def to_datetime(value: Any) -> Any:
+    """Parses an ISO 8601 timestamp as sent by NEPSE; unparseable values are returned unchanged."""
+    return _parse_datetime(value) if isinstance(value, str) else value
+
+
+# Rows of one response share their dates, so converted values are cached and shared between records.
+@functools.lru_cache(maxsize=4096)
+def _parse_date(value: str) -> Any:
+    try:
+        return date.fromisoformat(value[:10])
+    except ValueError:
+        return value
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_datetime(value: str) -> Any:
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+    # Python < 3.11 only accepts 3 or 6 fractional digits; NEPSE sometimes sends 1 or 2.
+    head, dot, fraction = value.partition('.')
+    try:
+        return datetime.fromisoformat(f'{head}.{fraction[:6]:0<6}' if dot and fraction.isdigit() else head)
+    except ValueError:
+        return value
+
+
+def as_is(value: Any) -> Any:
+    return value
+
+
+class _LazyField:
+    """Converts a record's raw value on first access and stores the converted value in its slot."""
+    __slots__ = ('name', 'bit', 'slot', 'convert')
+
+    def __init__(self, name: str, index: int, slot: Any, convert: Converter) -> None:
+        self.name = name
+        self.bit = 1 << index
+        self.slot = slot
+        self.convert = convert
+
+    def __get__(self, record: Optional["Record"], owner: type) -> Any:
+        if record is None:
+            return self
+        if record._decoded & self.bit:
+            return self.slot.__get__(record, owner)
+        value = self.convert(self.slot.__get__(record, owner))
+        self.slot.__set__(record, value)
+        record._decoded |= self.bit
+        return value
+
+    def __set__(self, record: "Record", value: Any) -> None:
+        raise AttributeError(f"{type(record).__name__}.{self.name} is read-only")
+
+
+class _RecordMeta(type):
+    """Gives each `Record` subclass one slot per field, lazy field descriptors and a generated `from_dict`."""
+    def __new__(mcls, name: str, bases: Tuple[type, ...], namespace: Dict[str, Any], **kwargs: Any) -> type:
+        fields = namespace.get('FIELDS')
+        if fields is None:
+            return super().__new__(mcls, name, bases, namespace, **kwargs)
+        namespace['__slots__'] = tuple(f'_{field}' for field, _, _ in fields)
+        cls = super().__new__(mcls, name, bases, namespace, **kwargs)
+        for index, (field, _, convert) in enumerate(fields):
+            setattr(cls, field, _LazyField(field, index, cls.__dict__[f'_{field}'], convert))
+
+        # Generated like namedtuple's methods: one straight-line function is much
+        # faster than looping over the fields for every row.
+        lines = ['def from_dict(cls, row):', '    record = new(cls)', '    get = row.get', '    record._decoded = 0']
+        for field, key, _ in fields:
+            lines.append(f'    record._{field} = ' + (f'get({key!r})' if isinstance(key, str) else f'lookup(row, {key!r})'))
+        lines.append('    return record')
+        scope = {'new': object.__new__, 'lookup': _lookup}
+        exec('\n'.join(lines), scope)
+        from_dict = scope['from_dict']
+        from_dict.__doc__ = "Builds a record from one decoded JSON object."
+        cls.from_dict = classmethod(from_dict)
+        cls._names = tuple(field for field, _, _ in fields)
+        return cls
+
+
+class Record(metaclass=_RecordMeta):
+    """
+    A compact, read-only view of one NEPSE row.
+
+    Subclasses list their fields in `FIELDS` as `(attribute, json_key,
+    converter)` triples, where `json_key` may be a tuple of keys into nested
+    objects. A record stores the raw value of each field in its own slot
+    instead of a dict holding every key, and converts the value to its Python
+    type (int, float, date, datetime) the first time it is read. Keys not
+    listed in `FIELDS` are dropped.
+    """
+    __slots__ = ('_decoded',)
+    _names: ClassVar[Tuple[str, ...]] = ()
+
+    @classmethod
+    def from_dict(cls, row: Dict[str, Any]) -> "Record":
+        raise TypeError(f"{cls.__name__} declares no FIELDS")
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> List["Record"]:
+        """Builds one record per decoded JSON object."""
+        from_dict = cls.from_dict
+        return [from_dict(row) for row in rows]
+
+    @classmethod
+    def fields(cls) -> Tuple[str, ...]:
+        return cls._names
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns every field, converted, keyed by attribute name."""
+        return {name: getattr(self, name) for name in self._names}
+
+    def __eq__(self, other: Any) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        shown = ', '.join(f'{name}={getattr(self, name)!r}' for name in self._names[:4])
+        return f'{type(self).__name__}({shown}, ...)'
+
+    def __getstate__(self) -> Tuple[Tuple[Any, ...], int]:
+        return tuple(getattr(self, f'_{name}') for name in self._names), self._decoded
+
+    def __setstate__(self, state: Tuple[Tuple[Any, ...], int]) -> None:
+        values, self._decoded = state
+        for name, value in zip(self._names, values):
+            setattr(self, f'_{name}', value)
+
+
+def _lookup(row: Dict[str, Any], key: FieldKey) -> Any:
+    if isinstance(key, str):
+        return row.get(key)
+    value: Any = row
+    for part in key:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+class TodayPrice(Record):
+    """A row of `get_today_price()`: one security's trading summary for a business day."""
+    FIELDS = (
+        ('id', 'id', to_int),
+        ('business_date', 'businessDate', to_date),
+        ('security_id', 'securityId', to_int),
+        ('symbol', 'symbol', as_is),
+        ('security_name', 'securityName', as_is),
+        ('open_price', 'openPrice', to_float),
+        ('high_price', 'highPrice', to_float),
+        ('low_price', 'lowPrice', to_float),
+        ('close_price', 'closePrice', to_float),
+        ('total_traded_quantity', 'totalTradedQuantity', to_int),
+        ('total_traded_value', 'totalTradedValue', to_float),
+        ('previous_day_close_price', 'previousDayClosePrice', to_float),
+        ('fifty_two_week_high', 'fiftyTwoWeekHigh', to_float),
+        ('fifty_two_week_low', 'fiftyTwoWeekLow', to_float),
+        ('last_updated_time', 'lastUpdatedTime', to_datetime),
+        ('total_trades', 'totalTrades', to_int),
+        ('average_traded_price', 'averageTradedPrice', to_float),
+        ('market_capitalization', 'marketCapitalization', to_float),
+    )
+
+
+class LiveTrade(Record):
+    """A row of `get_live_trades()`: one security's trading so far in the current session."""
+    FIELDS = (
+        ('security_id', 'securityId', to_int),
+        ('symbol', 'symbol', as_is),
+        ('security_name', 'securityName', as_is),
+        ('open_price', 'openPrice', to_float),
+        ('high_price', 'highPrice', to_float),
+        ('low_price', 'lowPrice', to_float),
+        ('last_traded_price', 'lastTradedPrice', to_float),
+        ('last_traded_volume', 'lastTradedVolume', to_int),
+        ('total_trade_quantity', 'totalTradeQuantity', to_int),
+        ('total_trade_value', 'totalTradeValue', to_float),
+        ('percentage_change', 'percentageChange', to_float),
+        ('previous_close', 'previousClose', to_float),
+        ('average_traded_price', 'averageTradedPrice', to_float),
+        ('last_updated', 'lastUpdatedDateTime', to_datetime),
+    )
+
+
+class TickerInfo(Record):
+    """
+    The result of `get_ticker_info()` for one security.
+
+    Security details are flattened from the nested `security` object;
+    `daily` is the latest `securityDailyTradeDto` as a `TodayPrice`.
+    """
+    FIELDS = (
+        ('security_id', ('security', 'id'), to_int),
+        ('symbol', ('security', 'symbol'), as_is),
+        ('security_name', ('security', 'securityName'), as_is),
+        ('active_status', ('security', 'activeStatus'), as_is),
+        ('listing_date', ('security', 'listingDate'), to_date),
+        ('face_value', ('security', 'faceValue'), to_float),
+        ('stock_listed_shares', 'stockListedShares', to_int),
+        ('paid_up_capital', 'paidUpCapital', to_float),
+        ('market_capitalization', 'marketCapitalization', to_float),
+        ('public_shares', 'publicShares', to_int),
+        ('public_percentage', 'publicPercentage', to_float),
+        ('promoter_shares', 'promoterShares', to_int),
+        ('promoter_percentage', 'promoterPercentage', to_float),
+        ('updated_date', 'updatedDate', to_date),
+        ('daily', 'securityDailyTradeDto', lambda row: TodayPrice.from_dict(row) if row else None),
+    )
+
+
+class SectorIndex(Record):
+    """A row of `get_sector_indices()`: the latest value of one NEPSE or sub-index."""
+    FIELDS = (
+        ('id', 'id', to_int),
+        ('index', 'index', as_is),
+        ('close', 'close', to_float),
+        ('high', 'high', to_float),
+        ('low', 'low', to_float),
+        ('previous_close', 'previousClose', to_float),
+        ('change', 'change', to_float),
+        ('percentage_change', 'perChange', to_float),
+        ('current_value', 'currentValue', to_float),
+        ('fifty_two_week_high', 'fiftyTwoWeekHigh', to_float),
+        ('fifty_two_week_low', 'fiftyTwoWeekLow', to_float),
+        ('generated_time', 'generatedTime', to_datetime),
+    )
@@ -0,0 +1,164 @@
+# nepse_scraper/pagination.py
+import asyncio
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Optional
+
+from .batch import DEFAULT_MAX_WORKERS
+
+logger = logging.getLogger(__name__)
+
+# NEPSE serves paged endpoints as Spring `Page` objects:
+#   {"content": [...], "totalPages": 3, "totalElements": 1234, "number": 0, "size": 500, ...}
+# Some of them return a bare list instead, which is treated as a single page.
+PageFetcher = Callable[[int], Any]
+AsyncPageFetcher = Callable[[int], Awaitable[Any]]
+
+
+def page_rows(data: Any) -> List[Dict[str, Any]]:
+    """Returns the rows of a single page response."""
+    if isinstance(data, dict):
+        return data.get('content') or []
+    if isinstance(data, list):
+        return data
+    return []
+
+
+def total_pages(data: Any) -> int:
+    """Returns the number of pages advertised by a page response (1 for unpaged responses)."""
+    if isinstance(data, dict):
+        return int(data.get('totalPages') or 1)
+    return 1
+
+
+def page_workers(max_workers: Optional[int], concurrent_fetches: int) -> int:
+    """
+    Splits a concurrency budget between `concurrent_fetches` paged fetches running at once.
+
+    A batch runs up to `max_workers` fetches together; each gets an equal share
+    of the budget for its pages (at least 1, i.e. pages fetched one by one), so
+    the requests in flight stay within `max_workers` instead of its square.
+    """
+    budget = max_workers or DEFAULT_MAX_WORKERS
+    return max(1, budget // max(1, min(budget, concurrent_fetches)))
+
+
+def _merge_pages(first: Any, rest: List[Any]) -> Any:
+    """Folds the rows of every page into the envelope of the first one."""
+    if not isinstance(first, dict) or 'content' not in first:
+        return first
+    merged = dict(first)
+    merged['content'] = list(page_rows(first))
+    for data in rest:
+        merged['content'].extend(page_rows(data))
+    merged['totalPages'] = 1
+    merged['number'] = 0
+    merged['size'] = len(merged['content'])
+    expected = first.get('totalElements')
+    if expected is not None and expected != len(merged['content']):
+        logger.warning(f"Expected {expected} rows across pages but received {len(merged['content'])}.")
+    return merged
+
+
+def iter_pages(fetch_page: PageFetcher, prefetch: int = 0) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yields the rows of every page, one page at a time.
+
+    The page count is read from the first response. With `prefetch > 0`, up to
+    that many following pages are requested in the background while the
+    current one is consumed, so at most `prefetch + 1` pages are held in memory.
+    """
+    first = fetch_page(0)
+    pages = total_pages(first)
+    logger.debug(f"Iterating over {pages} page(s).")
+    yield page_rows(first)
+    del first
+    if pages <= 1:
+        return
+
+    if prefetch <= 0:
+        for page in range(1, pages):
+            yield page_rows(fetch_page(page))
+        return
+
+    with ThreadPoolExecutor(max_workers=prefetch) as executor:
+        pending = deque()
+        next_page = 1
+        while next_page < pages or pending:
+            while next_page < pages and len(pending) < prefetch:
+                pending.append(executor.submit(fetch_page, next_page))
+                next_page += 1
+            yield page_rows(pending.popleft().result())
+
+
+def iter_rows(fetch_page: PageFetcher, prefetch: int = 0) -> Iterator[Dict[str, Any]]:
+    """Yields every row across all pages."""
+    for rows in iter_pages(fetch_page, prefetch=prefetch):
+        yield from rows
+
+
+def collect_pages(fetch_page: PageFetcher, max_workers: Optional[int] = None) -> Any:
+    """
+    Fetches every page and returns the first response with all rows merged into its `content`.
+
+    The first page is fetched to learn `totalPages`; the remaining pages are
+    then fetched concurrently on up to `max_workers` threads (in this thread
+    when `max_workers` is 1).
+    """
+    first = fetch_page(0)
+    pages = total_pages(first)
+    if pages <= 1:
+        return first
+
+    workers = min(max_workers or DEFAULT_MAX_WORKERS, pages - 1)
+    if workers == 1:
+        return _merge_pages(first, [fetch_page(page) for page in range(1, pages)])
+    logger.debug(f"Fetching {pages - 1} remaining page(s) concurrently.")
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        rest = list(executor.map(fetch_page, range(1, pages)))
+    return _merge_pages(first, rest)
+
+
+async def aiter_pages(fetch_page: AsyncPageFetcher, prefetch: int = 0) -> AsyncIterator[List[Dict[str, Any]]]:
+    """The asyncio counterpart of `iter_pages`."""
+    first = await fetch_page(0)
+    pages = total_pages(first)
+    yield page_rows(first)
+    del first
+
+    pending = deque()
+    next_page = 1
+    try:
+        while next_page < pages or pending:
+            while next_page < pages and len(pending) < max(prefetch, 1):
+                pending.append(asyncio.ensure_future(fetch_page(next_page)))
+                next_page += 1
+            yield page_rows(await pending.popleft())
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def aiter_rows(fetch_page: AsyncPageFetcher, prefetch: int = 0) -> AsyncIterator[Dict[str, Any]]:
+    """The asyncio counterpart of `iter_rows`."""
+    async for rows in aiter_pages(fetch_page, prefetch=prefetch):
+        for row in rows:
+            yield row
+
+
+async def collect_pages_async(fetch_page: AsyncPageFetcher, max_workers: Optional[int] = None) -> Any:
+    """The asyncio counterpart of `collect_pages`."""
+    first = await fetch_page(0)
+    pages = total_pages(first)
+    if pages <= 1:
+        return first
+
+    semaphore = asyncio.Semaphore(max_workers or DEFAULT_MAX_WORKERS)
+
+    async def bounded(page: int) -> Any:
+        async with semaphore:
+            return await fetch_page(page)
+
+    rest = await asyncio.gather(*(bounded(page) for page in range(1, pages)))
+    return _merge_pages(first, list(rest))
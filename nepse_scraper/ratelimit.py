@@ -0,0 +1,223 @@
+# nepse_scraper/ratelimit.py
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Responses that signal the server is overloaded or throttling us.
+CONGESTION_STATUSES = frozenset((429, 500, 502, 503, 504))
+
+# Latencies below this are never treated as congestion, whatever the baseline.
+MIN_LATENCY_SIGNAL = 0.1
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket allowing `rate` requests per second with bursts of up to `burst`.
+
+    Tokens are reserved up front: a caller that finds the bucket empty is told
+    how long to wait for its token, and the next caller queues behind it.
+    """
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.capacity = burst if burst is not None else max(1.0, rate)
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Takes `tokens` from the bucket and returns the seconds to wait before using them."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Blocks until `tokens` are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RateLimiter:
+    """
+    A global token bucket plus optional per-endpoint buckets.
+
+    Args:
+        rate: Requests per second across all endpoints. None for no global limit.
+        burst: The global bucket size. Defaults to one second's worth of requests.
+        endpoint_rates: Requests per second for individual endpoints, keyed by endpoint name.
+    """
+    def __init__(self, rate: Optional[float] = None, burst: Optional[float] = None, endpoint_rates: Optional[Dict[str, float]] = None) -> None:
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.endpoint_buckets = {name: TokenBucket(endpoint_rate) for name, endpoint_rate in (endpoint_rates or {}).items()}
+
+    def reserve(self, endpoint_name: Optional[str] = None) -> float:
+        """Reserves a request slot and returns the seconds to wait before sending."""
+        delay = self.bucket.reserve() if self.bucket else 0.0
+        endpoint_bucket = self.endpoint_buckets.get(endpoint_name) if endpoint_name else None
+        if endpoint_bucket is not None:
+            delay = max(delay, endpoint_bucket.reserve())
+        return delay
+
+    def acquire(self, endpoint_name: Optional[str] = None) -> None:
+        """Blocks until a request to `endpoint_name` may be sent."""
+        delay = self.reserve(endpoint_name)
+        if delay > 0:
+            logger.debug(f"Rate limit: waiting {delay:.3f}s before calling {endpoint_name or 'NEPSE'}.")
+            time.sleep(delay)
+
+    async def acquire_async(self, endpoint_name: Optional[str] = None) -> None:
+        """The asyncio counterpart of `acquire`."""
+        delay = self.reserve(endpoint_name)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+def make_rate_limiter(rate_limit: Union[float, RateLimiter, None], endpoint_rate_limits: Optional[Dict[str, float]] = None) -> Optional[RateLimiter]:
+    """Builds the session's `RateLimiter` from its constructor arguments, or returns None if no limit is set."""
+    if isinstance(rate_limit, RateLimiter):
+        return rate_limit
+    if rate_limit or endpoint_rate_limits:
+        return RateLimiter(rate_limit, endpoint_rates=endpoint_rate_limits)
+    return None
+
+
+class AdaptiveConcurrency:
+    """
+    Limits in-flight requests with an AIMD (additive increase, multiplicative decrease) controller.
+
+    Every successful, fast response grows the limit by `1 / limit`, i.e. by
+    about one per round of requests. A 429 or 5xx response, or a latency above
+    `latency_tolerance` times the recent best, multiplies the limit by
+    `backoff_ratio`. Only requests started after the previous decrease can
+    trigger another one, so a single burst of errors cuts the limit once.
+
+    Args:
+        initial_limit: The starting number of concurrent requests.
+        min_limit: The lowest the limit can go.
+        max_limit: The highest the limit can go.
+        backoff_ratio: The factor applied to the limit on congestion.
+        latency_tolerance: How many times the baseline latency counts as congestion.
+    """
+    def __init__(
+        self,
+        initial_limit: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self._clock = clock
+
+        self.in_flight = 0
+        self.baseline_latency: Optional[float] = None
+        self._last_decrease = float('-inf')
+        self._cond = threading.Condition()
+        self._async_waiters: Deque[_AsyncWaiter] = deque()
+
+    def _has_room(self) -> bool:
+        return self.in_flight < max(int(self.limit), self.min_limit)
+
+    def acquire(self) -> float:
+        """Blocks until a request may start; returns the start time to pass to `release`."""
+        with self._cond:
+            while not self._has_room():
+                self._cond.wait()
+            self.in_flight += 1
+        return self._clock()
+
+    async def acquire_async(self) -> float:
+        """The asyncio counterpart of `acquire`."""
+        with self._cond:
+            if self._has_room():
+                self.in_flight += 1
+                return self._clock()
+            waiter = _AsyncWaiter(asyncio.get_running_loop().create_future())
+            self._async_waiters.append(waiter)
+        try:
+            await waiter.future  # `release` hands its slot over before resolving the waiter.
+        except asyncio.CancelledError:
+            with self._cond:
+                # A cancelled waiter may be skipped by `release` before this runs, so only
+                # give back a slot that was actually handed over.
+                if waiter.granted:
+                    self._release_slot()
+                elif waiter in self._async_waiters:
+                    self._async_waiters.remove(waiter)
+            raise
+        return self._clock()
+
+    def release(self, started_at: float, status_code: Optional[int] = None, congested: bool = False) -> None:
+        """
+        Ends a request and feeds its outcome to the controller.
+
+        Args:
+            started_at: The value returned by `acquire`.
+            status_code: The final HTTP status, or None if the request failed without a response.
+            congested: True if the request saw a throttling or server error along the way (e.g. a retried 503).
+        """
+        now = self._clock()
+        with self._cond:
+            latency = now - started_at
+            if congested or status_code in CONGESTION_STATUSES or self._is_slow(latency):
+                if started_at > self._last_decrease:
+                    self._last_decrease = now
+                    self.limit = max(float(self.min_limit), self.limit * self.backoff_ratio)
+                    logger.debug(f"Congestion (status {status_code}, {latency:.3f}s): concurrency limit cut to {self.limit:.1f}")
+            elif status_code is not None and status_code < 400:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self._update_baseline(latency, status_code)
+            self._release_slot()
+
+    def _release_slot(self) -> None:
+        self.in_flight -= 1
+        while self._async_waiters and self._has_room():
+            waiter = self._async_waiters.popleft()
+            if not waiter.future.done():
+                waiter.granted = True
+                self.in_flight += 1
+                waiter.future.get_loop().call_soon_threadsafe(_resolve, waiter.future)
+        self._cond.notify_all()
+
+    def _is_slow(self, latency: float) -> bool:
+        baseline = self.baseline_latency
+        return baseline is not None and latency > MIN_LATENCY_SIGNAL and latency > baseline * self.latency_tolerance
+
+    def _update_baseline(self, latency: float, status_code: Optional[int]) -> None:
+        if status_code is None or status_code >= 400:
+            return
+        if self.baseline_latency is None or latency < self.baseline_latency:
+            self.baseline_latency = latency
+        else:
+            # Drift slowly upwards so a persistently slower server becomes the new normal.
+            self.baseline_latency += (latency - self.baseline_latency) * 0.01
+
+
+class _AsyncWaiter:
+    """An `acquire_async` call waiting for a slot; `granted` is set once `release` hands it one."""
+    __slots__ = ('future', 'granted')
+
+    def __init__(self, future: asyncio.Future) -> None:
+        self.future = future
+        self.granted = False
+
+
+def _resolve(waiter: asyncio.Future) -> None:
+    if not waiter.done():
+        waiter.set_result(None)
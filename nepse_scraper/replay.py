@@ -0,0 +1,334 @@
+# nepse_scraper/replay.py
+import asyncio
+import base64
+import gzip
+import io
+import json
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from datetime import datetime
+from http import HTTPStatus
+from pathlib import Path
+from typing import IO, Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from .exceptions import NepseScraperException
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_FORMAT = 'nepse-scraper-replay'
+ARCHIVE_VERSION = 1
+# Only headers that describe the body are kept; auth and cookies never reach the archive.
+RECORDED_HEADERS = ('Content-Type',)
+
+PathLike = Union[str, Path]
+RequestKey = Tuple[str, str, Tuple[Tuple[str, str], ...], str]
+
+
+class ReplayMissError(NepseScraperException, LookupError):
+    """Raised when a replayed session sends a request that the archive has no response for."""
+    pass
+
+
+@dataclass
+class Exchange:
+    """One recorded request and its response."""
+    offset: float
+    method: str
+    path: str
+    query: List[Tuple[str, str]]
+    payload: Any
+    status_code: int
+    headers: Dict[str, str]
+    content: bytes
+    elapsed: float
+
+    @property
+    def key(self) -> RequestKey:
+        return request_key(self.method, self.path, self.query, self.payload)
+
+    def to_json(self) -> Dict[str, Any]:
+        data = {
+            't': round(self.offset, 6), 'method': self.method, 'path': self.path, 'query': self.query,
+            'payload': self.payload, 'status': self.status_code, 'headers': self.headers,
+            'elapsed': round(self.elapsed, 6),
+        }
+        try:
+            data['body'] = self.content.decode('utf-8')
+        except UnicodeDecodeError:
+            data['body_b64'] = base64.b64encode(self.content).decode('ascii')
+        return data
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "Exchange":
+        content = base64.b64decode(data['body_b64']) if 'body_b64' in data else data['body'].encode('utf-8')
+        return cls(
+            data['t'], data['method'], data['path'], [tuple(pair) for pair in data['query']], data['payload'],
+            data['status'], data['headers'], content, data['elapsed'],
+        )
+
+
+def request_key(method: str, path: str, query: List[Tuple[str, str]], payload: Any) -> RequestKey:
+    """
+    The key a request is matched by on replay.
+
+    The host is ignored, so an archive replays against any `base_url`. A POST
+    body of the form `{'id': N}` matches whatever `N` is: payload ids are
+    derived from the day and the token salts, so a replay on another day
+    computes different ones for the same request.
+    """
+    if isinstance(payload, dict) and set(payload) == {'id'}:
+        payload = {'id': '*'}
+    payload_key = json.dumps(payload, sort_keys=True, separators=(',', ':')) if payload is not None else ''
+    return method.upper(), path.rstrip('/') or '/', tuple(sorted(query)), payload_key
+
+
+def _parse_body(body: Any) -> Any:
+    if not body:
+        return None
+    try:
+        return json.loads(body)
+    except (TypeError, ValueError):
+        return body.decode('utf-8', 'replace') if isinstance(body, bytes) else body
+
+
+def _open_archive(path: Path, mode: str) -> IO[str]:
+    if mode == 'r':
+        with open(path, 'rb') as f:
+            compressed = f.read(2) == b'\x1f\x8b'
+    else:
+        compressed = path.suffix == '.gz'
+    if compressed:
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class Recorder:
+    """
+    Writes every request a session sends, and its response, to an archive.
+
+    The archive is a JSON Lines file, gzip-compressed when the path ends in
+    `.gz`. Each line holds the method, path, query parameters, JSON payload,
+    status, body, response time and the offset since recording started.
+    Authorization headers are not recorded. A `Recorder` is thread-safe;
+    close it (or use it as a context manager) to flush the archive, which
+    also happens when it is garbage collected or at interpreter exit.
+
+    Args:
+        path: The archive file to create. An existing file is overwritten.
+    """
+    def __init__(self, path: PathLike) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.count = 0
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._file: Optional[IO[str]] = _open_archive(self.path, 'w')
+        self._write({'format': ARCHIVE_FORMAT, 'version': ARCHIVE_VERSION, 'recorded_at': datetime.now().isoformat(timespec='seconds')})
+        # Closes the archive at interpreter exit or when the recorder is garbage collected,
+        # without the exit hook keeping the recorder alive.
+        self._finalizer = weakref.finalize(self, self._file.close)
+
+    def _write(self, data: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(data, separators=(',', ':')) + '\n')
+
+    def record(self, method: str, url: str, body: Any, status_code: int, headers: Any, content: bytes, elapsed: float) -> None:
+        """Appends one exchange; `url` is the full request URL including its query string."""
+        parts = urlsplit(url)
+        exchange = Exchange(
+            time.monotonic() - self._started, method.upper(), parts.path, parse_qsl(parts.query, keep_blank_values=True),
+            _parse_body(body), status_code, {name: headers[name] for name in RECORDED_HEADERS if name in headers},
+            content, elapsed,
+        )
+        with self._lock:
+            if self._file is None:
+                logger.warning(f"Recorder for {self.path} is closed; dropping {method} {parts.path}.")
+                return
+            self._write(exchange.to_json())
+            self.count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._finalizer()
+                self._file = None
+                logger.info(f"Recorded {self.count} exchange(s) to {self.path}.")
+
+    def __enter__(self) -> "Recorder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class Replayer:
+    """
+    Serves responses from an archive written by `Recorder`, without any network access.
+
+    Requests are matched by method, path, query parameters and payload (see
+    `request_key`). Repeated requests, such as the polls of a trading day,
+    receive their recorded responses in order; once those run out the last
+    one is served again, or `ReplayMissError` is raised when `strict`. A
+    request that was never recorded always raises `ReplayMissError`.
+
+    Responses are served at CPU speed. `clock()` returns the recorded time
+    of the latest response: driven with `poll_once()` in a loop, a
+    `LiveMarketPoller(scraper, clock=replayer.clock)` then checks the market
+    status on the recording's timeline rather than the wall clock.
+
+    Args:
+        path: The archive to replay.
+        strict: Whether to raise instead of repeating the last response once a request's recordings run out.
+        latency_scale: Sleeps this multiple of each recorded response time; 1.0 reproduces the recorded pace.
+    """
+    def __init__(self, path: PathLike, strict: bool = False, latency_scale: float = 0.0) -> None:
+        self.path = Path(path)
+        self.strict = strict
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._exchanges: Dict[RequestKey, List[Exchange]] = {}
+        self._cursors: Dict[RequestKey, int] = {}
+        self._offset = 0.0
+        self.count = 0
+        with _open_archive(self.path, 'r') as f:
+            header = json.loads(f.readline() or '{}')
+            if header.get('format') != ARCHIVE_FORMAT:
+                raise ValueError(f"{self.path} is not a nepse_scraper replay archive.")
+            for line in f:
+                if line.strip():
+                    exchange = Exchange.from_json(json.loads(line))
+                    self._exchanges.setdefault(exchange.key, []).append(exchange)
+                    self.count += 1
+        logger.debug(f"Loaded {self.count} exchange(s) from {self.path}.")
+
+    def clock(self) -> float:
+        """Seconds since the recording started, as of the latest response served."""
+        return self._offset
+
+    def rewind(self) -> None:
+        """Starts serving every request's recordings from the beginning again."""
+        with self._lock:
+            self._cursors.clear()
+            self._offset = 0.0
+
+    def lookup(self, method: str, url: str, body: Any = None) -> Exchange:
+        """Returns the next recorded exchange for a request."""
+        parts = urlsplit(url)
+        key = request_key(method, parts.path, parse_qsl(parts.query, keep_blank_values=True), _parse_body(body))
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                raise ReplayMissError(f"No recorded response for {method} {parts.path}{'?' + parts.query if parts.query else ''}.")
+            cursor = self._cursors.get(key, 0)
+            if cursor >= len(exchanges):
+                if self.strict:
+                    raise ReplayMissError(f"All {len(exchanges)} recorded response(s) for {method} {parts.path} were already served.")
+                cursor = len(exchanges) - 1
+            self._cursors[key] = cursor + 1
+            exchange = exchanges[cursor]
+            self._offset = max(self._offset, exchange.offset)
+        return exchange
+
+    def delay(self, exchange: Exchange) -> float:
+        return exchange.elapsed * self.latency_scale
+
+
+class RecordingAdapter(HTTPAdapter):
+    """An `HTTPAdapter` that records every final response (after urllib3 retries) with a `Recorder`."""
+    def __init__(self, recorder: Recorder, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.recorder = recorder
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        resp = super().send(request, **kwargs)
+        # Reads the body now; a streamed response then iterates over the buffered content.
+        self.recorder.record(request.method, request.url, request.body, resp.status_code, resp.headers, resp.content, resp.elapsed.total_seconds())
+        return resp
+
+
+class ReplayAdapter(BaseAdapter):
+    """A requests transport adapter answering every request from a `Replayer`."""
+    def __init__(self, replayer: Replayer) -> None:
+        super().__init__()
+        self.replayer = replayer
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs) -> requests.Response:
+        exchange = self.replayer.lookup(request.method, request.url, request.body)
+        delay = self.replayer.delay(exchange)
+        if delay:
+            time.sleep(delay)
+        resp = requests.Response()
+        resp.request = request
+        resp.url = request.url
+        resp.status_code = exchange.status_code
+        try:
+            resp.reason = HTTPStatus(exchange.status_code).phrase
+        except ValueError:
+            resp.reason = ''
+        resp.headers = CaseInsensitiveDict(exchange.headers)
+        resp.headers['Content-Length'] = str(len(exchange.content))
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        resp.raw = io.BytesIO(exchange.content)
+        resp.connection = self
+        return resp
+
+    def close(self) -> None:
+        pass
+
+
+def make_async_transport(recorder: Optional[Recorder] = None, replayer: Optional[Replayer] = None, inner: Any = None) -> Any:
+    """
+    Builds an `httpx.AsyncBaseTransport` that records through `inner` or replays from `replayer`.
+
+    Used by `AsyncNepseAPISession`; requires the optional `httpx` dependency.
+    """
+    import httpx
+
+    if replayer is not None:
+        class AsyncReplayTransport(httpx.AsyncBaseTransport):
+            async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+                exchange = replayer.lookup(request.method, str(request.url), request.content)
+                delay = replayer.delay(exchange)
+                if delay:
+                    await asyncio.sleep(delay)
+                return httpx.Response(exchange.status_code, headers=exchange.headers, content=exchange.content, request=request)
+
+        return AsyncReplayTransport()
+
+    class AsyncRecordingTransport(httpx.AsyncBaseTransport):
+        async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+            sent_at = time.perf_counter()
+            resp = await inner.handle_async_request(request)
+            content = await resp.aread()
+            await resp.aclose()
+            elapsed = time.perf_counter() - sent_at
+            recorder.record(request.method, str(request.url), request.content, resp.status_code, resp.headers, content, elapsed)
+            # The body is already decompressed, so the encoding and length headers no longer apply.
+            headers = [(name, value) for name, value in resp.headers.items() if name.lower() not in ('content-encoding', 'content-length', 'transfer-encoding')]
+            return httpx.Response(resp.status_code, headers=headers, content=content, request=request, extensions=resp.extensions)
+
+        async def aclose(self) -> None:
+            await inner.aclose()
+
+    return AsyncRecordingTransport()
+
+
+def make_recorder(record: Union[PathLike, Recorder, None]) -> Optional[Recorder]:
+    """Accepts a `Recorder`, an archive path, or None."""
+    if record is None or isinstance(record, Recorder):
+        return record
+    return Recorder(record)
+
+
+def make_replayer(replay: Union[PathLike, Replayer, None]) -> Optional[Replayer]:
+    """Accepts a `Replayer`, an archive path, or None."""
+    if replay is None or isinstance(replay, Replayer):
+        return replay
+    return Replayer(replay)
@@ -0,0 +1,119 @@
+# nepse_scraper/security_index.py
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from .utils import atomic_write_bytes, default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+INDEX_FORMAT_VERSION = 1
+DEFAULT_MAX_AGE = 24 * 60 * 60
+DEFAULT_MIN_REFRESH_INTERVAL = 5 * 60
+DEFAULT_NEGATIVE_TTL = 60 * 60
+
+
+class SecurityIndex:
+    """
+    The symbol-to-security-id map, persisted to disk between processes.
+
+    The index performs no network calls: clients feed it the `security_api`
+    listing through `update()` when `is_stale()` says so, or when `resolve()`
+    reports unknown symbols and `should_refresh()` allows another download.
+    Refreshes triggered by unknown symbols are rate-limited, and symbols that
+    are still unknown afterwards are remembered as invalid for a while so they
+    do not trigger a download on every lookup.
+
+    Args:
+        path: The JSON file holding the index. Defaults to `securities.json` in the package cache directory.
+        persist: If False, the index lives in memory only.
+        max_age: Seconds after which a saved index is downloaded again.
+        min_refresh_interval: Minimum seconds between refreshes triggered by unknown symbols.
+        negative_ttl: Seconds an unknown symbol is remembered as invalid.
+    """
+    def __init__(
+        self,
+        path: Optional[Union[str, Path]] = None,
+        persist: bool = True,
+        max_age: float = DEFAULT_MAX_AGE,
+        min_refresh_interval: float = DEFAULT_MIN_REFRESH_INTERVAL,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path: Optional[Path] = (Path(path) if path else default_cache_dir() / 'securities.json') if persist else None
+        self.max_age = max_age
+        self.min_refresh_interval = min_refresh_interval
+        self.negative_ttl = negative_ttl
+        self._clock = clock
+
+        self.symbols: Optional[Dict[str, int]] = None
+        self.fetched_at: Optional[float] = None
+        self._negative: Dict[str, float] = {}
+        self.lock = threading.RLock()
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get('version') != INDEX_FORMAT_VERSION:
+                logger.info(f"Ignoring security index with unsupported version: {self.path}")
+                return
+            self.symbols = {symbol: int(security_id) for symbol, security_id in data['symbols'].items()}
+            self.fetched_at = float(data['fetched_at'])
+            logger.debug(f"Loaded {len(self.symbols)} securities from {self.path}")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable security index {self.path}: {e}")
+
+    def _save(self) -> None:
+        if self.path is None:
+            return
+        data = {'version': INDEX_FORMAT_VERSION, 'fetched_at': self.fetched_at, 'symbols': self.symbols}
+        try:
+            atomic_write_bytes(self.path, json.dumps(data).encode('utf-8'))
+        except OSError as e:
+            logger.warning(f"Could not persist security index to {self.path}: {e}")
+
+    def is_stale(self) -> bool:
+        """True if the index has never been loaded or is older than `max_age`."""
+        return self.symbols is None or self._clock() - self.fetched_at >= self.max_age
+
+    def update(self, securities: Iterable[Dict[str, Any]]) -> None:
+        """Replaces the index with a fresh `security_api` listing and persists it."""
+        with self.lock:
+            self.symbols = {item.get('symbol'): item.get('id') for item in securities if item.get('symbol') and item.get('id')}
+            self.fetched_at = self._clock()
+            self._negative = {s: t for s, t in self._negative.items() if s not in self.symbols}
+            logger.info(f"Security index refreshed with {len(self.symbols)} securities.")
+            self._save()
+
+    def resolve(self, tickers: List[str]) -> Tuple[Dict[str, int], List[str]]:
+        """Splits tickers into a symbol-to-id map of known symbols and a sorted list of unknown ones."""
+        symbols = self.symbols or {}
+        resolved = {s: symbols[s] for s in tickers if symbols.get(s)}
+        missing = sorted(set(tickers).difference(resolved))
+        return resolved, missing
+
+    def should_refresh(self, missing: List[str]) -> bool:
+        """True if any unknown symbol is not known to be invalid and a refresh is not rate-limited."""
+        now = self._clock()
+        with self.lock:
+            unknown = [s for s in missing if self._negative.get(s, 0) <= now]
+            if not unknown:
+                return False
+            if self.fetched_at is not None and now - self.fetched_at < self.min_refresh_interval:
+                logger.debug(f"Security index refresh for {unknown} is rate-limited.")
+                return False
+            return True
+
+    def mark_missing(self, missing: List[str]) -> None:
+        """Remembers symbols that are still unknown after a refresh as invalid for `negative_ttl` seconds."""
+        now = self._clock()
+        with self.lock:
+            for symbol in missing:
+                if self._negative.get(symbol, 0) <= now:
+                    self._negative[symbol] = now + self.negative_ttl
@@ -0,0 +1,94 @@
+# nepse_scraper/singleflight.py
+import asyncio
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """One in-flight call and the outcome shared with everyone waiting on it."""
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesces identical concurrent calls so that only one of them does the work.
+
+    The first thread to call `do()` with a key runs the function; threads
+    arriving with the same key while it runs wait for it and receive the same
+    result, or the same exception. Nothing is remembered once the call returns,
+    so this never serves stale data: it only deduplicates work that overlaps in time.
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Runs `fn()`, or waits for the identical call already in flight under `key`."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            logger.debug(f"Joining in-flight request {key}")
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """The number of distinct calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    The asyncio counterpart of `SingleFlight`.
+
+    The shared call runs as its own task, so cancelling one of the callers
+    (even the first) does not cancel the request for the others.
+    """
+    def __init__(self) -> None:
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Awaits `fn()`, or the identical call already in flight under `key`."""
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            logger.debug(f"Joining in-flight request {key}")
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # Mark the error as retrieved even if every caller was cancelled.
+
+    def in_flight(self) -> int:
+        """The number of distinct calls currently running."""
+        return len(self._tasks)
@@ -0,0 +1,98 @@
+# nepse_scraper/token_manager.py
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .auth import TokenParser
+
+logger = logging.getLogger(__name__)
+
+# NEPSE access tokens are short-lived; treat them as stale well before the server does.
+DEFAULT_TOKEN_TTL = 45.0
+DEFAULT_REFRESH_MARGIN = 5.0
+
+
+class TokenManager:
+    """
+    Tracks the lifecycle of a NEPSE access token.
+
+    The manager performs no network calls itself: sessions feed it raw
+    `authenticate/prove` (or `refresh-token`) responses through `update()`
+    and ask `needs_refresh()` before each request. Tokens are parsed with
+    `TokenParser` only when a new response arrives; the parser (and the
+    WASM instance behind it) is created on the first such response.
+    """
+    def __init__(
+        self,
+        token_parser: Optional[TokenParser] = None,
+        token_ttl: float = DEFAULT_TOKEN_TTL,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._token_parser = token_parser
+        self.token_ttl = token_ttl
+        self.refresh_margin = refresh_margin
+        self._clock = clock
+
+        self.access_token: Optional[str] = None
+        self.refresh_token: Optional[str] = None
+        self.token_details: Optional[Dict[str, Any]] = None
+        self.issued_at: Optional[float] = None
+
+    @property
+    def token_parser(self) -> TokenParser:
+        if self._token_parser is None:
+            self._token_parser = TokenParser()
+        return self._token_parser
+
+    @property
+    def age(self) -> Optional[float]:
+        """Seconds since the current token was issued, or None if there is no token."""
+        if self.issued_at is None:
+            return None
+        return self._clock() - self.issued_at
+
+    def needs_refresh(self) -> bool:
+        """True if there is no token or it is within `refresh_margin` of expiring."""
+        if not self.access_token:
+            return True
+        # Never refresh earlier than half-way through the token's life, whatever the margin.
+        return self.age >= max(self.token_ttl - self.refresh_margin, self.token_ttl / 2)
+
+    def can_refresh(self) -> bool:
+        """True if a refresh token is available and the current token has not fully expired."""
+        return bool(self.refresh_token) and self.age is not None and self.age < self.token_ttl
+
+    def refresh_payload(self) -> Dict[str, str]:
+        """The JSON body for the refresh-token endpoint."""
+        return {'refreshToken': self.refresh_token}
+
+    def update(self, token_response: Dict[str, Any]) -> None:
+        """Parses a raw token response and records it as the current token."""
+        for i in range(1, 6): token_response[f'salt{i}'] = int(token_response[f'salt{i}'])
+        self.access_token, self.refresh_token = self.token_parser.parse_token_response(token_response)
+        self.token_details = token_response
+        self.issued_at = self._clock()
+        logger.debug("Token manager stored a new token.")
+
+    def adopt(self, access_token: str, refresh_token: Optional[str], token_details: Optional[Dict[str, Any]], age: float) -> None:
+        """Records a token parsed elsewhere, e.g. by another process, that was issued `age` seconds ago."""
+        self.access_token = access_token
+        self.refresh_token = refresh_token
+        self.token_details = token_details
+        self.issued_at = self._clock() - age
+
+    def invalidate(self, access_token: Optional[str] = None) -> None:
+        """
+        Forgets the current token, forcing a full re-authentication.
+
+        If `access_token` is given, the token is only dropped if it is still the
+        current one, so concurrent callers that saw the same rejected token
+        trigger a single re-authentication.
+        """
+        if access_token is not None and access_token != self.access_token:
+            return
+        logger.debug("Invalidating the current access token.")
+        self.access_token = None
+        self.refresh_token = None
+        self.issued_at = None
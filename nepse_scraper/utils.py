@@ -0,0 +1,39 @@
+# nepse_scraper/utils.py
+import os
+from pathlib import Path
+
+CACHE_DIR_ENV = 'NEPSE_SCRAPER_CACHE_DIR'
+
+
+def default_cache_dir() -> Path:
+    """
+    Returns the directory used for on-disk caches.
+
+    Resolved from `NEPSE_SCRAPER_CACHE_DIR`, then the platform's user cache
+    location (`%LOCALAPPDATA%` on Windows, `$XDG_CACHE_HOME` or `~/.cache`
+    elsewhere). The directory is not created here.
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override).expanduser()
+    if os.name == 'nt' and os.environ.get('LOCALAPPDATA'):
+        return Path(os.environ['LOCALAPPDATA']) / 'nepse_scraper' / 'Cache'
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join('~', '.cache')
+    return Path(base).expanduser() / 'nepse_scraper'
+
+
+def atomic_write_bytes(path: Path, data: bytes, mode: int = 0o666) -> None:
+    """
+    Writes `data` to `path` through a temporary file so readers never see a partial file.
+
+    `mode` sets the permissions of a newly written file (before the umask).
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with os.fdopen(os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), mode), 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
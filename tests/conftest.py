@@ -0,0 +1,27 @@
+# tests/conftest.py
+import pytest
+
+from benchmarks.fake_server import FakeNepseServer
+from nepse_scraper.security_index import SecurityIndex
+from nepse_scraper.utils import CACHE_DIR_ENV
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keeps every on-disk cache of a test in its own temporary directory."""
+    path = tmp_path / 'cache'
+    monkeypatch.setenv(CACHE_DIR_ENV, str(path))
+    return path
+
+
+@pytest.fixture
+def server():
+    """A local NEPSE stand-in; see `benchmarks.fake_server`."""
+    with FakeNepseServer() as fake:
+        yield fake
+
+
+@pytest.fixture
+def scraper_kwargs(server):
+    """Client arguments pointing at the fake server without touching the persisted security list."""
+    return {'base_url': server.url, 'security_index': SecurityIndex(persist=False)}
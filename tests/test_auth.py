@@ -0,0 +1,91 @@
+# tests/test_auth.py
+from datetime import date
+
+import pytest
+
+from nepse_scraper.auth import PayloadIdCache, PayloadParser
+
+TOKEN = {f'salt{i}': 100 * i for i in range(1, 6)}
+
+
+class CountingParser(PayloadParser):
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls = 0
+
+    def calculate_payload_id(self, *args, **kwargs) -> int:
+        self.calls += 1
+        return super().calculate_payload_id(*args, **kwargs)
+
+
+class FakeDay:
+    def __init__(self, today: date) -> None:
+        self.today = today
+
+    def __call__(self) -> date:
+        return self.today
+
+
+@pytest.fixture
+def day():
+    return FakeDay(date(2025, 3, 2))
+
+
+@pytest.fixture
+def parser():
+    return CountingParser()
+
+
+@pytest.fixture
+def cache(parser, day):
+    return PayloadIdCache(parser, clock=day)
+
+
+def test_payload_id_requires_the_market_open_id(cache):
+    with pytest.raises(ValueError):
+        cache.payload_id('stock-live', TOKEN)
+
+
+def test_payload_ids_are_computed_once_per_day_and_token(cache, parser):
+    cache.market_open_id = 7
+    stock = cache.payload_id('stock-live', TOKEN)
+    sector = cache.payload_id('sector-live', TOKEN)
+    calls = parser.calls
+    assert cache.payload_id('stock-live', TOKEN) == stock
+    assert cache.payload_id('sector-live', TOKEN) == sector
+    assert parser.calls == calls
+    assert stock == PayloadParser().calculate_payload_id(7, TOKEN, 'stock-live', today=2)
+
+
+def test_new_token_salts_recompute_payload_ids(cache, parser):
+    cache.market_open_id = 7
+    sector = cache.payload_id('sector-live', TOKEN)
+    calls = parser.calls
+    other = {**TOKEN, 'salt2': 999, 'salt4': 999}
+    assert cache.payload_id('sector-live', other) != sector
+    assert parser.calls > calls
+
+
+def test_new_market_open_id_recomputes_payload_ids(cache):
+    cache.market_open_id = 7
+    first = cache.payload_id('stock-live', TOKEN)
+    cache.market_open_id = 8
+    assert cache.payload_id('stock-live', TOKEN) != first
+
+
+def test_day_rollover_drops_everything(cache, day):
+    cache.market_open_id = 7
+    cache.payload_id('stock-live', TOKEN)
+    day.today = date(2025, 3, 3)
+    assert cache.market_open_id is None
+    with pytest.raises(ValueError):
+        cache.payload_id('stock-live', TOKEN)
+
+    cache.market_open_id = 7
+    assert cache.payload_id('stock-live', TOKEN) == PayloadParser().calculate_payload_id(7, TOKEN, 'stock-live', today=3)
+
+
+def test_clear(cache):
+    cache.market_open_id = 7
+    cache.clear()
+    assert cache.market_open_id is None
@@ -0,0 +1,115 @@
+# tests/test_credentials.py
+import asyncio
+import multiprocessing
+import threading
+from datetime import date
+
+import pytest
+
+from nepse_scraper import AsyncNepseScraper, NepseScraper
+from nepse_scraper.credentials import FileCredentialStore
+
+
+def _try_lock(path, results):
+    results.put(FileCredentialStore(path).acquire(blocking=False))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FileCredentialStore(tmp_path / 'credentials.json')
+
+
+def test_lock_is_reentrant_within_a_thread(store):
+    with store.lock():
+        assert store.acquire(blocking=False)
+        store.release()
+    assert store.acquire(blocking=False)
+    store.release()
+
+
+def test_lock_excludes_other_threads(store):
+    results = []
+    with store.lock():
+        thread = threading.Thread(target=lambda: results.append(store.acquire(blocking=False)))
+        thread.start()
+        thread.join(5)
+    assert results == [False]
+
+
+def test_lock_excludes_other_processes(store):
+    results = multiprocessing.get_context('spawn').Queue()
+    with store.lock():
+        process = multiprocessing.get_context('spawn').Process(target=_try_lock, args=(str(store.path), results))
+        process.start()
+        process.join(30)
+    assert results.get(timeout=5) is False
+
+    process = multiprocessing.get_context('spawn').Process(target=_try_lock, args=(str(store.path), results))
+    process.start()
+    process.join(30)
+    assert results.get(timeout=5) is True
+
+
+def test_market_open_id_is_kept_for_its_day_only(store):
+    store.save_market_open_id(date(2025, 3, 2), 42)
+    assert store.load_market_open_id(date(2025, 3, 2)) == 42
+    assert store.load_market_open_id(date(2025, 3, 3)) is None
+
+
+def test_unreadable_file_is_ignored(store):
+    store.path.write_text('{not json')
+    assert store.load().access_token is None
+
+
+def test_clients_sharing_a_store_authenticate_once(server, scraper_kwargs, store):
+    first = NepseScraper(credential_store=store, **scraper_kwargs)
+    second = NepseScraper(credential_store=store, **scraper_kwargs)
+    first.get_live_indices(58)
+    second.get_live_indices(58)
+    assert server.stats['authenticate_api'] == 1
+    assert server.stats['marketopen_api'] == 1
+    assert second.session.access_token == first.session.access_token
+
+
+def test_rejected_shared_token_is_replaced(server, scraper_kwargs, store):
+    client = NepseScraper(credential_store=store, **scraper_kwargs)
+    client.get_sectors()
+    rejected = client.session.access_token
+    server.fail_next(1, status=401)
+    client.get_market_summary()
+    assert server.stats['authenticate_api'] == 2
+    assert store.load().access_token == client.session.access_token != rejected
+
+
+class RecordingStore(FileCredentialStore):
+    def __init__(self, path) -> None:
+        super().__init__(path)
+        self.events = []
+
+    def load_token(self, token_manager):
+        self.events.append('load_token')
+        return super().load_token(token_manager)
+
+    def save_token(self, token_manager):
+        self.events.append('save_token')
+        super().save_token(token_manager)
+
+    def invalidate_token(self, access_token):
+        self.events.append('invalidate_token')
+        super().invalidate_token(access_token)
+
+
+def test_async_tasks_do_not_interleave_inside_the_store(tmp_path, server, scraper_kwargs):
+    server.latency = 0.2
+    store = RecordingStore(tmp_path / 'credentials.json')
+
+    async def main():
+        async with AsyncNepseScraper(credential_store=store, **scraper_kwargs) as client:
+            session = client.session
+            renew = asyncio.ensure_future(session._get_access_token())
+            await asyncio.sleep(0.05)  # `renew` now holds the store while it authenticates.
+            await session._invalidate_token('stale-token')
+            await renew
+
+    asyncio.run(main())
+    assert store.events == ['load_token', 'save_token', 'invalidate_token']
@@ -0,0 +1,73 @@
+# tests/test_decoding.py
+import json
+
+import pytest
+
+from nepse_scraper.decoding import JsonArrayParser, iter_json_array
+
+ROWS = [
+    {'symbol': 'NABIL', 'ltp': 512.5, 'change': -1.25e-1, 'note': 'a "quoted" ] and [ , }'},
+    {'symbol': 'ÑEPSE', 'ltp': 12, 'flags': [1, [2, 3]], 'none': None, 'ok': True},
+    -7,
+    'plain',
+    [],
+    {},
+]
+
+
+def chunked(data: bytes, size: int):
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize('size', [1, 2, 3, 7, 64, 1 << 20])
+def test_any_chunk_boundary_yields_the_same_rows(size):
+    data = json.dumps(ROWS, ensure_ascii=False).encode('utf-8')
+    assert list(iter_json_array(chunked(data, size))) == ROWS
+
+
+@pytest.mark.parametrize('size', [1, 2, 5])
+def test_array_under_key_of_a_page_envelope(size):
+    page = {'totalPages': 3, 'content': ROWS, 'meta': {'content': 'not this'}, 'number': 0}
+    data = json.dumps(page).encode('utf-8')
+    assert list(iter_json_array(chunked(data, size), key='content')) == ROWS
+
+
+def test_number_split_across_chunks_is_not_cut_short():
+    assert list(iter_json_array([b'[12', b'.5', b', 3', b'4]'])) == [12.5, 34]
+
+
+def test_elements_are_returned_as_soon_as_they_are_complete():
+    parser = JsonArrayParser()
+    assert parser.feed(b'[{"a": 1}, {"b"') == [{'a': 1}]
+    assert parser.feed(b': 2}') == [{'b': 2}]
+    assert parser.feed(b']') == []
+    assert parser.done
+    assert parser.close() == []
+
+
+@pytest.mark.parametrize('doc', [b'[]', b' [ ] ', b'{"content": []}'])
+def test_empty_arrays(doc):
+    assert list(iter_json_array([doc], key='content')) == []
+
+
+@pytest.mark.parametrize('doc', [b'[1,]', b'[1, ]', b'[{"a": 1},\n]', b'[1,,2]', b'[,1]', b'[1 2]'])
+@pytest.mark.parametrize('size', [1, 100])
+def test_malformed_arrays_are_rejected(doc, size):
+    with pytest.raises(ValueError):
+        list(iter_json_array(chunked(doc, size)))
+
+
+@pytest.mark.parametrize('doc', [b'[1, 2', b'[{"a": 1}', b''])
+def test_truncated_body_is_rejected(doc):
+    with pytest.raises(ValueError):
+        list(iter_json_array([doc]))
+
+
+def test_object_without_key_is_rejected():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"content": [1]}']))
+
+
+def test_missing_key_is_rejected():
+    with pytest.raises(ValueError):
+        list(iter_json_array([b'{"other": [1]}'], key='content'))
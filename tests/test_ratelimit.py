@@ -0,0 +1,159 @@
+# tests/test_ratelimit.py
+import asyncio
+
+import pytest
+
+from nepse_scraper.ratelimit import AdaptiveConcurrency, TokenBucket
+
+
+class FakeClock:
+    def __init__(self, now: float = 100.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket_reserves_ahead_of_refill():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+    clock.now += 1.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+
+def test_token_bucket_rejects_non_positive_rate():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+def test_additive_increase_on_fast_success():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrency(initial_limit=4, clock=clock)
+    started = limiter.acquire()
+    clock.now += 0.01
+    limiter.release(started, 200)
+    assert limiter.limit == pytest.approx(4.25)
+    assert limiter.in_flight == 0
+
+
+def test_increase_is_capped_at_max_limit():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrency(initial_limit=2, max_limit=2, clock=clock)
+    limiter.release(limiter.acquire(), 200)
+    assert limiter.limit == 2
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_congestion_status_halves_limit_once_per_burst(status):
+    clock = FakeClock()
+    limiter = AdaptiveConcurrency(initial_limit=8, clock=clock)
+    burst = [limiter.acquire() for _ in range(4)]
+    clock.now += 0.01
+    for started in burst:
+        limiter.release(started, status)
+    # Every request of the burst started before the first cut, so only one applies.
+    assert limiter.limit == 4
+
+    clock.now += 0.01
+    started = limiter.acquire()
+    clock.now += 0.01
+    limiter.release(started, status)
+    assert limiter.limit == 2
+
+
+def test_decrease_is_floored_at_min_limit():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrency(initial_limit=2, min_limit=2, clock=clock)
+    limiter.release(limiter.acquire(), 503)
+    assert limiter.limit == 2
+
+
+def test_latency_far_above_baseline_counts_as_congestion():
+    clock = FakeClock()
+    limiter = AdaptiveConcurrency(initial_limit=8, latency_tolerance=2.0, clock=clock)
+    started = limiter.acquire()
+    clock.now += 0.2
+    limiter.release(started, 200)
+    assert limiter.baseline_latency == pytest.approx(0.2)
+    limit = limiter.limit
+
+    started = limiter.acquire()
+    clock.now += 1.0
+    limiter.release(started, 200)
+    assert limiter.limit == pytest.approx(limit / 2)
+
+
+def test_transport_failure_with_congested_flag_cuts_limit():
+    limiter = AdaptiveConcurrency(initial_limit=8, clock=FakeClock())
+    limiter.release(limiter.acquire(), None, congested=True)
+    assert limiter.limit == 4
+
+
+def test_async_waiter_gets_the_released_slot():
+    async def main():
+        limiter = AdaptiveConcurrency(initial_limit=1, clock=FakeClock())
+        started = await limiter.acquire_async()
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        limiter.release(started, 200)
+        await asyncio.wait_for(waiter, 1)
+        assert limiter.in_flight == 1
+        limiter.release(waiter.result(), 200)
+        assert limiter.in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_without_a_slot_leaves_the_count_alone():
+    async def main():
+        limiter = AdaptiveConcurrency(initial_limit=1, clock=FakeClock())
+        started = await limiter.acquire_async()
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.in_flight == 1
+        limiter.release(started, 200)
+        assert limiter.in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_waiter_cancelled_before_a_release_is_skipped_by_it():
+    async def main():
+        limiter = AdaptiveConcurrency(initial_limit=1, clock=FakeClock())
+        started = await limiter.acquire_async()
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        # `release` runs between the cancellation and the waiter's cleanup.
+        waiter.cancel()
+        limiter.release(started, 200)
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.in_flight == 0
+
+    asyncio.run(main())
+
+
+def test_cancelled_waiter_gives_back_a_slot_handed_to_it():
+    async def main():
+        limiter = AdaptiveConcurrency(initial_limit=1, clock=FakeClock())
+        started = await limiter.acquire_async()
+        waiter = asyncio.ensure_future(limiter.acquire_async())
+        await asyncio.sleep(0)
+        # The slot is handed over, but the waiter is cancelled before it resumes.
+        limiter.release(started, 200)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.in_flight == 0
+        assert await asyncio.wait_for(limiter.acquire_async(), 1) is not None
+        assert limiter.in_flight == 1
+
+    asyncio.run(main())
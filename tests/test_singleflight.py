@@ -0,0 +1,111 @@
+# tests/test_singleflight.py
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from nepse_scraper.singleflight import AsyncSingleFlight, SingleFlight
+
+
+def test_concurrent_calls_share_one_result():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return object()
+
+    with ThreadPoolExecutor(4) as executor:
+        futures = [executor.submit(flight.do, 'key', fn) for _ in range(4)]
+        while flight.in_flight() == 0:
+            pass
+        release.set()
+        results = [f.result(5) for f in futures]
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert flight.in_flight() == 0
+
+
+def test_concurrent_calls_share_one_error():
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    error = IOError('boom')
+
+    def fn():
+        started.set()
+        release.wait(5)
+        raise error
+
+    with ThreadPoolExecutor(3) as executor:
+        leader = executor.submit(flight.do, 'key', fn)
+        started.wait(5)
+        followers = [executor.submit(flight.do, 'key', lambda: 'not called') for _ in range(2)]
+        release.set()
+        for future in [leader, *followers]:
+            with pytest.raises(IOError) as excinfo:
+                future.result(5)
+            assert excinfo.value is error
+    assert flight.in_flight() == 0
+
+
+def test_calls_after_completion_run_again():
+    flight = SingleFlight()
+    assert flight.do('key', lambda: 1) == 1
+    assert flight.do('key', lambda: 2) == 2
+
+
+def test_async_calls_share_one_result():
+    async def main():
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return len(calls)
+
+        results = await asyncio.gather(*(flight.do('key', fn) for _ in range(5)))
+        assert results == [1] * 5
+        assert flight.in_flight() == 0
+
+    asyncio.run(main())
+
+
+def test_async_error_reaches_every_caller():
+    async def main():
+        flight = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.01)
+            raise ValueError('bad')
+
+        results = await asyncio.gather(*(flight.do('key', fn) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results)
+        assert results[0] is results[1] is results[2]
+        assert flight.in_flight() == 0
+
+    asyncio.run(main())
+
+
+def test_cancelling_the_first_caller_does_not_cancel_the_others():
+    async def main():
+        flight = AsyncSingleFlight()
+
+        async def fn():
+            await asyncio.sleep(0.02)
+            return 'done'
+
+        first = asyncio.ensure_future(flight.do('key', fn))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do('key', fn))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == 'done'
+        assert first.cancelled()
+
+    asyncio.run(main())